@@ -0,0 +1,73 @@
+"""
+Benchmark: bandwidth spent on responses that cannot become sitemap pages.
+
+Every page of the test site links to a PDF and to an extensionless binary
+download. Compares the Content-Type check alone (prefilter off) with the
+default gating, where the extension prefilter also skips the PDFs without
+a request. Reports requests to the binary URLs, body bytes read, declared
+bytes not downloaded, bytes that crossed the loopback interface (Linux
+only) and crawl time.
+
+Usage:
+    python benchmarks/bench_content_gating.py [num_pages] [download_kib]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+
+
+def loopback_bytes() -> Optional[int]:
+    """Bytes received on the loopback interface so far, if /proc/net/dev exists."""
+    try:
+        with open('/proc/net/dev') as f:
+            for line in f:
+                name, _, counters = line.partition(':')
+                if name.strip() == 'lo':
+                    return int(counters.split()[0])
+    except OSError:
+        pass
+    return None
+
+
+async def run(num_pages: int, download_size: int) -> None:
+    for label, options in (
+        ('prefilter off', dict(skip_extensions=())),
+        ('defaults', {}),
+    ):
+        # Fresh site per run so request counters start at zero
+        site = TestSite(num_pages=num_pages, download_size=download_size)
+        url = await site.start()
+        try:
+            crawler = AsyncCrawler(url, max_depth=50, crawl_delay=0, respect_robots_txt=False, **options)
+            wire_before = loopback_bytes()
+            start = time.perf_counter()
+            pages = await crawler.crawl()
+            elapsed = time.perf_counter() - start
+            wire_after = loopback_bytes()
+        finally:
+            await site.stop()
+        stats = crawler.stats
+        wire = f"{(wire_after - wire_before) / 2**20:8.1f} MiB" if wire_before is not None else "       n/a"
+        print(
+            f"{label:<14} {len(pages):5d} pages  {site.download_requests:5d} binary requests  "
+            f"{stats['urls_prefiltered']:5d} prefiltered  "
+            f"{stats['bytes_received'] / 2**20:5.1f} MiB read  "
+            f"{stats['bytes_saved'] / 2**20:7.1f} MiB not downloaded  "
+            f"loopback {wire}  {elapsed:6.2f}s"
+        )
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(
+        args[0] if args else 1000,
+        (args[1] if len(args) > 1 else 1024) * 1024
+    ))
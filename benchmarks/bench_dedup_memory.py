@@ -0,0 +1,48 @@
+"""
+Benchmark: memory per URL of the seen-store dedup modes.
+
+Adds synthetic URLs to each AsyncCrawler dedup store and reports traced
+memory per URL, insert throughput and the measured false-positive rate
+on URLs that were never added.
+
+Usage:
+    python benchmarks/bench_dedup_memory.py [num_urls]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sitemap_generator.frontier import DEDUP_MODES, create_seen_store  # noqa: E402
+
+PROBES = 100_000
+
+
+def url(n: int) -> str:
+    return f"https://shop.example.com/category/{n % 500}/product-{n}?color=red&size=m"
+
+
+def main(num_urls: int) -> None:
+    print(f"{num_urls:,} URLs (avg {sum(len(url(n)) for n in range(1000)) / 1000:.0f} chars)\n")
+    for mode in DEDUP_MODES:
+        tracemalloc.start()
+        store = create_seen_store(mode)
+        start = time.perf_counter()
+        for n in range(num_urls):
+            store.add(url(n))
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        false_positives = sum(url(num_urls + n) in store for n in range(PROBES))
+        print(f"{mode:12s} {current / num_urls:7.1f} bytes/URL  "
+              f"{num_urls / elapsed:10,.0f} adds/sec  "
+              f"false positives {false_positives / PROBES:.4%}")
+        del store
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
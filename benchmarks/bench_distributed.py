@@ -0,0 +1,59 @@
+"""
+Benchmark: one site crawled by a CrawlCoordinator with 1..N workers.
+
+Each worker is a separate process running an AsyncCrawler over its hash
+partition of the URL space. Reports pages per second, checks that no URL
+was fetched twice and that the merged pages export as one sitemap.
+Scaling depends on spare CPU cores; the test site runs in this process.
+
+Usage:
+    python benchmarks/bench_distributed.py [max_workers]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.distributed import CrawlCoordinator  # noqa: E402
+from sitemap_generator.exporter import SitemapExporter  # noqa: E402
+
+
+async def run(max_workers: int) -> None:
+    site = TestSite(num_pages=3000, latency=0.02)
+    url = await site.start()
+    try:
+        for num_workers in range(1, max_workers + 1):
+            coordinator = CrawlCoordinator(
+                url,
+                num_workers=num_workers,
+                max_depth=50,
+                concurrency=10,
+                crawl_delay=0,
+                respect_robots_txt=False,
+                # Latency-driven backoff reacts to the workers competing for
+                # CPU with the test site, not to the distribution itself
+                adaptive_rate=False
+            )
+            start = time.perf_counter()
+            pages = await coordinator.crawl()
+            elapsed = time.perf_counter() - start
+            unique = len({page.url for page in pages})
+            print(
+                f"{num_workers} workers  {len(pages)} pages ({unique} unique)  "
+                f"{elapsed:6.2f}s  {len(pages) / elapsed:7.1f} pages/s"
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = SitemapExporter(pages, url).export_xml(os.path.join(tmp, 'sitemap.xml'))
+            print(f"exported {os.path.getsize(path):,} bytes of sitemap from merged pages")
+    finally:
+        await site.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1) + 1))
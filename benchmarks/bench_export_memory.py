@@ -0,0 +1,63 @@
+"""
+Benchmark: peak memory of the streaming sitemap writer.
+
+Streams synthetic pages from a generator into a sitemap file and reports
+the peak traced Python memory for growing URL counts. Because entries
+are written as they are produced, the peak should stay flat.
+
+Usage:
+    python benchmarks/bench_export_memory.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sitemap_generator.crawler import PageInfo  # noqa: E402
+from sitemap_generator.exporter import write_sitemap  # noqa: E402
+
+URL_COUNTS = (10_000, 50_000, 200_000)
+
+
+def synthetic_pages(count: int) -> Iterator[PageInfo]:
+    """Yield pages without ever materialising the full list."""
+    for n in range(count):
+        yield PageInfo(
+            url=f"https://example.com/category/{n % 100}/product-{n}",
+            depth=3,
+            lastmod="2026-01-01T00:00:00+00:00",
+            priority=0.5,
+            changefreq="weekly",
+            images=[f"https://example.com/img/{n}.jpg"],
+        )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for gzip_compress in (False, True):
+            label = 'gzip' if gzip_compress else 'plain'
+            for count in URL_COUNTS:
+                path = os.path.join(tmp, f"sitemap_{count}.xml")
+                tracemalloc.start()
+                start = time.perf_counter()
+                path = write_sitemap(
+                    synthetic_pages(count),
+                    path,
+                    include_images=True,
+                    gzip_compress=gzip_compress
+                )
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                size_mb = os.path.getsize(path) / 1024 / 1024
+                print(f"{label:5s} {count:>8,} URLs  peak {peak / 1024:8.1f} KB  "
+                      f"file {size_mb:6.1f} MB  {elapsed:5.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: crawling several hosts from one AsyncCrawler.
+
+Serves one slow, large host and two fast, small ones, then crawls all
+three in a single crawl with allowed_hosts. Reports when each host
+finished, with and without a per-host concurrency cap, and writes
+per-host sitemap sets. A second crawl replaces the slow host with one
+whose robots.txt asks for a 0.2s Crawl-delay; the fast hosts should
+finish as if it were not there.
+
+Usage:
+    python benchmarks/bench_multi_host.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+from sitemap_generator.exporter import SitemapExporter  # noqa: E402
+
+
+async def run() -> None:
+    sites = {
+        'slow': TestSite(num_pages=400, latency=0.2),
+        'fast-a': TestSite(num_pages=200),
+        'fast-b': TestSite(num_pages=200),
+    }
+    urls = {name: await site.start() for name, site in sites.items()}
+    names = {urlparse(url).netloc: name for name, url in urls.items()}
+    try:
+        for host_concurrency in (None, 4):
+            finished = {}
+            start = time.perf_counter()
+            crawler = AsyncCrawler(
+                urls['slow'],
+                max_depth=50,
+                concurrency=10,
+                crawl_delay=0,
+                respect_robots_txt=False,
+                allowed_hosts=[urlparse(urls[name]).netloc for name in ('fast-a', 'fast-b')],
+                host_concurrency=host_concurrency
+            )
+            crawler.url_callback = lambda page: finished.__setitem__(
+                names[urlparse(page.url).netloc], time.perf_counter() - start
+            )
+            pages = await crawler.crawl()
+            done = '  '.join(f"{name} {finished[name]:5.2f}s" for name in sites)
+            print(f"host_concurrency={str(host_concurrency):4s}  {len(pages)} pages  last page: {done}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            files = SitemapExporter(pages, urls['slow']).export_per_host(tmp, gzip_compress=False)
+            for host, paths in files.items():
+                print(f"{names[host]:7s} {len(paths)} files, index {os.path.relpath(paths[0], tmp)}")
+    finally:
+        for site in sites.values():
+            await site.stop()
+
+    sites = {
+        'delayed': TestSite(num_pages=100, robots_txt="User-agent: *\nCrawl-delay: 0.2\n"),
+        'fast-a': TestSite(num_pages=200, robots_txt="User-agent: *\n"),
+        'fast-b': TestSite(num_pages=200, robots_txt="User-agent: *\n"),
+    }
+    urls = {name: await site.start() for name, site in sites.items()}
+    names = {urlparse(url).netloc: name for name, url in urls.items()}
+    try:
+        finished = {}
+        start = time.perf_counter()
+        crawler = AsyncCrawler(
+            urls['delayed'],
+            max_depth=50,
+            concurrency=10,
+            crawl_delay=0,
+            allowed_hosts=[urlparse(urls[name]).netloc for name in ('fast-a', 'fast-b')]
+        )
+        crawler.url_callback = lambda page: finished.__setitem__(
+            names[urlparse(page.url).netloc], time.perf_counter() - start
+        )
+        pages = await crawler.crawl()
+        done = '  '.join(f"{name} {finished[name]:5.2f}s" for name in sites)
+        print(f"\nCrawl-delay 0.2s on one host  {len(pages)} pages  last page: {done}")
+    finally:
+        for site in sites.values():
+            await site.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
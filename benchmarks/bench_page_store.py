@@ -0,0 +1,109 @@
+"""
+Benchmark: memory held by crawled pages in each page store.
+
+Fills a dict of regular (per-instance __dict__) PageInfo records, a dict
+of the slotted PageInfo and a ColumnarPageStore with the same synthetic
+pages, and reports traced memory per page. The columnar store is then
+streamed through the sitemap writer to check it can be exported directly.
+
+Usage:
+    python benchmarks/bench_page_store.py [num_pages]
+"""
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sitemap_generator.crawler import PageInfo  # noqa: E402
+from sitemap_generator.exporter import SitemapExporter, SitemapWriter  # noqa: E402
+from sitemap_generator.pagestore import ColumnarPageStore  # noqa: E402
+
+CHANGEFREQS = ('daily', 'weekly', 'monthly')
+LASTMODS = tuple(f"2026-10-{day:02d}T00:00:00+00:00" for day in range(1, 29))
+
+
+@dataclass
+class DictPageInfo:
+    """PageInfo as it was before slots: one __dict__ and list per page."""
+    url: str
+    depth: int = 0
+    lastmod: Optional[str] = None
+    priority: float = 0.5
+    changefreq: str = "monthly"
+    title: Optional[str] = None
+    images: List[str] = field(default_factory=list)
+
+
+def page_fields(n: int) -> dict:
+    # Values are built per page, as they would be when parsed from responses
+    return dict(
+        url=f"https://shop.example.com/category/{n % 500}/product-{n}",
+        depth=n % 6,
+        lastmod=''.join(LASTMODS[n % len(LASTMODS)]),
+        priority=round(1.0 - (n % 6) * 0.1, 1),
+        changefreq=''.join(CHANGEFREQS[n % 3]),
+        title=f"Product {n} | Example Shop",
+        images=[f"https://shop.example.com/img/{n}.jpg"] if n % 10 == 0 else []
+    )
+
+
+def measure(name: str, num_pages: int, fill) -> object:
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = fill(num_pages)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<18} {current / 2**20:9.1f} MiB {current / num_pages:9.1f} B/page {elapsed:7.2f}s")
+    return store
+
+
+def fill_dict_legacy(num_pages: int) -> dict:
+    pages = {}
+    for n in range(num_pages):
+        fields = page_fields(n)
+        pages[fields['url']] = DictPageInfo(**fields)
+    return pages
+
+
+def fill_dict_slotted(num_pages: int) -> dict:
+    pages = {}
+    for n in range(num_pages):
+        fields = page_fields(n)
+        pages[fields['url']] = PageInfo(**fields)
+    return pages
+
+
+def fill_columnar(num_pages: int) -> ColumnarPageStore:
+    pages = ColumnarPageStore()
+    for n in range(num_pages):
+        fields = page_fields(n)
+        pages[fields['url']] = PageInfo(**fields)
+    return pages
+
+
+def main(num_pages: int) -> None:
+    print(f"{num_pages:,} pages\n")
+    print(f"{'store':<18} {'memory':>13} {'per page':>14} {'fill':>8}")
+    measure("dict (__dict__)", num_pages, fill_dict_legacy)
+    measure("dict (slots)", num_pages, fill_dict_slotted)
+    store = measure("columnar", num_pages, fill_columnar)
+
+    start = time.perf_counter()
+    exporter = SitemapExporter(store.values(), "https://shop.example.com")
+    writer = SitemapWriter(io.StringIO())
+    for page in exporter.pages:
+        writer.write(page)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"\nexported {writer.url_count:,} URLs from columnar store in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
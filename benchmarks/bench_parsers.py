@@ -0,0 +1,105 @@
+"""
+Benchmark: HTML extraction engines.
+
+Parses a corpus of saved HTML pages with each AsyncCrawler parser engine
+and reports pages/sec and peak resident memory. Each engine runs in its
+own process so memory figures are not polluted by the other engines.
+
+Usage:
+    python benchmarks/bench_parsers.py [corpus_dir]
+
+Without a corpus directory a synthetic corpus of link-heavy pages is used.
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sitemap_generator.parser import PARSER_ENGINES, parse_html  # noqa: E402
+
+BASE_URL = 'https://example.com/'
+DOMAIN = 'example.com'
+REPEAT = 3
+
+
+def synthetic_corpus(num_pages: int = 200) -> List[bytes]:
+    """Generate pages with navigation, body text, images and links."""
+    pages = []
+    for n in range(num_pages):
+        nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(60))
+        body = ''.join(
+            f'<p>Paragraph {i} with <a href="/article/{n}-{i}">a link</a> and '
+            f'<img src="/img/{n}-{i}.jpg" alt=""> some <b>inline</b> markup.</p>'
+            for i in range(150)
+        )
+        pages.append(
+            f'<!DOCTYPE html><html><head><title>Page {n}</title></head>'
+            f'<body><nav><ul>{nav}</ul></nav><main>{body}</main></body></html>'
+            .encode('utf-8')
+        )
+    return pages
+
+
+def load_corpus(corpus_dir: str) -> List[bytes]:
+    """Load every *.html / *.htm file under a directory."""
+    paths = sorted(Path(corpus_dir).rglob('*.htm*'))
+    return [p.read_bytes() for p in paths]
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _run_engine(engine: str, corpus: List[bytes], results) -> None:
+    if engine == 'baseline':
+        # Only the loaded corpus, to show the interpreter's own footprint
+        results.put((engine, 0.0, _peak_rss()))
+        return
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for body in corpus:
+            parse_html(body, BASE_URL, DOMAIN, include_images=True, engine=engine)
+    elapsed = time.perf_counter() - start
+    results.put((engine, len(corpus) * REPEAT / elapsed, _peak_rss()))
+
+
+def _check_equivalence(corpus: List[bytes]) -> int:
+    """Count pages where the engines disagree on title, links or images."""
+    mismatches = 0
+    for body in corpus:
+        a, b = (parse_html(body, BASE_URL, DOMAIN, include_images=True, engine=e)
+                for e in PARSER_ENGINES)
+        if (a.title, a.links, a.images) != (b.title, b.links, b.images):
+            mismatches += 1
+    return mismatches
+
+
+def main() -> None:
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else synthetic_corpus()
+    size_mb = sum(len(b) for b in corpus) / 1024 / 1024
+    print(f"Corpus: {len(corpus)} pages, {size_mb:.1f} MB\n")
+
+    results = multiprocessing.Queue()
+    for engine in ('baseline',) + PARSER_ENGINES:
+        proc = multiprocessing.Process(target=_run_engine, args=(engine, corpus, results))
+        proc.start()
+        proc.join()
+        name, pages_per_sec, peak = results.get()
+        rate = f"{pages_per_sec:8.1f} pages/sec" if pages_per_sec else " " * 18
+        print(f"{name:10s} {rate}   peak RSS {peak / 1024 / 1024:7.1f} MB")
+
+    print(f"\nPages where engines disagree: {_check_equivalence(corpus)}")
+
+
+if __name__ == '__main__':
+    main()
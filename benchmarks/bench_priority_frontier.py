@@ -0,0 +1,86 @@
+"""
+Benchmark: which pages a crawl capped by max_urls gets.
+
+The test site has a skewed link graph (a few hub pages linked from
+almost every page) and query-string variants of its pages. Crawls a
+quarter of it with the FIFO frontier (the old behaviour) and with
+frontier_order='priority', in memory and on disk, reporting how many of
+the 100 most-linked pages were fetched, the share of all links that
+point at fetched pages, and how much of the budget went to query
+variants. Then times PriorityFrontier operations on their own.
+
+Usage:
+    python benchmarks/bench_priority_frontier.py [num_pages]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+from sitemap_generator.frontier import PriorityFrontier  # noqa: E402
+
+
+def page_number(url: str) -> int:
+    path = url.split('/', 3)[3]
+    return int(path[5:]) if path.startswith('page/') else 0
+
+
+async def run(num_pages: int) -> None:
+    site = TestSite(num_pages=num_pages, hub_links=5, url_variants=True)
+    inlinks = Counter(target for n in range(num_pages) for target in site.page_links(n))
+    total_links = sum(inlinks.values())
+    top = {n for n, _ in inlinks.most_common(100)}
+    budget = num_pages // 4
+
+    url = await site.start()
+    try:
+        for label, options in (
+            ('fifo', {}),
+            ('priority', dict(frontier_order='priority')),
+            ('priority, disk', dict(frontier_order='priority', frontier_store='disk')),
+        ):
+            crawler = AsyncCrawler(
+                url,
+                max_depth=50,
+                max_urls=budget,
+                crawl_delay=0,
+                respect_robots_txt=False,
+                adaptive_rate=False,
+                honor_canonical=False,
+                **options
+            )
+            start = time.perf_counter()
+            pages = await crawler.crawl()
+            elapsed = time.perf_counter() - start
+            plain = {page_number(page.url) for page in pages if '?' not in page.url}
+            variants = sum(1 for page in pages if '?' in page.url)
+            link_share = sum(inlinks[n] for n in plain) / total_links
+            print(
+                f"{label:<15} {len(pages):6d} pages  top-100 {len(plain & top):3d}  "
+                f"links to fetched pages {link_share:6.1%}  query variants {variants:5d}  {elapsed:6.2f}s"
+            )
+    finally:
+        await site.stop()
+
+    rnd = random.Random(0)
+    frontier = PriorityFrontier(lambda url, depth, links: links.bit_length() - depth)
+    urls = [f"https://example.com/page/{i}" for i in range(200000)]
+    start = time.perf_counter()
+    for i, link in enumerate(urls):
+        frontier.put((link, i % 7))
+        frontier.add_inlink(urls[rnd.randrange(i + 1)])
+    while frontier.pop() is not None:
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"PriorityFrontier: {len(urls) / elapsed:,.0f} URLs/s (put + add_inlink + pop)")
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 4000))
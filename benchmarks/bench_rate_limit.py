@@ -0,0 +1,93 @@
+"""
+Benchmark: crawling a rate-limited server.
+
+The local test site allows max_rps requests per second and answers the
+rest with 429 + Retry-After. Compares an unthrottled crawl, a fixed
+per-host delay and the adaptive (AIMD) limiter, reporting pages crawled,
+429 responses and wall time. A second run fails 10% of requests with a
+plain 503, which should barely slow the adaptive limiter, and a third
+checks that a robots.txt Crawl-delay is honoured.
+
+Usage:
+    python benchmarks/bench_rate_limit.py [num_pages] [max_rps]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+
+CONFIGS = (
+    ('unthrottled', dict(crawl_delay=0, adaptive_rate=False)),
+    ('fixed 40/s', dict(crawl_delay=0.25, adaptive_rate=False)),
+    ('adaptive', dict(crawl_delay=0, adaptive_rate=True)),
+)
+
+
+async def run(num_pages: int, max_rps: float) -> None:
+    print(f"{num_pages} pages, server allows {max_rps:g} req/s\n")
+    for label, options in CONFIGS:
+        site = TestSite(num_pages=num_pages, max_rps=max_rps)
+        base_url = await site.start()
+        try:
+            crawler = AsyncCrawler(
+                base_url,
+                max_depth=50,
+                max_urls=num_pages,
+                concurrency=10,
+                respect_robots_txt=False,
+                **options
+            )
+            start = time.perf_counter()
+            pages = await crawler.crawl()
+            elapsed = time.perf_counter() - start
+            print(f"{label:12s} pages {len(pages):5d}  429s {site.throttled:5d}  "
+                  f"{len(pages) / elapsed:6.1f} pages/s  {elapsed:6.2f}s")
+        finally:
+            await site.stop()
+
+    print(f"\n{num_pages} pages, 10% of requests fail with 503\n")
+    for adaptive in (False, True):
+        site = TestSite(num_pages=num_pages, error_rate=0.1)
+        base_url = await site.start()
+        try:
+            crawler = AsyncCrawler(
+                base_url,
+                max_depth=50,
+                max_urls=num_pages,
+                concurrency=10,
+                crawl_delay=0,
+                respect_robots_txt=False,
+                adaptive_rate=adaptive
+            )
+            start = time.perf_counter()
+            pages = await crawler.crawl()
+            elapsed = time.perf_counter() - start
+            print(f"{'adaptive' if adaptive else 'unthrottled':12s} pages {len(pages):5d}  "
+                  f"503s {site.errors:5d}  rate cuts {crawler.stats['rate_decreases']:3d}  "
+                  f"{elapsed:6.2f}s")
+        finally:
+            await site.stop()
+
+    site = TestSite(num_pages=10, robots_txt="User-agent: *\nCrawl-delay: 1\n")
+    base_url = await site.start()
+    try:
+        crawler = AsyncCrawler(base_url, max_depth=50, crawl_delay=0, concurrency=10)
+        start = time.perf_counter()
+        pages = await crawler.crawl()
+        elapsed = time.perf_counter() - start
+        print(f"\nCrawl-delay 1s: {len(pages)} pages in {elapsed:.2f}s "
+              f"({elapsed / max(len(pages) - 1, 1):.2f}s per request)")
+    finally:
+        await site.stop()
+
+
+if __name__ == '__main__':
+    num_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    max_rps = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(run(num_pages, max_rps))
@@ -0,0 +1,56 @@
+"""
+Benchmark: full crawl vs. conditional recrawl.
+
+Crawls a local synthetic site twice with a validator store. The second
+crawl sends If-None-Match / If-Modified-Since and is answered with 304s,
+reusing the cached titles and link sets.
+
+Usage:
+    python benchmarks/bench_recrawl.py [num_pages]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+
+
+async def crawl_once(base_url: str, num_pages: int, store: str) -> AsyncCrawler:
+    crawler = AsyncCrawler(
+        base_url,
+        max_depth=50,
+        max_urls=num_pages,
+        crawl_delay=0,
+        respect_robots_txt=False,
+        validator_store=store,
+    )
+    await crawler.crawl()
+    return crawler
+
+
+async def run(num_pages: int) -> None:
+    site = TestSite(num_pages=num_pages)
+    base_url = await site.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = os.path.join(tmp, 'validators.sqlite')
+            for label in ('initial crawl', 'recrawl'):
+                site.bytes_sent = site.not_modified = 0
+                start = time.perf_counter()
+                crawler = await crawl_once(base_url, num_pages, store)
+                elapsed = time.perf_counter() - start
+                print(f"{label:14s} pages {len(crawler.pages):6d}  "
+                      f"body bytes {site.bytes_sent:10,}  "
+                      f"304s {site.not_modified:6d}  {elapsed:6.2f}s")
+    finally:
+        await site.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,82 @@
+"""
+Benchmark: robots.txt decisions, stdlib RobotFileParser vs. RobotsRules.
+
+Generates robots.txt files with thousands of Allow/Disallow lines (a tenth
+of them with '*' or '$' wildcards, which the stdlib parser treats as
+literal text) and times parsing plus can_fetch over a set of URLs, first
+all distinct and then with each URL checked again (LRU hits).
+
+Usage:
+    python benchmarks/bench_robots.py [num_urls]
+"""
+
+import os
+import random
+import sys
+import time
+from typing import List
+from urllib.robotparser import RobotFileParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sitemap_generator.crawler import USER_AGENT  # noqa: E402
+from sitemap_generator.robots import RobotsRules  # noqa: E402
+
+RULE_COUNTS = (100, 1000, 5000)
+SEGMENTS = ('shop', 'category', 'product', 'search', 'user', 'blog', 'tag', 'archive')
+
+
+def random_path(rng: random.Random, max_segments: int) -> str:
+    return '/' + '/'.join(
+        f"{rng.choice(SEGMENTS)}{rng.randrange(100)}" for _ in range(rng.randint(1, max_segments))
+    )
+
+
+def robots_txt(rng: random.Random, num_rules: int) -> List[str]:
+    lines = ['User-agent: *']
+    for i in range(num_rules):
+        path = random_path(rng, 3)
+        if i % 10 == 0:
+            path = f"/*{path}" if i % 20 else f"{path}*.pdf$"
+        lines.append(f"{'Allow' if rng.random() < 0.2 else 'Disallow'}: {path}")
+    return lines
+
+
+def timed(check, urls: List[str]) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        check(url)
+    return time.perf_counter() - start
+
+
+def main(num_urls: int) -> None:
+    rng = random.Random(0)
+    urls = [f"https://example.com{random_path(rng, 5)}" for _ in range(num_urls)]
+    print(f"{num_urls:,} URLs\n")
+    print(f"{'rules':>6}  {'parser':<13} {'parse':>9} {'distinct URLs':>14} {'repeated':>10}")
+    for num_rules in RULE_COUNTS:
+        lines = robots_txt(rng, num_rules)
+
+        start = time.perf_counter()
+        stdlib = RobotFileParser()
+        stdlib.parse(lines)
+        stdlib_parse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = RobotsRules.parse(lines, USER_AGENT, cache_size=num_urls)
+        compiled_parse = time.perf_counter() - start
+
+        for name, parse_time, check in (
+            ('stdlib', stdlib_parse, lambda url: stdlib.can_fetch(USER_AGENT, url)),
+            ('RobotsRules', compiled_parse, compiled.can_fetch),
+        ):
+            cold = timed(check, urls)
+            warm = timed(check, urls)
+            print(
+                f"{num_rules:>6}  {name:<13} {parse_time * 1000:7.1f}ms "
+                f"{num_urls / cold:11,.0f}/s {num_urls / warm:9,.0f}/s"
+            )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
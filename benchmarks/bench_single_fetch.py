@@ -0,0 +1,53 @@
+"""
+Benchmark: HTTP requests and connections per crawled page.
+
+Crawls a local synthetic site and reports how many requests the origin
+received for every page that ended up in the sitemap, and how many TCP
+connections the crawler opened to serve them.
+
+Usage:
+    python benchmarks/bench_single_fetch.py [num_pages]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+
+
+async def run(num_pages: int) -> None:
+    site = TestSite(num_pages=num_pages)
+    base_url = await site.start()
+    try:
+        crawler = AsyncCrawler(
+            base_url,
+            max_depth=50,
+            max_urls=num_pages,
+            concurrency=10,
+            crawl_delay=0,
+            respect_robots_txt=False,
+        )
+        start = time.perf_counter()
+        pages = await crawler.crawl()
+        elapsed = time.perf_counter() - start
+    finally:
+        await site.stop()
+
+    print(f"Pages crawled:      {len(pages)}")
+    print(f"Origin requests:    {site.requests}")
+    print(f"Requests per page:  {site.requests / max(len(pages), 1):.2f}")
+    print(f"Connections opened: {crawler.stats['connections_opened']}")
+    print(f"Connections reused: {crawler.stats['connections_reused']}")
+    print(f"URLs enqueued:      {crawler.stats['urls_enqueued']}")
+    print(f"Duplicates dropped: {crawler.stats['duplicates_dropped']}")
+    print(f"Peak queue size:    {crawler.stats['peak_queue_size']}")
+    print(f"Elapsed:            {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
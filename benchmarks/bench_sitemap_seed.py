@@ -0,0 +1,59 @@
+"""
+Benchmark: coverage of a deep site with and without sitemap seeding.
+
+The test site is a chain (each page links only to the next), the worst
+case for link discovery: every page is one hop deeper than the last.
+Its robots.txt announces a gzipped sitemap index listing every page.
+Reports pages found and the time until 50%, 90% and 100% of them had
+been fetched, following links only vs. seeding from the sitemaps.
+
+Usage:
+    python benchmarks/bench_sitemap_seed.py [num_pages]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+
+
+async def run(num_pages: int) -> None:
+    site = TestSite(num_pages=num_pages, links_per_page=1, latency=0.005, robots_txt='User-agent: *\n', sitemap=True)
+    url = await site.start()
+    try:
+        for label, max_depth, seed in (
+            ('links, max_depth=10', 10, False),
+            (f'links, max_depth={num_pages}', num_pages, False),
+            ('sitemap seed, max_depth=10', 10, True),
+        ):
+            crawler = AsyncCrawler(
+                url,
+                max_depth=max_depth,
+                concurrency=10,
+                crawl_delay=0,
+                # Fixed rate, so only the order of discovery differs
+                adaptive_rate=False,
+                sitemap_seed=seed
+            )
+            found_at = []
+            start = time.perf_counter()
+            crawler.url_callback = lambda page: found_at.append(time.perf_counter() - start)
+            await crawler.crawl()
+
+            milestones = '  '.join(
+                f"{int(share * 100):3d}% {found_at[int(share * num_pages) - 1]:6.2f}s"
+                if len(found_at) >= share * num_pages else f"{int(share * 100):3d}%      -"
+                for share in (0.5, 0.9, 1.0)
+            )
+            print(f"{label:<28} {len(found_at):6d} pages  {milestones}")
+    finally:
+        await site.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
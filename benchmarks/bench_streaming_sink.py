@@ -0,0 +1,82 @@
+"""
+Benchmark: peak memory of a sitemap set built from a stream of pages.
+
+Pages arrive in crawl (unsorted) order, as they would from
+AsyncCrawler.iter_pages(). Compares collecting them all and exporting with
+SitemapExporter.export_sitemap_index against SitemapSink, unsorted and
+with the external merge sort, reporting peak traced Python memory.
+
+Usage:
+    python benchmarks/bench_streaming_sink.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sitemap_generator.crawler import PageInfo  # noqa: E402
+from sitemap_generator.exporter import SitemapExporter, SitemapSink  # noqa: E402
+
+URL_COUNTS = (50_000, 200_000, 500_000)
+URLS_PER_FILE = 10_000
+RUN_SIZE = 50_000
+
+
+def crawl_order_pages(count: int) -> Iterator[PageInfo]:
+    """Yield pages in a scrambled, crawl-like order."""
+    for i in range(count):
+        n = (i * 7919) % count
+        yield PageInfo(
+            url=f"https://example.com/category/{n % 100}/product-{n}",
+            depth=3,
+            lastmod="2026-01-01T00:00:00+00:00",
+            priority=0.5,
+            changefreq="weekly",
+            title=f"Product {n}"
+        )
+
+
+def collect_and_export(count: int, output_dir: str) -> None:
+    pages = list(crawl_order_pages(count))
+    SitemapExporter(pages, "https://example.com").export_sitemap_index(
+        output_dir, urls_per_file=URLS_PER_FILE
+    )
+
+
+def stream(count: int, output_dir: str, sort: bool) -> None:
+    with SitemapSink(
+        output_dir,
+        "https://example.com",
+        urls_per_file=URLS_PER_FILE,
+        sort=sort,
+        run_size=RUN_SIZE
+    ) as sink:
+        for page in crawl_order_pages(count):
+            sink.write(page)
+
+
+def main() -> None:
+    modes = (
+        ('collect + export', collect_and_export),
+        ('sink', lambda count, out: stream(count, out, sort=False)),
+        ('sink, sorted', lambda count, out: stream(count, out, sort=True)),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in URL_COUNTS:
+            for mode_num, (label, run) in enumerate(modes):
+                tracemalloc.start()
+                start = time.perf_counter()
+                run(count, os.path.join(tmp, f"{count}_{mode_num}"))
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{count:>8,} URLs  {label:<17} peak {peak / 2**20:7.1f} MiB  {elapsed:6.2f}s")
+
+
+if __name__ == '__main__':
+    main()
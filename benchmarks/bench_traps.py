@@ -0,0 +1,74 @@
+"""
+Benchmark: crawl budget lost to crawl traps.
+
+Every page of the test site links to an endless calendar, an endless
+archive and a relative link that nests a copy of the page one level
+deeper each time. Crawls with a fixed max_urls budget, trap detection
+off (the old behaviour) and on, reporting how much of the budget went to
+real pages and which patterns were pruned. The budget is first the size
+of the site, then five times it, where a trapped crawl never ends before
+the budget does. Finally TrapDetector.check() is timed on its own.
+
+Usage:
+    python benchmarks/bench_traps.py [num_pages]
+"""
+
+import asyncio
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+from sitemap_generator.traps import TrapDetector  # noqa: E402
+
+REAL_PAGE = re.compile(r'^https?://[^/]+/(page/\d+)?$')
+
+
+async def run(num_pages: int) -> None:
+    site = TestSite(num_pages=num_pages, traps=True)
+    url = await site.start()
+    try:
+        for budget, trap_detection in (
+            (num_pages, False), (num_pages, True), (5 * num_pages, False), (5 * num_pages, True)
+        ):
+            site.trap_requests = 0
+            crawler = AsyncCrawler(
+                url,
+                max_depth=50,
+                max_urls=budget,
+                crawl_delay=0,
+                respect_robots_txt=False,
+                adaptive_rate=False,
+                trap_detection=trap_detection
+            )
+            start = time.perf_counter()
+            pages = await crawler.crawl()
+            elapsed = time.perf_counter() - start
+            real = sum(1 for page in pages if REAL_PAGE.match(page.url))
+            print(
+                f"max_urls {budget:6d}  traps {'on' if trap_detection else 'off':<3}  "
+                f"{len(pages):6d} pages  {real:6d} real  {site.trap_requests:6d} trap requests  "
+                f"{crawler.stats['urls_trapped']:6d} pruned  {elapsed:6.2f}s"
+            )
+            if crawler.traps is not None:
+                for entry in crawler.traps.report()[:5]:
+                    print(f"    {entry.count:6d}  {entry.reason:<24} {entry.pattern}")
+    finally:
+        await site.stop()
+
+    urls = [f"https://example.com/calendar?month={i}&view=week" for i in range(50000)]
+    urls += [f"https://example.com/page/{i}/more/{i}/more/" for i in range(50000)]
+    traps = TrapDetector()
+    start = time.perf_counter()
+    for depth, link in enumerate(urls):
+        traps.check(link, depth % 30)
+    elapsed = time.perf_counter() - start
+    print(f"check(): {len(urls) / elapsed:,.0f} URLs/s")
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,242 @@
+"""
+Local aiohttp test site used by the crawler benchmarks.
+
+Serves a synthetic site of ``num_pages`` HTML pages where every page links
+to a handful of others, and counts the requests and body bytes it serves.
+Pages carry an ETag and honour If-None-Match with 304 Not Modified.
+With max_rps set, requests beyond that rate get 429 Too Many Requests
+with a Retry-After header, like a rate-limited production server.
+With error_rate set, that fraction of page requests fails with a 503,
+like a server with transient errors. latency adds a delay to every page.
+With sitemap set, /sitemap.xml is a sitemap index of gzipped sitemaps
+listing every page, also announced in robots.txt when one is served.
+With download_size set, every page also links to a PDF and to an
+extensionless binary download of that many bytes. With url_variants set,
+links also use tracking parameters and reordered or extra query strings,
+and every page declares its plain URL as rel=canonical. With traps set,
+every page also links to an endless calendar and archive and has a
+broken relative link that nests deeper on every page it leads to. With
+hub_links set, every page also links to that many pages drawn from a
+skewed distribution, so a few pages are linked from almost everywhere.
+"""
+
+import asyncio
+import gzip
+import random
+import time
+from typing import Optional
+
+from aiohttp import web
+
+
+class TestSite:
+    """Synthetic website served from localhost."""
+
+    def __init__(
+        self,
+        num_pages: int = 500,
+        links_per_page: int = 5,
+        max_rps: Optional[float] = None,
+        robots_txt: Optional[str] = None,
+        error_rate: float = 0.0,
+        latency: float = 0.0,
+        sitemap: bool = False,
+        download_size: int = 0,
+        url_variants: bool = False,
+        traps: bool = False,
+        hub_links: int = 0
+    ):
+        self.num_pages = num_pages
+        self.links_per_page = links_per_page
+        self.max_rps = max_rps
+        self.robots_txt = robots_txt
+        self.error_rate = error_rate
+        self.latency = latency
+        self.sitemap = sitemap
+        self.download_size = download_size
+        self.download_requests = 0
+        self.url_variants = url_variants
+        self.traps = traps
+        self.trap_requests = 0
+        self.hub_links = hub_links
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self._random = random.Random(0)
+        self._allowance = max_rps or 0.0
+        self._last_request = time.monotonic()
+        self.bytes_sent = 0
+        self.not_modified = 0
+        self.runner = None
+        self.base_url = None
+
+    def page_links(self, n: int) -> list:
+        """Numbers of the pages page n links to."""
+        links = [(n * self.links_per_page + i) % self.num_pages for i in range(1, self.links_per_page + 1)]
+        if self.hub_links:
+            # Heavily skewed towards a few hubs, scattered over the site so
+            # they are not simply the pages nearest the homepage
+            rnd = random.Random(n)
+            links += [
+                int(self.num_pages * rnd.random() ** 4) * 7919 % self.num_pages
+                for _ in range(self.hub_links)
+            ]
+        return links
+
+    def _page_html(self, n: int) -> str:
+        links = ''.join(
+            f'<li><a href="/page/{target}">Page {i}</a></li>'
+            for i, target in enumerate(self.page_links(n), 1)
+        )
+        if self.url_variants:
+            target = (n * self.links_per_page + 1) % self.num_pages
+            links += ''.join(
+                f'<li><a href="/page/{target}?{query}">Variant</a></li>'
+                for query in (
+                    'utm_source=nav&utm_medium=link', 'fbclid=abc123',
+                    'lang=en&view=full', 'view=full&lang=en', f'from={n}'
+                )
+            )
+        if self.download_size:
+            links += (
+                f'<li><a href="/files/report-{n}.pdf">Report</a></li>'
+                f'<li><a href="/download/{n}">Download</a></li>'
+            )
+        if self.traps:
+            links += (
+                '<li><a href="/calendar?month=0">Calendar</a></li>'
+                '<li><a href="/archive/1">Archive</a></li>'
+                f'<li><a href="{n}/more/">More</a></li>'
+            )
+        canonical = ''
+        if self.url_variants:
+            canonical = f'<link rel="canonical" href="{"/" if n == 0 else f"/page/{n}"}">'
+        return (
+            f"<html><head><title>Page {n}</title>{canonical}</head>"
+            f"<body><h1>Page {n}</h1><ul>{links}</ul></body></html>"
+        )
+
+    def _over_limit(self) -> bool:
+        """Server-side token bucket of max_rps tokens per second."""
+        if not self.max_rps:
+            return False
+        now = time.monotonic()
+        self._allowance = min(self.max_rps, self._allowance + (now - self._last_request) * self.max_rps)
+        self._last_request = now
+        if self._allowance < 1:
+            return True
+        self._allowance -= 1
+        return False
+
+    async def _handle_page(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._over_limit():
+            self.throttled += 1
+            return web.Response(status=429, headers={'Retry-After': '1'})
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503)
+        n = int(request.match_info.get('n', 0))
+        if n >= self.num_pages:
+            raise web.HTTPNotFound()
+
+        etag = f'"page-{n}"'
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={'ETag': etag})
+
+        body = self._page_html(n)
+        self.bytes_sent += len(body.encode('utf-8'))
+        return web.Response(text=body, content_type='text/html', headers={'ETag': etag})
+
+    async def _handle_trap_page(self, request: web.Request) -> web.Response:
+        self.trap_requests += 1
+        return await self._handle_page(request)
+
+    async def _handle_calendar(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.trap_requests += 1
+        month = int(request.query.get('month', 0))
+        queries = [f'month={month - 1}', f'month={month + 1}']
+        if 'day' not in request.query:
+            queries += [f'month={month}&day={day}' for day in range(1, 29)]
+        links = ''.join(f'<li><a href="/calendar?{query}">{query}</a></li>' for query in queries)
+        return web.Response(text=f"<html><body><ul>{links}</ul></body></html>", content_type='text/html')
+
+    async def _handle_archive(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.trap_requests += 1
+        k = int(request.match_info['k'])
+        body = f'<html><body><a href="/archive/{k + 1}">Older</a></body></html>'
+        return web.Response(text=body, content_type='text/html')
+
+    async def _handle_download(self, request: web.Request) -> web.Response:
+        self.download_requests += 1
+        content_type = 'application/pdf' if request.path.endswith('.pdf') else 'application/octet-stream'
+        return web.Response(body=bytes(self.download_size), content_type=content_type)
+
+    async def _handle_robots(self, request: web.Request) -> web.Response:
+        text = self.robots_txt
+        if self.sitemap:
+            text += f"\nSitemap: {self.base_url}sitemap.xml\n"
+        return web.Response(text=text, content_type='text/plain')
+
+    # Pages per sitemap file served with sitemap=True
+    SITEMAP_SIZE = 1000
+
+    async def _handle_sitemap_index(self, request: web.Request) -> web.Response:
+        entries = ''.join(
+            f"<sitemap><loc>{self.base_url}sitemap-{k}.xml.gz</loc></sitemap>"
+            for k in range((self.num_pages + self.SITEMAP_SIZE - 1) // self.SITEMAP_SIZE)
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'
+        )
+        return web.Response(text=body, content_type='application/xml')
+
+    async def _handle_sitemap(self, request: web.Request) -> web.Response:
+        k = int(request.match_info['k'])
+        start = k * self.SITEMAP_SIZE
+        entries = ''.join(
+            f"<url><loc>{self.base_url}page/{n}</loc></url>"
+            for n in range(start, min(start + self.SITEMAP_SIZE, self.num_pages))
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+        )
+        return web.Response(body=gzip.compress(body.encode('utf-8')), content_type='application/gzip')
+
+    async def start(self) -> str:
+        """Start the server on a free port and return its base URL."""
+        app = web.Application()
+        app.router.add_get('/', self._handle_page)
+        if self.robots_txt is not None:
+            app.router.add_get('/robots.txt', self._handle_robots)
+        app.router.add_get('/page/{n}', self._handle_page)
+        if self.traps:
+            # Any path below a page serves that page again, as lenient servers do
+            app.router.add_get('/page/{n}/{tail:.*}', self._handle_trap_page)
+            app.router.add_get('/calendar', self._handle_calendar)
+            app.router.add_get('/archive/{k}', self._handle_archive)
+        if self.download_size:
+            app.router.add_get('/files/{name}', self._handle_download)
+            app.router.add_get('/download/{n}', self._handle_download)
+        if self.sitemap:
+            app.router.add_get('/sitemap.xml', self._handle_sitemap_index)
+            app.router.add_get('/sitemap-{k}.xml.gz', self._handle_sitemap)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self.runner:
+            await self.runner.cleanup()
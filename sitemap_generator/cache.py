@@ -0,0 +1,122 @@
+"""
+Persistent per-URL validator store for incremental recrawls.
+Keeps ETag, Last-Modified, a content hash and the last parse results in
+SQLite so unchanged pages can be answered from cache.
+"""
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+def content_hash(body: bytes) -> str:
+    """Stable hash of a response body."""
+    return hashlib.sha1(body).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Validators and parse results stored for a URL."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    title: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    images: List[str] = field(default_factory=list)
+    canonical: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a GET into a conditional request."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    """SQLite-backed store of CacheEntry records keyed by URL."""
+
+    # Writes are batched into transactions of this many pages
+    COMMIT_EVERY = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                title TEXT,
+                links TEXT,
+                images TEXT,
+                canonical TEXT
+            )
+            """
+        )
+        # Stores written before canonical URLs were kept lack the column
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(validators)")}
+        if 'canonical' not in columns:
+            self._conn.execute("ALTER TABLE validators ADD COLUMN canonical TEXT")
+        self._pending = 0
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the stored entry for a URL, if any."""
+        row = self._conn.execute(
+            "SELECT etag, last_modified, content_hash, title, links, images, canonical "
+            "FROM validators WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        etag, last_modified, body_hash, title, links, images, canonical = row
+        return CacheEntry(
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=body_hash,
+            title=title,
+            links=json.loads(links) if links else [],
+            images=json.loads(images) if images else [],
+            canonical=canonical
+        )
+
+    def put(self, url: str, entry: CacheEntry) -> None:
+        """Insert or replace the entry for a URL."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO validators "
+            "(url, etag, last_modified, content_hash, title, links, images, canonical) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                entry.etag,
+                entry.last_modified,
+                entry.content_hash,
+                entry.title,
+                json.dumps(entry.links),
+                json.dumps(entry.images),
+                entry.canonical
+            )
+        )
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        """Flush pending writes to disk."""
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.commit()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM validators").fetchone()[0]
@@ -0,0 +1,87 @@
+"""
+On-disk crawl checkpoints for resumable crawls.
+Journals the frontier, the visited set and collected pages to SQLite.
+"""
+
+import json
+import sqlite3
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .crawler import PageInfo
+
+
+class CrawlCheckpoint:
+    """
+    SQLite journal of crawl progress.
+
+    Every processed URL is recorded together with the links it queued, and
+    the journal is committed periodically. A commit is therefore always a
+    consistent snapshot: URLs in the frontier table were queued but never
+    completed, and are the only ones fetched again on resume.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY, depth INTEGER);
+            CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, data TEXT);
+            """
+        )
+        if not resume:
+            self._conn.executescript(
+                "DELETE FROM frontier; DELETE FROM visited; DELETE FROM pages;"
+            )
+        self._conn.commit()
+
+    def add_frontier(self, urls: Iterable[Tuple[str, int]]) -> None:
+        """Record queued (url, depth) pairs."""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)", urls
+        )
+
+    def record(
+        self,
+        url: str,
+        page: Optional['PageInfo'],
+        queued: Iterable[Tuple[str, int]] = ()
+    ) -> None:
+        """Record a processed URL, its page (if any) and the links it queued."""
+        self._conn.execute("DELETE FROM frontier WHERE url = ?", (url,))
+        self._conn.execute("INSERT OR IGNORE INTO visited (url) VALUES (?)", (url,))
+        if page is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, data) VALUES (?, ?)",
+                (url, json.dumps(asdict(page)))
+            )
+        self.add_frontier(queued)
+
+    def commit(self) -> None:
+        """Make everything recorded so far durable."""
+        self._conn.commit()
+
+    def load(self) -> Tuple[List[Tuple[str, int]], Set[str], Dict[str, 'PageInfo']]:
+        """
+        Load the last committed state.
+
+        Returns:
+            Tuple of (frontier, visited URLs, pages by URL)
+        """
+        from .crawler import PageInfo
+
+        frontier = self._conn.execute("SELECT url, depth FROM frontier").fetchall()
+        visited = {row[0] for row in self._conn.execute("SELECT url FROM visited")}
+        pages = {
+            url: PageInfo(**json.loads(data))
+            for url, data in self._conn.execute("SELECT url, data FROM pages")
+        }
+        return frontier, visited, pages
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.commit()
+        self._conn.close()
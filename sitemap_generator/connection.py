@@ -0,0 +1,82 @@
+"""
+HTTP connection pooling for the crawler.
+Keep-alive connection reuse with per-host limits, DNS caching and
+shared TLS configuration.
+"""
+
+import ssl
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+
+
+class ConnectionPool:
+    """
+    Factory for keep-alive aiohttp sessions with connection reuse counters.
+
+    Connections are kept open between requests (HTTP/1.1 keep-alive), so
+    the TCP and TLS handshakes are paid once per pooled connection rather
+    than once per page. A single SSLContext is shared by every connection.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 300,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        stats: Optional[Dict] = None
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.ssl_context = ssl_context or ssl.create_default_context()
+
+        # Counters are written into the caller's stats dict when given
+        self.stats = stats if stats is not None else {}
+        for key in ('connections_opened', 'connections_reused', 'requests_served'):
+            self.stats.setdefault(key, 0)
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Build a trace config that counts new vs. reused connections."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx: SimpleNamespace, params) -> None:
+            self.stats['connections_opened'] += 1
+
+        async def on_connection_reuseconn(session, ctx: SimpleNamespace, params) -> None:
+            self.stats['connections_reused'] += 1
+
+        async def on_request_end(session, ctx: SimpleNamespace, params) -> None:
+            self.stats['requests_served'] += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+    def create_session(self, timeout: aiohttp.ClientTimeout) -> aiohttp.ClientSession:
+        """Create a client session backed by a fresh keep-alive connector."""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.dns_cache_ttl is not None,
+            ttl_dns_cache=self.dns_cache_ttl,
+            ssl=self.ssl_context,
+        )
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._trace_config()]
+        )
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Requests served per connection opened."""
+        opened = self.stats['connections_opened']
+        return self.stats['requests_served'] / opened if opened else 0.0
@@ -4,32 +4,66 @@ SOTA 2026 Edition with concurrent crawling and smart URL discovery.
 """
 
 import asyncio
+import functools
+import itertools
 import logging
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
 import time
-from dataclasses import dataclass, field
-from typing import Set, List, Optional, Dict, Callable
-from urllib.parse import urljoin, urlparse, urldefrag
-from urllib.robotparser import RobotFileParser
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Set, List, Optional, Dict, Callable, Tuple, Sequence, AsyncIterator
+from urllib.parse import urlparse
 
 import aiohttp
 from bs4 import BeautifulSoup
 
+from .cache import CacheEntry, ValidatorStore, content_hash
+from .checkpoint import CrawlCheckpoint
+from .connection import ConnectionPool
+from .frontier import (
+    DEDUP_MODES, FRONTIER_ORDERS, Frontier, FrontierQueue, HostFrontier, MemoryFrontier,
+    PriorityFrontier, SeenStore, SQLiteFrontier, SQLitePriorityFrontier, SQLiteSeenStore,
+    create_seen_store
+)
+from .parser import (
+    PARSER_ENGINES, Domain, HostAllowlist, ParseResult, extract_links, parse_html, parse_lastmod,
+    resolve_link
+)
+from .normalize import TRACKING_PARAMS, URLNormalizer
+from .ratelimit import RateLimiter, parse_retry_after
+from .robots import RobotsCache, RobotsRules
+from .sitemaps import MAX_SITEMAP_FILES, SitemapStreamParser
+from .traps import TrapDetector
+
 logger = logging.getLogger(__name__)
 
 USER_AGENT = 'FreeSitemapGenerator/3.0 (+https://github.com/jtgsystems/free-sitemap-generator)'
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class PageInfo:
-    """Information about a crawled page."""
+    """Information about a crawled page (immutable, no per-instance __dict__)."""
     url: str
     depth: int = 0
     lastmod: Optional[str] = None
     priority: float = 0.5
     changefreq: str = "monthly"
     title: Optional[str] = None
-    images: List[str] = field(default_factory=list)
+    images: Tuple[str, ...] = ()
+    
+    def __post_init__(self):
+        if not isinstance(self.images, tuple):
+            object.__setattr__(self, 'images', tuple(self.images))
     
     def to_xml(self) -> str:
         """Generate XML sitemap entry."""
@@ -57,6 +91,46 @@ class PageInfo:
                 .replace("'", "&apos;"))
 
 
+@dataclass
+class FailedURL:
+    """A URL that could not be crawled, with the reason for the last failure."""
+    url: str
+    depth: int
+    reason: str
+    attempts: int
+
+
+# Responses worth retrying; anything else is a permanent failure
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Links with these extensions are never HTML pages, so they are not fetched
+NON_HTML_EXTENSIONS = frozenset({
+    '7z', 'avi', 'bin', 'bmp', 'bz2', 'css', 'csv', 'dmg', 'doc', 'docx', 'eot', 'epub',
+    'exe', 'flac', 'gif', 'gz', 'ico', 'iso', 'jpeg', 'jpg', 'js', 'json', 'm4a', 'm4v',
+    'mkv', 'mov', 'mp3', 'mp4', 'mpeg', 'mpg', 'msi', 'odt', 'ogg', 'otf', 'pdf', 'png',
+    'ppt', 'pptx', 'rar', 'rss', 'svg', 'tar', 'tgz', 'tif', 'tiff', 'ttf', 'wav', 'webm',
+    'webp', 'woff', 'woff2', 'xls', 'xlsx', 'xml', 'xz', 'zip'
+})
+
+
+def crawl_seeds(
+    base_url: str,
+    allowed_hosts: Optional[Sequence[str]] = None,
+    normalizer: Optional[URLNormalizer] = None
+) -> List[str]:
+    """
+    URLs a crawl starts from: the base URL and the homepage of every other
+    allowed host (wildcard patterns have no homepage to start from).
+    """
+    seeds = [base_url]
+    parts = urlparse(base_url)
+    for host in allowed_hosts or ():
+        if not host.startswith('*.') and host.lower() != parts.netloc.lower():
+            seed = f"{parts.scheme}://{host}/"
+            seeds.append(normalizer.normalize(seed) if normalizer else seed)
+    return seeds
+
+
 class AsyncCrawler:
     """High-performance async web crawler."""
     
@@ -70,8 +144,67 @@ class AsyncCrawler:
         respect_robots_txt: bool = True,
         include_images: bool = False,
         follow_redirects: bool = True,
-        timeout: int = 30
+        timeout: int = 30,
+        pool_size: int = 100,
+        pool_size_per_host: Optional[int] = None,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 300,
+        parse_workers: int = 0,
+        parser: str = 'bs4',
+        validator_store: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: float = 30.0,
+        resume: bool = False,
+        frontier_store: str = 'memory',
+        frontier_dir: Optional[str] = None,
+        dedup: str = 'exact',
+        dedup_error_rate: float = 0.001,
+        page_store: str = 'dict',
+        keep_pages: bool = True,
+        adaptive_rate: bool = True,
+        max_rate: Optional[float] = None,
+        max_retries: int = 2,
+        retry_backoff: float = 1.0,
+        retry_backoff_max: float = 60.0,
+        allowed_hosts: Optional[Sequence[str]] = None,
+        host_concurrency: Optional[int] = None,
+        sitemap_seed: bool = False,
+        sitemap_urls: Optional[Sequence[str]] = None,
+        skip_extensions: Optional[Sequence[str]] = NON_HTML_EXTENSIONS,
+        exclude_patterns: Optional[Sequence[str]] = None,
+        max_body_bytes: Optional[int] = 10 * 1024 * 1024,
+        robots_ttl: float = 24 * 3600,
+        normalize_urls: bool = True,
+        strip_params: Optional[Sequence[str]] = TRACKING_PARAMS,
+        sort_query: bool = True,
+        trailing_slash: str = 'keep',
+        honor_canonical: bool = True,
+        trap_detection: bool = True,
+        max_segment_repeats: Optional[int] = 2,
+        max_query_variants: Optional[int] = 1000,
+        max_pattern_depth: Optional[int] = 20,
+        frontier_order: str = 'fifo'
     ):
+        if parser not in PARSER_ENGINES:
+            raise ValueError(f"parser must be one of {PARSER_ENGINES}, got {parser!r}")
+        if frontier_store not in ('memory', 'disk'):
+            raise ValueError(f"frontier_store must be 'memory' or 'disk', got {frontier_store!r}")
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"dedup must be one of {DEDUP_MODES}, got {dedup!r}")
+        if page_store not in ('dict', 'columnar'):
+            raise ValueError(f"page_store must be 'dict' or 'columnar', got {page_store!r}")
+        if frontier_order not in FRONTIER_ORDERS:
+            raise ValueError(f"frontier_order must be one of {FRONTIER_ORDERS}, got {frontier_order!r}")
+        
+        # One spelling per page: applied to every URL before it is deduplicated
+        self.normalizer: Optional[URLNormalizer] = None
+        if normalize_urls:
+            self.normalizer = URLNormalizer(
+                strip_params=strip_params, sort_query=sort_query, trailing_slash=trailing_slash
+            )
+            base_url = self.normalizer.normalize(base_url)
+        self.honor_canonical = honor_canonical
+        
         self.base_url = base_url
         self.domain = urlparse(base_url).netloc
         self.max_depth = max_depth
@@ -82,62 +215,223 @@ class AsyncCrawler:
         self.include_images = include_images
         self.follow_redirects = follow_redirects
         self.timeout = timeout
+        self.parse_workers = parse_workers
+        self.parser = parser
+        self.validator_store = validator_store
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.frontier_store = frontier_store
+        self.frontier_dir = frontier_dir
+        self.frontier_order = frontier_order
+        self.dedup = dedup
+        self.dedup_error_rate = dedup_error_rate
+        self.page_store = page_store
+        self.keep_pages = keep_pages
+        self.adaptive_rate = adaptive_rate
+        self.max_rate = max_rate
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.host_concurrency = host_concurrency
+        self.sitemap_seed = sitemap_seed or bool(sitemap_urls)
+        self.sitemap_urls = list(sitemap_urls or [])
+        self.max_body_bytes = max_body_bytes
+        
+        # URL prefilter: links that cannot be HTML pages are dropped unfetched
+        self.skip_extensions = frozenset(ext.lower().lstrip('.') for ext in skip_extensions or ())
+        self.exclude_patterns = [re.compile(pattern) for pattern in exclude_patterns or ()]
+        
+        # Crawl traps (calendars, endless pagination, relative-link loops)
+        # are pruned as links are queued; traps.report() lists what was cut
+        self.traps: Optional[TrapDetector] = None
+        if trap_detection:
+            self.traps = TrapDetector(
+                max_segment_repeats=max_segment_repeats,
+                max_query_variants=max_query_variants,
+                max_pattern_depth=max_pattern_depth
+            )
         
-        self.visited_urls: Set[str] = set()
+        # Extra hosts to crawl alongside the base URL's host; exact hosts
+        # are seeded with their homepage, wildcards are followed via links
+        self.allowed_hosts: Optional[HostAllowlist] = None
+        self.seed_urls = crawl_seeds(base_url, allowed_hosts, self.normalizer)
+        if allowed_hosts:
+            self.allowed_hosts = HostAllowlist([self.domain, *allowed_hosts])
+        self._link_domain: Domain = self.allowed_hosts or self.domain
+        
+        # URLs seen at discovery (queued once) vs. URLs actually fetched
+        self.discovered_urls: SeenStore = create_seen_store(dedup, dedup_error_rate)
+        self.visited_urls: SeenStore = create_seen_store(dedup, dedup_error_rate)
         self.pages: Dict[str, PageInfo] = {}
-        self.robot_parser: Optional[RobotFileParser] = None
+        if page_store == 'columnar':
+            from .pagestore import ColumnarPageStore
+            self.pages = ColumnarPageStore()
+        # Pages found so far; pages is left empty when keep_pages is off
+        self.page_count = 0
+        self.robot_parser: Optional[RobotsRules] = None
+        self.robots = RobotsCache(ttl=robots_ttl)
+        self._robots_tasks: Dict[str, asyncio.Task] = {}
         self.url_callback: Optional[Callable[[PageInfo], None]] = None
         self.progress_callback: Optional[Callable[[int, int], None]] = None
+        self.validators: Optional[ValidatorStore] = None
+        self.checkpoint: Optional[CrawlCheckpoint] = None
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
+        self._temp_frontier_dir: Optional[str] = None
+        self._frontier_files: List[str] = []
+        self._page_queue: Optional[asyncio.Queue] = None
+        self._resumed_pages: List[PageInfo] = []
+        self._queue: Optional[FrontierQueue] = None
+        
+        # Pages whose rel=canonical named another URL, and URLs so far only
+        # reached through a spelling the normalizer rewrote
+        self._non_canonical: Set[str] = set()
+        self._reached_by_variant: Set[str] = set()
+        
+        # Failed attempts of URLs awaiting a retry, and URLs that gave up
+        self._attempts: Dict[str, int] = {}
+        self.dead_letters: List[FailedURL] = []
         
         # Statistics
         self.stats = {
             'urls_crawled': 0,
             'urls_failed': 0,
+            'retries': 0,
+            'requests_sent': 0,
+            'urls_not_modified': 0,
+            'urls_unchanged': 0,
+            'urls_enqueued': 0,
+            'duplicates_dropped': 0,
+            'queue_size': 0,
+            'peak_queue_size': 0,
+            'sitemaps_fetched': 0,
+            'urls_from_sitemaps': 0,
+            'urls_prefiltered': 0,
+            'urls_normalized': 0,
+            'fetches_avoided': 0,
+            'canonical_duplicates': 0,
+            'urls_trapped': 0,
+            'urls_skipped_content': 0,
+            'bodies_truncated': 0,
+            'bytes_received': 0,
+            'bytes_saved': 0,
             'start_time': None,
             'end_time': None
         }
+        
+        # Keep-alive connection pool (adds connection reuse counters to stats)
+        self.pool = ConnectionPool(
+            limit=max(pool_size, concurrency),
+            limit_per_host=pool_size_per_host or host_concurrency or concurrency,
+            keepalive_timeout=keepalive_timeout,
+            dns_cache_ttl=dns_cache_ttl,
+            stats=self.stats
+        )
+        
+        # Per-host pacing. crawl_delay is the pause per worker slot, so a host
+        # starts at concurrency / crawl_delay requests per second, then adapts
+        # to server feedback unless adaptive_rate is off
+        self.rate_limiter = RateLimiter(
+            delay=crawl_delay / max(concurrency, 1),
+            adaptive=adaptive_rate,
+            max_rate=max_rate,
+            stats=self.stats
+        )
     
     async def _init_robots_txt(self, session: aiohttp.ClientSession) -> None:
         """Initialize robots.txt parser."""
         if not self.respect_robots_txt:
             return
         
+        await self._ensure_robots(session, self.base_url)
+        self.robot_parser = self.robots.get(self.domain)
+    
+    async def _ensure_robots(self, session: aiohttp.ClientSession, url: str) -> None:
+        """
+        Load robots.txt for the URL's host unless fresh rules are cached;
+        concurrent callers share the fetch.
+        """
+        parts = urlparse(url)
+        if self.robots.fresh(parts.netloc):
+            return
+        task = self._robots_tasks.get(parts.netloc)
+        if task is None or task.done():
+            task = self._robots_tasks[parts.netloc] = asyncio.ensure_future(
+                self._load_robots(session, parts.scheme, parts.netloc)
+            )
+        await asyncio.shield(task)
+    
+    async def _load_robots(self, session: aiohttp.ClientSession, scheme: str, host: str) -> None:
+        """Fetch and compile robots.txt for a host."""
+        rules: Optional[RobotsRules] = None
+        ttl = None
         try:
-            robots_url = f"{urlparse(self.base_url).scheme}://{self.domain}/robots.txt"
-            self.robot_parser = RobotFileParser()
-            self.robot_parser.set_url(robots_url)
-            
+            robots_url = f"{scheme}://{host}/robots.txt"
             async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status == 200:
+                # A missing robots.txt allows everything; an access-denied or
+                # unavailable one disallows everything, the latter only until
+                # it is retried a few minutes later
+                if resp.status in (401, 403):
+                    rules = RobotsRules(disallow_all=True)
+                elif 400 <= resp.status < 500:
+                    rules = RobotsRules()
+                elif resp.status == 200:
                     content = await resp.text()
-                    self.robot_parser.parse(content.split('\n'))
+                    rules = RobotsRules.parse(content.splitlines(), USER_AGENT)
                     logger.info(f"Loaded robots.txt from {robots_url}")
+                    
+                    # Crawl-delay / Request-rate cap the request rate for this host
+                    if rules.crawl_delay:
+                        self.rate_limiter.set_crawl_delay(host, rules.crawl_delay)
+                        logger.info(f"robots.txt on {host} asks for {rules.crawl_delay:g}s between requests")
+                else:
+                    rules = RobotsRules(disallow_all=True)
+                    ttl = min(self.robots.ttl, 300)
         except Exception as e:
-            logger.warning(f"Could not load robots.txt: {e}")
-            self.robot_parser = None
+            logger.warning(f"Could not load robots.txt for {host}: {e}")
+            rules = None
+        self.robots.put(host, rules, ttl)
     
     def _can_fetch(self, url: str) -> bool:
         """Check if URL can be fetched according to robots.txt."""
-        if not self.respect_robots_txt or not self.robot_parser:
+        if not self.respect_robots_txt:
+            return True
+        rules = self.robots.get(urlparse(url).netloc)
+        if not rules:
             return True
-        return self.robot_parser.can_fetch(USER_AGENT, url)
+        return rules.can_fetch(url)
     
     def _calculate_priority(self, depth: int, url: str) -> float:
         """Calculate page priority based on depth and URL characteristics."""
         # Base priority decreases with depth
         priority = max(0.1, 1.0 - (depth * 0.2))
         
-        # Boost homepage
+        # Boost homepage (and the homepages of other allowed hosts)
+        parts = urlparse(url)
         if url == self.base_url or url.rstrip('/') == self.base_url.rstrip('/'):
             priority = 1.0
+        elif parts.netloc != self.domain and parts.path in ('', '/') and not parts.query:
+            priority = 1.0
         
         # Boost important pages
-        path = urlparse(url).path.lower()
+        path = parts.path.lower()
         if any(x in path for x in ['contact', 'about', 'product', 'service']):
             priority = min(1.0, priority + 0.1)
         
         return round(priority, 1)
     
+    def _frontier_score(self, url: str, depth: int, inlinks: int) -> float:
+        """
+        Crawl order with frontier_order='priority', highest first: the
+        page's sitemap priority, plus 0.05 per doubling of the links to it
+        seen so far (up to 0.5), minus 0.2 for a query string.
+        """
+        score = self._calculate_priority(depth, url) + 0.05 * min(inlinks.bit_length() - 1, 10)
+        if '?' in url:
+            # Sorts, filters and session variants of pages rank below pages
+            score -= 0.2
+        return score
+    
     def _calculate_changefreq(self, url: str) -> str:
         """Estimate change frequency based on URL patterns."""
         path = urlparse(url).path.lower()
@@ -158,16 +452,34 @@ class AsyncCrawler:
         session: aiohttp.ClientSession,
         url: str,
         depth: int
-    ) -> Optional[PageInfo]:
-        """Fetch and parse a single page."""
-        if url in self.visited_urls or len(self.pages) >= self.max_urls:
-            return None
+    ) -> Tuple[Optional[PageInfo], Set[str]]:
+        """
+        Fetch a single page and parse it once.
+        
+        The same response yields both the page metadata and its outgoing
+        links, so every page costs exactly one request.
         
+        Returns:
+            Tuple of (page info or None, set of links to follow)
+        """
+        links: Set[str] = set()
+        
+        retrying = url in self._attempts
+        if (url in self.visited_urls and not retrying) or self.page_count >= self.max_urls:
+            return None, links
+        
+        if self.respect_robots_txt:
+            await self._ensure_robots(session, url)
         if not self._can_fetch(url):
             logger.debug(f"Skipping {url} (robots.txt)")
-            return None
+            return None, links
         
         self.visited_urls.add(url)
+        host = urlparse(url).netloc
+        ticket = -1
+        # Only one outcome per ticket reaches the limiter, even when the
+        # body read fails after the response status was recorded
+        recorded = False
         
         try:
             headers = {
@@ -176,210 +488,733 @@ class AsyncCrawler:
                 'Accept-Language': 'en-US,en;q=0.5',
                 'Accept-Encoding': 'gzip, deflate, br',
                 'DNT': '1',
-                'Connection': 'keep-alive',
             }
             
+            # Conditional request when we hold validators from a previous crawl
+            cached = self.validators.get(url) if self.validators else None
+            if cached:
+                headers.update(cached.conditional_headers())
+            
+            body: Optional[bytes] = None
+            encoding: Optional[str] = None
+            
+            ticket = await self.rate_limiter.acquire(host)
+            loop = asyncio.get_running_loop()
+            sent_at = loop.time()
+            
             async with session.get(
                 url,
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=self.timeout),
                 allow_redirects=self.follow_redirects
             ) as resp:
+                self.stats['requests_sent'] += 1
+                self.rate_limiter.record(
+                    host, ticket, resp.status, loop.time() - sent_at, resp.headers.get('Retry-After')
+                )
+                recorded = True
                 
-                if resp.status != 200:
+                if resp.status == 304 and cached:
+                    self.stats['urls_not_modified'] += 1
+                elif resp.status != 200:
                     logger.debug(f"HTTP {resp.status} for {url}")
-                    self.stats['urls_failed'] += 1
-                    return None
-                
-                content_type = resp.headers.get('Content-Type', '')
-                if 'text/html' not in content_type:
-                    logger.debug(f"Skipping non-HTML {url} ({content_type})")
-                    return None
-                
-                text = await resp.text()
-                
-                # Parse page
-                soup = BeautifulSoup(text, 'lxml')
-                
-                # Extract lastmod from header if available
-                lastmod = None
-                if 'Last-Modified' in resp.headers:
-                    try:
-                        from email.utils import parsedate_to_datetime
-                        dt = parsedate_to_datetime(resp.headers['Last-Modified'])
-                        lastmod = dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
-                    except:
-                        pass
-                
-                # Extract title
-                title = None
-                title_tag = soup.find('title')
-                if title_tag:
-                    title = title_tag.get_text(strip=True)
-                
-                # Extract images if enabled
-                images = []
-                if self.include_images:
-                    for img in soup.find_all('img', src=True):
-                        img_url = urljoin(url, img['src'])
-                        if urlparse(img_url).netloc == self.domain:
-                            images.append(img_url)
+                    self._fail(
+                        url, depth, f"HTTP {resp.status}", resp.status in RETRY_STATUSES,
+                        parse_retry_after(resp.headers.get('Retry-After'))
+                    )
+                    return None, links
+                else:
+                    # Decide from the headers, before any of the body is read
+                    content_type = resp.headers.get('Content-Type', '')
+                    if 'text/html' not in content_type:
+                        logger.debug(f"Skipping non-HTML {url} ({content_type})")
+                        self.stats['urls_skipped_content'] += 1
+                        self.stats['bytes_saved'] += resp.content_length or 0
+                        resp.close()
+                        return None, links
+                    
+                    body = await self._read_body(resp, url)
+                    encoding = resp.charset
                 
-                page_info = PageInfo(
-                    url=url,
-                    depth=depth,
-                    lastmod=lastmod,
-                    priority=self._calculate_priority(depth, url),
-                    changefreq=self._calculate_changefreq(url),
-                    title=title,
-                    images=images[:10]  # Limit images per page
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+            
+            # Parse after the connection has been released to the pool
+            if self.validators is not None:
+                parsed = await self._parse_with_cache(
+                    url, depth, body, encoding, etag, last_modified, cached
                 )
-                
-                self.pages[url] = page_info
-                self.stats['urls_crawled'] += 1
-                
-                if self.url_callback:
-                    self.url_callback(page_info)
-                
-                if self.progress_callback:
-                    self.progress_callback(len(self.pages), self.max_urls)
-                
-                return page_info
-                
+            else:
+                parsed = await self._parse(
+                    body, url, encoding, last_modified, depth < self.max_depth
+                )
+            
+            links = self._follow(parsed.links)
+            
+            # A page naming another URL as canonical is a duplicate of it:
+            # that URL is queued and listed instead
+            canonical = self._canonical_target(url, parsed.canonical)
+            if canonical is not None:
+                logger.debug(f"{url} is a duplicate of {canonical}")
+                self.stats['canonical_duplicates'] += 1
+                self._attempts.pop(url, None)
+                if canonical not in self.visited_urls:
+                    links.add(canonical)
+                return None, links
+            
+            page_info = PageInfo(
+                url=url,
+                depth=depth,
+                lastmod=parsed.lastmod,
+                priority=self._calculate_priority(depth, url),
+                changefreq=self._calculate_changefreq(url),
+                title=parsed.title,
+                images=tuple(parsed.images)
+            )
+            
+            self.stats['urls_crawled'] += 1
+            self._attempts.pop(url, None)
+            await self._store_page(page_info)
+            
+            if self.url_callback:
+                self.url_callback(page_info)
+            
+            if self.progress_callback:
+                self.progress_callback(self.page_count, self.max_urls)
+            
+            return page_info, links
+            
         except asyncio.TimeoutError:
             logger.warning(f"Timeout fetching {url}")
-            self.stats['urls_failed'] += 1
+            if not recorded:
+                self.rate_limiter.record(host, ticket, None, self.timeout)
+            self._fail(url, depth, "Timeout", True)
         except Exception as e:
             logger.warning(f"Error fetching {url}: {e}")
-            self.stats['urls_failed'] += 1
+            transient = isinstance(e, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+            if isinstance(e, aiohttp.ClientConnectionError) and not recorded:
+                self.rate_limiter.record(host, ticket, None, 0.0)
+            self._fail(url, depth, f"{type(e).__name__}: {e}", transient)
+        
+        return None, links
+    
+    async def _read_body(self, resp: aiohttp.ClientResponse, url: str) -> bytes:
+        """
+        Stream a response body, keeping at most max_body_bytes.
+        
+        Oversized pages are cut short (the start still has the title and
+        most links) and the connection is dropped instead of draining the
+        rest. The cap applies to decoded bytes, so compressed bodies
+        cannot expand past it either.
+        """
+        limit = self.max_body_bytes
+        chunks = []
+        size = 0
+        async for chunk in resp.content.iter_any():
+            chunks.append(chunk)
+            size += len(chunk)
+            if limit is not None and size >= limit:
+                break
+        body = b''.join(chunks)
+        
+        if limit is not None and (size > limit or not resp.content.at_eof()):
+            body = body[:limit]
+            logger.debug(f"Truncated {url} at {limit} bytes")
+            self.stats['bodies_truncated'] += 1
+            if resp.content_length:
+                self.stats['bytes_saved'] += max(0, resp.content_length - size)
+            resp.close()
+        self.stats['bytes_received'] += len(body)
+        return body
+    
+    def _normalize_link(self, link: str) -> str:
+        """
+        Normalize a discovered link.
+        
+        Without normalization every distinct spelling of a URL would be
+        fetched, so each spelling after the first is a fetch avoided. Each
+        spelling is counted once: rewritten ones are remembered as
+        discovered, and a URL first reached through a rewritten spelling
+        is remembered until its plain spelling turns up.
+        """
+        if self.normalizer is None:
+            return link
+        normalized = self.normalizer.normalize(link)
+        if normalized == link:
+            if link in self._reached_by_variant:
+                self._reached_by_variant.discard(link)
+                self.stats['fetches_avoided'] += 1
+            return link
+        
+        if link not in self.discovered_urls:
+            self.discovered_urls.add(link)
+            self.stats['urls_normalized'] += 1
+            if normalized in self._reached_by_variant or normalized in self.discovered_urls:
+                self.stats['fetches_avoided'] += 1
+            else:
+                self._reached_by_variant.add(normalized)
+        return normalized
+    
+    def _follow(self, links: Set[str]) -> Set[str]:
+        """Normalize a page's links and keep those worth queueing."""
+        follow = set()
+        for link in links:
+            link = self._normalize_link(link)
+            if link not in self.visited_urls and not self._prefilter(link):
+                follow.add(link)
+        return follow
+    
+    def _canonical_target(self, url: str, canonical: Optional[str]) -> Optional[str]:
+        """The URL a page defers to via rel=canonical, or None if it is canonical itself."""
+        if not self.honor_canonical or not canonical:
+            return None
+        canonical = self._normalize_link(canonical)
+        # Pointing back at a page that deferred to this one: keep one of them
+        if canonical == url or canonical in self._non_canonical:
+            return None
+        self._non_canonical.add(url)
+        return canonical
+    
+    def _prefilter(self, url: str) -> bool:
+        """
+        Whether a link is ruled out without fetching it, by extension or an
+        exclude pattern. Ruled-out links are counted once.
+        """
+        excluded = False
+        if self.skip_extensions:
+            name = urlparse(url).path.rpartition('/')[2]
+            excluded = '.' in name and name.rpartition('.')[2].lower() in self.skip_extensions
+        if not excluded and self.exclude_patterns:
+            excluded = any(pattern.search(url) for pattern in self.exclude_patterns)
+        
+        if excluded and url not in self.discovered_urls:
+            self.discovered_urls.add(url)
+            self.stats['urls_prefiltered'] += 1
+        return excluded
+    
+    def _fail(
+        self,
+        url: str,
+        depth: int,
+        reason: str,
+        retryable: bool,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Schedule a retry for a failed fetch, or dead-letter the URL.
+        
+        Retries wait on a timer with jittered exponential backoff (at least
+        Retry-After when given), so no worker is held while they wait.
+        """
+        attempts = self._attempts.pop(url, 0) + 1
+        if retryable and attempts <= self.max_retries and self._queue is not None:
+            backoff = min(self.retry_backoff_max, self.retry_backoff * 2 ** (attempts - 1))
+            delay = max(random.uniform(backoff / 2, backoff), retry_after or 0.0)
+            self._attempts[url] = attempts
+            self._queue.defer((url, depth), delay)
+            self.stats['retries'] += 1
+            logger.debug(f"Retrying {url} in {delay:.1f}s ({reason}, attempt {attempts})")
+            return
+        
+        self.stats['urls_failed'] += 1
+        self.dead_letters.append(FailedURL(url, depth, reason, attempts))
+    
+    async def _store_page(self, page: PageInfo) -> None:
+        """Count a page, keep it if configured, and hand it to iter_pages()."""
+        self.page_count += 1
+        if self.keep_pages:
+            self.pages[page.url] = page
+        if self._page_queue is not None:
+            # Blocks while the consumer is behind, throttling the workers
+            await self._page_queue.put(page)
+    
+    async def _parse(
+        self,
+        body: bytes,
+        url: str,
+        encoding: Optional[str],
+        last_modified: Optional[str],
+        follow_links: bool
+    ) -> ParseResult:
+        """Parse a page inline or in the process pool when configured."""
+        parse = functools.partial(
+            parse_html,
+            body,
+            url,
+            self._link_domain,
+            encoding=encoding,
+            last_modified=last_modified,
+            include_images=self.include_images,
+            follow_links=follow_links,
+            engine=self.parser
+        )
+        
+        if self._parse_executor is None:
+            return parse()
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor, parse)
+    
+    async def _parse_with_cache(
+        self,
+        url: str,
+        depth: int,
+        body: Optional[bytes],
+        encoding: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        cached: Optional[CacheEntry]
+    ) -> ParseResult:
+        """
+        Parse a response, reusing the cached parse when the page is unchanged.
+        
+        A 304 (body is None) or a body whose hash matches the stored one is
+        answered from the validator store; only changed pages are parsed.
+        The store is then updated with the latest validators.
+        """
+        body_hash = content_hash(body) if body is not None else cached.content_hash
+        
+        if cached and body_hash == cached.content_hash:
+            if body is not None:
+                self.stats['urls_unchanged'] += 1
+            last_modified = last_modified or cached.last_modified
+            parsed = ParseResult(
+                title=cached.title,
+                links=set(cached.links),
+                images=list(cached.images),
+                lastmod=parse_lastmod(last_modified),
+                canonical=cached.canonical
+            )
+        else:
+            # Links are always extracted so the cache can serve any depth
+            parsed = await self._parse(body, url, encoding, last_modified, True)
+        
+        self.validators.put(url, CacheEntry(
+            etag=etag or (cached.etag if cached else None),
+            last_modified=last_modified,
+            content_hash=body_hash,
+            title=parsed.title,
+            links=sorted(parsed.links),
+            images=parsed.images,
+            canonical=parsed.canonical
+        ))
         
-        return None
+        if depth >= self.max_depth:
+            parsed.links = set()
+        return parsed
     
     def _extract_links(self, soup: BeautifulSoup, base_url: str) -> Set[str]:
         """Extract valid links from parsed HTML."""
-        links = set()
+        return self._follow(extract_links(soup, base_url, self._link_domain))
+    
+    def _open_frontier(self) -> FrontierQueue:
+        """Create the frontier and seen store for the configured storage."""
+        # Several hosts, or a per-host cap: one round-robin sub-queue per host,
+        # skipping hosts the rate limiter is holding back
+        per_host = self.allowed_hosts is not None or self.host_concurrency is not None
+        priority = self.frontier_order == 'priority'
         
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            
-            # Skip anchors and javascript
-            if href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
-                continue
-            
-            # Resolve relative URLs
-            absolute_url = urljoin(base_url, href)
-            
-            # Remove fragment
-            absolute_url, _ = urldefrag(absolute_url)
+        if self.frontier_store == 'memory':
+            def memory_frontier(host: Optional[str] = None) -> Frontier:
+                return PriorityFrontier(self._frontier_score) if priority else MemoryFrontier()
+            if per_host:
+                return FrontierQueue(
+                    HostFrontier(memory_frontier, self.host_concurrency, self.rate_limiter.due)
+                )
+            return FrontierQueue(memory_frontier())
+        
+        directory = self.frontier_dir
+        if directory is None:
+            directory = self._temp_frontier_dir = tempfile.mkdtemp(prefix='sitemap-frontier-')
+        else:
+            os.makedirs(directory, exist_ok=True)
+        
+        # The stores start empty and their files are removed when the crawl
+        # ends, so a reused frontier_dir never carries over another crawl
+        def scratch_file(name: str) -> str:
+            path = os.path.join(directory, name)
+            self._frontier_files.append(path)
+            return path
+        
+        # Compact dedup modes already bound memory, so they stay in RAM
+        if self.dedup == 'exact':
+            discovered = SQLiteSeenStore(scratch_file('discovered.sqlite'))
+            discovered.update(self.discovered_urls)
+            self.discovered_urls = discovered
             
-            parsed = urlparse(absolute_url)
+            seen = SQLiteSeenStore(scratch_file('seen.sqlite'))
+            seen.update(self.visited_urls)
+            self.visited_urls = seen
+        
+        def disk_frontier(name: str) -> Frontier:
+            if priority:
+                return SQLitePriorityFrontier(scratch_file(name), self._frontier_score)
+            return SQLiteFrontier(scratch_file(name))
+        if per_host:
+            host_files = itertools.count(1)
+            return FrontierQueue(HostFrontier(
+                lambda host: disk_frontier(f'frontier-{next(host_files)}.sqlite'),
+                self.host_concurrency,
+                self.rate_limiter.due
+            ))
+        return FrontierQueue(disk_frontier('frontier.sqlite'))
+    
+    def _close_frontier(self, queue: FrontierQueue) -> None:
+        """Close disk-backed stores and remove their files and temporary directory."""
+        queue.frontier.close()
+        self.discovered_urls.close()
+        self.visited_urls.close()
+        for path in self._frontier_files:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+        self._frontier_files = []
+        if self._temp_frontier_dir is not None:
+            shutil.rmtree(self._temp_frontier_dir, ignore_errors=True)
+            self._temp_frontier_dir = None
+    
+    def _initial_frontier(self) -> List[Tuple[str, int]]:
+        """Return the URLs to start from, restoring checkpointed state on resume."""
+        seeds = [(url, 0) for url in self.seed_urls]
+        self.discovered_urls.update(self.seed_urls)
+        if self.checkpoint is None:
+            return seeds
+        
+        if self.resume:
+            frontier, visited, pages = self.checkpoint.load()
+            if visited or frontier:
+                self.visited_urls.update(visited)
+                self.discovered_urls.update(visited)
+                self.discovered_urls.update(url for url, _ in frontier)
+                if self.keep_pages:
+                    self.pages.update(pages)
+                    self.page_count = len(self.pages)
+                else:
+                    # Streamed again at the start so the consumer sees every page
+                    self._resumed_pages = list(pages.values())
+                logger.info(
+                    f"Resuming from checkpoint: {len(pages)} pages, "
+                    f"{len(frontier)} URLs in frontier"
+                )
+                return frontier
+        
+        self.checkpoint.add_frontier(seeds)
+        return seeds
+    
+    def _enqueue(self, link: str, depth: int) -> bool:
+        """Queue a link unless it was already discovered, which counts as an inlink."""
+        if link in self.discovered_urls:
+            self.stats['duplicates_dropped'] += 1
+            # Links to a URL still queued raise its rank in a priority frontier
+            self._queue.frontier.add_inlink(link)
+            return False
+        if self._is_trap(link, depth):
+            return False
+        self.discovered_urls.add(link)
+        self._queue.put_nowait((link, depth))
+        self.stats['urls_enqueued'] += 1
+        self.stats['queue_size'] = self._queue.qsize()
+        self.stats['peak_queue_size'] = max(
+            self.stats['peak_queue_size'], self.stats['queue_size']
+        )
+        return True
+    
+    def _is_trap(self, link: str, depth: int) -> bool:
+        """Whether a new link looks like a crawl trap. Trapped links are counted once."""
+        if self.traps is None:
+            return False
+        reason = self.traps.check(link, depth)
+        if reason is None:
+            return False
+        self.discovered_urls.add(link)
+        self.stats['urls_trapped'] += 1
+        logger.debug(f"Pruned {link}: {reason}")
+        return True
+    
+    async def _wait_until_done(self, queue: FrontierQueue) -> None:
+        """Return once the crawl is complete; by default when the queue drains."""
+        await queue.join()
+    
+    async def _sitemap_locations(self, session: aiohttp.ClientSession) -> List[str]:
+        """Sitemaps to seed from: the given ones, else robots.txt Sitemap: lines, else /sitemap.xml."""
+        if self.sitemap_urls:
+            return list(self.sitemap_urls)
+        
+        locations = []
+        for seed in self.seed_urls:
+            parts = urlparse(seed)
+            if self.respect_robots_txt:
+                await self._ensure_robots(session, seed)
+                rules = self.robots.get(parts.netloc)
+                listed = rules.sitemaps if rules else []
+            else:
+                # Crawl rules are ignored, but the Sitemap: lines are still useful
+                listed = await self._fetch_robots_sitemaps(session, parts.scheme, parts.netloc)
+            locations.extend(listed or [f"{parts.scheme}://{parts.netloc}/sitemap.xml"])
+        return locations
+    
+    async def _fetch_robots_sitemaps(self, session: aiohttp.ClientSession, scheme: str, host: str) -> List[str]:
+        """Read only the Sitemap: lines of a host's robots.txt."""
+        try:
+            async with session.get(
+                f"{scheme}://{host}/robots.txt",
+                headers={'User-Agent': USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                if resp.status != 200:
+                    return []
+                content = await resp.text()
+        except Exception as e:
+            logger.debug(f"Could not load robots.txt for {host}: {e}")
+            return []
+        return RobotsRules.parse(content.splitlines(), USER_AGENT).sitemaps
+    
+    def _sitemap_depth(self, url: str) -> int:
+        """Depth given to a URL found in a sitemap: its path segments, up to max_depth."""
+        segments = [segment for segment in urlparse(url).path.split('/') if segment]
+        return min(len(segments), self.max_depth)
+    
+    async def _seed_from_sitemaps(self, session: aiohttp.ClientSession, queue: FrontierQueue) -> None:
+        """
+        Stream the site's existing sitemaps into the frontier.
+        
+        Runs alongside the workers so crawling starts at once. Sitemap
+        indexes are followed (up to MAX_SITEMAP_FILES files) and at most
+        max_urls URLs are seeded. The caller holds the queue open, and it
+        is released here once seeding ends, so the crawl cannot finish
+        while sitemaps are still being read.
+        """
+        try:
+            pending = deque(await self._sitemap_locations(session))
+            fetched: Set[str] = set()
+            while (pending and len(fetched) < MAX_SITEMAP_FILES
+                    and self.stats['urls_from_sitemaps'] < self.max_urls):
+                sitemap_url = pending.popleft()
+                if sitemap_url in fetched:
+                    continue
+                fetched.add(sitemap_url)
+                try:
+                    await self._read_sitemap(session, sitemap_url, pending)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning(f"Could not read sitemap {sitemap_url}: {e}")
+            logger.info(
+                f"Seeded {self.stats['urls_from_sitemaps']} URLs from "
+                f"{self.stats['sitemaps_fetched']} sitemaps"
+            )
+        except Exception as e:
+            logger.warning(f"Sitemap seeding failed: {e}")
+        finally:
+            queue.task_done()
+    
+    async def _read_sitemap(self, session: aiohttp.ClientSession, sitemap_url: str, pending: deque) -> None:
+        """Fetch one sitemap, queueing its pages and adding nested sitemaps to pending."""
+        host = urlparse(sitemap_url).netloc
+        ticket = await self.rate_limiter.acquire(host)
+        loop = asyncio.get_running_loop()
+        sent_at = loop.time()
+        
+        # Large sitemaps take a while; only a stalled read times out
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        async with session.get(sitemap_url, headers={'User-Agent': USER_AGENT}, timeout=timeout) as resp:
+            self.stats['requests_sent'] += 1
+            self.rate_limiter.record(
+                host, ticket, resp.status, loop.time() - sent_at, resp.headers.get('Retry-After')
+            )
+            if resp.status != 200:
+                logger.debug(f"HTTP {resp.status} for sitemap {sitemap_url}")
+                return
             
-            # Check scheme
-            if parsed.scheme not in ('http', 'https'):
+            self.stats['sitemaps_fetched'] += 1
+            parser = SitemapStreamParser()
+            async for chunk in resp.content.iter_chunked(64 * 1024):
+                self._seed_entries(parser.feed(chunk), sitemap_url, pending)
+                if parser.truncated or self.stats['urls_from_sitemaps'] >= self.max_urls:
+                    break
+            self._seed_entries(parser.close(), sitemap_url, pending)
+            if parser.truncated:
+                logger.warning(f"Sitemap {sitemap_url} exceeds {parser.max_bytes} bytes; rest ignored")
+    
+    def _seed_entries(self, entries: List[Tuple[str, str]], sitemap_url: str, pending: deque) -> None:
+        """Queue the page URLs from a parsed sitemap chunk in one batch."""
+        queued = []
+        for kind, loc in entries:
+            if kind == 'sitemap':
+                if loc.startswith(('http://', 'https://')):
+                    pending.append(loc)
                 continue
-            
-            # Check same domain
-            if parsed.netloc != self.domain:
+            if self.stats['urls_from_sitemaps'] >= self.max_urls:
+                break
+            link = resolve_link(loc, sitemap_url, self._link_domain)
+            if link is None:
                 continue
-            
-            # Normalize URL
-            normalized = parsed._replace(fragment="").geturl()
-            
-            if normalized not in self.visited_urls:
-                links.add(normalized)
-        
-        return links
+            link = self._normalize_link(link)
+            if self._prefilter(link):
+                continue
+            depth = self._sitemap_depth(link)
+            if self._enqueue(link, depth):
+                self.stats['urls_from_sitemaps'] += 1
+                queued.append((link, depth))
+        if queued and self.checkpoint is not None:
+            self.checkpoint.add_frontier(queued)
     
-    async def crawl(self) -> List[PageInfo]:
-        """Start the crawl and return discovered pages."""
-        self.stats['start_time'] = time.time()
+    async def _checkpoint_loop(self) -> None:
+        """Commit the checkpoint journal periodically."""
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            self.checkpoint.commit()
+            logger.debug(f"Checkpoint saved: {self.page_count} pages")
+    
+    async def crawl(self) -> Sequence[PageInfo]:
+        """
+        Start the crawl and return discovered pages.
         
-        connector = aiohttp.TCPConnector(
-            limit=self.concurrency,
-            limit_per_host=self.concurrency,
-            enable_cleanup_closed=True,
-            force_close=True,
-        )
+        With page_store='columnar' the result is a lazy view over the store
+        rather than a list, so pages are never all materialised at once.
+        With keep_pages=False nothing is kept and the result is empty; use
+        iter_pages() to receive pages as they are found.
+        """
+        self.stats['start_time'] = time.time()
         
         timeout = aiohttp.ClientTimeout(total=self.timeout)
         
-        async with aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout
-        ) as session:
-            # Initialize robots.txt
-            await self._init_robots_txt(session)
-            
-            # Start with base URL
-            queue = asyncio.Queue()
-            await queue.put((self.base_url, 0))
-            
-            semaphore = asyncio.Semaphore(self.concurrency)
-            
-            async def process_url(url: str, depth: int):
-                """Process a single URL."""
-                async with semaphore:
-                    page_info = await self._fetch_page(session, url, depth)
+        # Optional process pool so HTML parsing scales across cores
+        if self.parse_workers > 0:
+            self._parse_executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        
+        # Validators from previous crawls for conditional requests
+        if self.validator_store:
+            self.validators = ValidatorStore(self.validator_store)
+        
+        if self.checkpoint_path:
+            self.checkpoint = CrawlCheckpoint(self.checkpoint_path, resume=self.resume)
+        
+        try:
+            async with self.pool.create_session(timeout) as session:
+                # Initialize robots.txt
+                await self._init_robots_txt(session)
+                
+                # Start with base URL, or where the checkpoint left off
+                queue = self._queue = self._open_frontier()
+                for item in self._initial_frontier():
+                    queue.put_nowait(item)
+                resumed, self._resumed_pages = self._resumed_pages, []
+                for page in resumed:
+                    self.page_count += 1
+                    if self._page_queue is not None:
+                        await self._page_queue.put(page)
+                
+                async def process_url(url: str, depth: int):
+                    """Process a single URL."""
+                    page_info, links = await self._fetch_page(session, url, depth)
                     
-                    if page_info and depth < self.max_depth:
-                        # Extract and queue new links
-                        try:
-                            async with session.get(url, headers={'User-Agent': USER_AGENT}) as resp:
-                                text = await resp.text()
-                                soup = BeautifulSoup(text, 'lxml')
-                                links = self._extract_links(soup, url)
-                                
-                                for link in links:
-                                    if link not in self.visited_urls and len(self.pages) < self.max_urls:
-                                        await queue.put((link, depth + 1))
-                        except:
-                            pass
+                    # Queue new links, each exactly once
+                    queued = []
+                    for link in links:
+                        if self.page_count < self.max_urls and self._enqueue(link, depth + 1):
+                            queued.append((link, depth + 1))
                     
-                    # Rate limiting
-                    if self.crawl_delay > 0:
-                        await asyncio.sleep(self.crawl_delay)
-            
-            # Process queue
-            tasks = set()
-            
-            while True:
-                # Get next URL from queue
-                try:
-                    url, depth = await asyncio.wait_for(queue.get(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    # No more URLs in queue
-                    if not tasks:
-                        break
-                    # Wait for some tasks to complete
-                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-                    for task in done:
-                        try:
-                            await task
-                        except Exception:
-                            pass
-                    continue
+                    # URLs skipped for lack of budget or awaiting a retry stay in
+                    # the checkpoint frontier
+                    if (self.checkpoint is not None and url in self.visited_urls
+                            and url not in self._attempts):
+                        self.checkpoint.record(url, page_info, queued)
                 
-                # Start new task
-                task = asyncio.create_task(process_url(url, depth))
-                tasks.add(task)
-                
-                # Clean up completed tasks
-                if len(tasks) >= self.concurrency:
-                    done, tasks = await asyncio.wait(
-                        tasks,
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    for task in done:
+                async def worker():
+                    """Long-lived worker that pulls URLs until cancelled."""
+                    while True:
+                        url, depth = await queue.get()
+                        self.stats['queue_size'] = queue.qsize()
                         try:
-                            await task
-                        except Exception:
-                            pass
-            
-            # Wait for remaining tasks
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+                            await process_url(url, depth)
+                        except Exception as e:
+                            logger.warning(f"Error processing {url}: {e}")
+                        finally:
+                            queue.task_done((url, depth))
+                
+                # Fixed pool of workers; the crawl is done once every queued URL
+                # has been processed and no worker can add more
+                workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+                if self.sitemap_seed:
+                    queue.hold()
+                    workers.append(asyncio.create_task(self._seed_from_sitemaps(session, queue)))
+                if self.checkpoint is not None:
+                    workers.append(asyncio.create_task(self._checkpoint_loop()))
+                try:
+                    await self._wait_until_done(queue)
+                finally:
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+                    queue.cancel_deferred()
+                    for task in self._robots_tasks.values():
+                        task.cancel()
+                    self._queue = None
+                    self._close_frontier(queue)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+                self.checkpoint = None
+            if self._parse_executor is not None:
+                self._parse_executor.shutdown(wait=False, cancel_futures=True)
+                self._parse_executor = None
+            if self.validators is not None:
+                self.validators.close()
+                self.validators = None
         
         self.stats['end_time'] = time.time()
-        logger.info(f"Crawl completed: {len(self.pages)} URLs in {self.stats['end_time'] - self.stats['start_time']:.1f}s")
+        logger.info(f"Crawl completed: {self.page_count} URLs in {self.stats['end_time'] - self.stats['start_time']:.1f}s")
+        if self.dead_letters:
+            logger.info(
+                f"{len(self.dead_letters)} URLs failed after {self.stats['retries']} retries"
+            )
+        if self.stats['urls_trapped']:
+            pruned = self.traps.report()
+            logger.info(f"Pruned {self.stats['urls_trapped']} URLs in {len(pruned)} likely crawl traps")
+            for entry in pruned[:10]:
+                logger.info(f"  {entry.pattern} ({entry.reason}): {entry.count} URLs")
+        logger.info(
+            f"Connections: {self.stats['connections_opened']} opened for "
+            f"{self.stats['requests_served']} requests"
+        )
         
+        if self.page_store == 'columnar':
+            return self.pages.values()
         return list(self.pages.values())
+    
+    async def iter_pages(self, buffer_size: Optional[int] = None) -> AsyncIterator[PageInfo]:
+        """
+        Run the crawl, yielding each page as soon as it has been fetched.
+        
+        Combine with keep_pages=False so memory does not grow with the size
+        of the site. Workers wait while buffer_size pages (default: twice
+        the concurrency) are waiting to be consumed. Leaving the loop early
+        cancels the crawl.
+        
+        Usage:
+            async for page in crawler.iter_pages():
+                sink.write(page)
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or self.concurrency * 2)
+        self._page_queue = pages
+        crawl_task = asyncio.create_task(self.crawl())
+        try:
+            while True:
+                try:
+                    page = pages.get_nowait()
+                except asyncio.QueueEmpty:
+                    if crawl_task.done():
+                        break
+                    getter = asyncio.ensure_future(pages.get())
+                    await asyncio.wait({getter, crawl_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        continue
+                    page = getter.result()
+                yield page
+            # Re-raise anything that stopped the crawl
+            crawl_task.result()
+        finally:
+            crawl_task.cancel()
+            await asyncio.gather(crawl_task, return_exceptions=True)
+            self._page_queue = None
@@ -0,0 +1,468 @@
+"""
+Distributed crawling across worker processes.
+A coordinator partitions the URL space by hash across N AsyncCrawler
+workers, routes discovered links to their owners and merges the pages.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .crawler import AsyncCrawler, PageInfo, crawl_seeds
+from .frontier import FrontierQueue
+from .normalize import TRACKING_PARAMS, URLNormalizer
+
+logger = logging.getLogger(__name__)
+
+# Messages are (kind, payload) tuples:
+#   coordinator -> worker: ('urls', [(url, depth), ...]), ('stop', None)
+#   worker -> coordinator: ('pages', [PageInfo, ...]), ('links', [(url, depth), ...]),
+#                          ('idle', batches_received), ('done', stats), ('error', traceback)
+Message = Tuple[str, Any]
+
+
+def partition_key(url: str) -> str:
+    """URL as used for partitioning: lowercase scheme and host, no fragment."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ''))
+
+
+def url_partition(url: str, num_partitions: int) -> int:
+    """
+    Index of the worker that owns a URL.
+
+    Uses a stable hash (Python's hash() is salted per process), so every
+    process agrees on the owner.
+    """
+    digest = hashlib.blake2b(partition_key(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % num_partitions
+
+
+class Channel:
+    """Worker end of a transport."""
+
+    def send(self, message: Message) -> None:
+        """Send a message to the coordinator without blocking."""
+        raise NotImplementedError
+
+    async def recv(self) -> Message:
+        """Wait for the next message from the coordinator."""
+        raise NotImplementedError
+
+
+class Transport:
+    """
+    Message transport between the coordinator and its workers.
+
+    Messages from one worker, and from the coordinator to one worker, must
+    arrive in the order they were sent; termination detection relies on it.
+    A transport for other nodes implements the same four methods, starting
+    worker_main(worker_id, channel) on each node.
+    """
+
+    def start(self, num_workers: int, worker_main: Callable[[int, Channel], None]) -> None:
+        """Start num_workers workers, each running worker_main."""
+        raise NotImplementedError
+
+    def send(self, worker_id: int, message: Message) -> None:
+        """Send a message to a worker without blocking."""
+        raise NotImplementedError
+
+    async def recv(self, timeout: float) -> Optional[Tuple[int, Message]]:
+        """Wait for the next (worker_id, message), or None after timeout seconds."""
+        raise NotImplementedError
+
+    def alive(self) -> bool:
+        """Whether every worker is still running."""
+        return True
+
+    def close(self) -> None:
+        """Wait for the workers to exit and release resources."""
+
+
+class _QueueChannel(Channel):
+    """Channel over multiprocessing queues."""
+
+    def __init__(self, worker_id: int, inbox: multiprocessing.Queue, outbox: multiprocessing.Queue):
+        self.worker_id = worker_id
+        self._inbox = inbox
+        self._outbox = outbox
+
+    def send(self, message: Message) -> None:
+        self._outbox.put((self.worker_id, message))
+
+    async def recv(self) -> Message:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Short polls so a cancelled receive does not leave a thread blocked
+            try:
+                return await loop.run_in_executor(None, self._inbox.get, True, 0.5)
+            except queue.Empty:
+                continue
+
+
+def _run_worker(worker_main: Callable[[int, Channel], None], worker_id: int, channel: Channel) -> None:
+    """Process entry point; reports any crash to the coordinator."""
+    try:
+        worker_main(worker_id, channel)
+    except BaseException:
+        channel.send(('error', traceback.format_exc()))
+
+
+class MultiprocessingTransport(Transport):
+    """
+    Workers as local processes connected by multiprocessing queues.
+
+    The stand-in for a multi-node transport: each process plays one node.
+    """
+
+    def __init__(self, start_method: Optional[str] = None):
+        self._context = multiprocessing.get_context(start_method)
+        self._inbound: Optional[multiprocessing.Queue] = None
+        self._outbound: List[multiprocessing.Queue] = []
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self, num_workers: int, worker_main: Callable[[int, Channel], None]) -> None:
+        self._inbound = self._context.Queue()
+        for worker_id in range(num_workers):
+            inbox = self._context.Queue()
+            self._outbound.append(inbox)
+            process = self._context.Process(
+                target=_run_worker,
+                args=(worker_main, worker_id, _QueueChannel(worker_id, inbox, self._inbound)),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def send(self, worker_id: int, message: Message) -> None:
+        self._outbound[worker_id].put(message)
+
+    async def recv(self, timeout: float) -> Optional[Tuple[int, Message]]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self._inbound.get, True, timeout)
+        except queue.Empty:
+            return None
+
+    def alive(self) -> bool:
+        return all(process.is_alive() for process in self._processes)
+
+    def close(self) -> None:
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+
+
+class PartitionCrawler(AsyncCrawler):
+    """
+    AsyncCrawler for one partition of a distributed crawl.
+
+    Fetches only URLs it owns. Links owned by other workers go to the
+    coordinator, once each. The owner's discovered set is the single
+    place a URL is deduplicated, so dedup is global without shared state.
+    Pages are sent to the coordinator instead of being kept. When its
+    queue drains the worker reports idle and waits for more URLs.
+
+    The crawl's max_urls is shared out between the workers, so together
+    they fetch about max_urls pages rather than num_workers times as many.
+    Hash partitioning spreads pages evenly, so each share is normally used
+    up before the coordinator stops the crawl. A stop interrupts the worker
+    even while URLs are still queued.
+    """
+
+    # Seconds between flushes of buffered pages and links
+    FLUSH_INTERVAL = 0.05
+
+    def __init__(self, worker_id: int, num_workers: int, channel: Channel, base_url: str, **options):
+        options.update(keep_pages=False, checkpoint_path=None, resume=False)
+        super().__init__(base_url, **options)
+        self.worker_id = worker_id
+        self.num_workers = num_workers
+        self.channel = channel
+        self._out_pages: List[PageInfo] = []
+        self._out_links: List[Tuple[str, int]] = []
+        self._batches_received = 0
+        # Created in _wait_until_done, inside the crawl's event loop
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+        share, extra = divmod(self.max_urls, num_workers)
+        self.max_urls = share + (worker_id < extra)
+
+        # One worker reads the sitemaps; the URLs it finds are routed as usual
+        if worker_id != 0:
+            self.sitemap_seed = False
+
+        # Every worker fetches from the same hosts
+        self.rate_limiter.crawl_delay_scale = num_workers
+        if self.rate_limiter.max_rate:
+            self.rate_limiter.max_rate /= num_workers
+
+    def _initial_frontier(self) -> List[Tuple[str, int]]:
+        # Seeds arrive from the coordinator
+        return []
+
+    def _enqueue(self, link: str, depth: int) -> bool:
+        if url_partition(link, self.num_workers) == self.worker_id:
+            return super()._enqueue(link, depth)
+        # Forward each foreign link once; its owner does the real dedup
+        if link in self.discovered_urls:
+            self.stats['duplicates_dropped'] += 1
+        else:
+            self.discovered_urls.add(link)
+            self._out_links.append((link, depth))
+        return False
+
+    async def _store_page(self, page: PageInfo) -> None:
+        self.page_count += 1
+        self._out_pages.append(page)
+
+    def _flush(self) -> None:
+        if self._out_pages:
+            self.channel.send(('pages', self._out_pages))
+            self._out_pages = []
+        if self._out_links:
+            self.channel.send(('links', self._out_links))
+            self._out_links = []
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            self._flush()
+
+    async def _receive_loop(self, queue: FrontierQueue) -> None:
+        while True:
+            kind, payload = await self.channel.recv()
+            if kind == 'stop':
+                self._stopped.set()
+            elif kind == 'urls':
+                self._batches_received += 1
+                for url, depth in payload:
+                    if url in self.discovered_urls:
+                        self.stats['duplicates_dropped'] += 1
+                        queue.frontier.add_inlink(url)
+                    elif not self._is_trap(url, depth):
+                        self.discovered_urls.add(url)
+                        queue.put_nowait((url, depth))
+                        self.stats['urls_enqueued'] += 1
+            self._wakeup.set()
+            if self._stopped.is_set():
+                return
+
+    async def _unless_stopped(self, awaitable) -> bool:
+        """Await awaitable unless a stop arrives first; return whether it finished."""
+        task = asyncio.ensure_future(awaitable)
+        stop = asyncio.ensure_future(self._stopped.wait())
+        try:
+            done, _ = await asyncio.wait({task, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            task.cancel()
+            stop.cancel()
+        return task in done
+
+    async def _wait_until_done(self, queue: FrontierQueue) -> None:
+        # Returning cancels the crawl's workers and discards the URLs still
+        # queued, so a stop takes effect without draining the partition
+        self._wakeup = asyncio.Event()
+        self._stopped = asyncio.Event()
+        receiver = asyncio.create_task(self._receive_loop(queue))
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            while True:
+                self._wakeup.clear()
+                if not await self._unless_stopped(queue.join()):
+                    return
+                if queue.unfinished:
+                    # URLs arrived while join() was waking up
+                    continue
+                # Pages and links go out before the idle report, so once the
+                # coordinator sees it nothing from this worker is in flight
+                self._flush()
+                self.channel.send(('idle', self._batches_received))
+                if not await self._unless_stopped(self._wakeup.wait()):
+                    return
+        finally:
+            flusher.cancel()
+            receiver.cancel()
+            self._flush()
+
+    def serve(self) -> None:
+        """Run the partition until the coordinator stops it, then report stats."""
+        asyncio.run(self.crawl())
+        self.channel.send(('done', dict(self.stats)))
+
+
+def _partition_worker(
+    base_url: str,
+    options: Dict[str, Any],
+    num_workers: int,
+    worker_id: int,
+    channel: Channel
+) -> None:
+    """Worker entry point (module level so it can be pickled)."""
+    PartitionCrawler(worker_id, num_workers, channel, base_url, **options).serve()
+
+
+class CrawlCoordinator:
+    """
+    Crawls one site with several AsyncCrawler worker processes.
+
+    Each URL is owned by the worker url_partition() assigns it to. Links
+    found by one worker are routed here and forwarded to their owner in
+    batches. The crawl ends when every worker has reported idle after
+    receiving every batch sent to it, so no URL is queued or in flight.
+
+    Usage:
+        coordinator = CrawlCoordinator(base_url, num_workers=4, max_depth=5)
+        pages = coordinator.run()
+        SitemapExporter(pages, base_url).export_xml('sitemap.xml')
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        num_workers: Optional[int] = None,
+        transport: Optional[Transport] = None,
+        **crawler_options
+    ):
+        """
+        Args:
+            base_url: Site to crawl
+            num_workers: Worker processes (defaults to the CPU count)
+            transport: How workers are started and reached (defaults to
+                local multiprocessing)
+            **crawler_options: AsyncCrawler options for every worker
+                (checkpointing is not supported)
+        """
+        # Partitioned the way the workers will spell it, or its owner would
+        # fetch it once under each spelling
+        normalizer = None
+        if crawler_options.get('normalize_urls', True):
+            normalizer = URLNormalizer(
+                strip_params=crawler_options.get('strip_params', TRACKING_PARAMS),
+                sort_query=crawler_options.get('sort_query', True),
+                trailing_slash=crawler_options.get('trailing_slash', 'keep')
+            )
+            base_url = normalizer.normalize(base_url)
+        self.base_url = base_url
+        self.seed_urls = crawl_seeds(base_url, crawler_options.get('allowed_hosts'), normalizer)
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.transport = transport or MultiprocessingTransport()
+        self.crawler_options = crawler_options
+        self.max_urls = crawler_options.get('max_urls', 50000)
+        self.pages: List[PageInfo] = []
+        self.stats: Dict[str, Any] = {}
+        self.url_callback: Optional[Callable[[PageInfo], None]] = None
+
+    async def crawl(self) -> List[PageInfo]:
+        """Run the distributed crawl and return the merged pages."""
+        start_time = time.time()
+        num_workers = self.num_workers
+        self.transport.start(
+            num_workers,
+            _WorkerMain(self.base_url, self.crawler_options, num_workers)
+        )
+
+        sent = [0] * num_workers
+        acked = [0] * num_workers
+        idle = [False] * num_workers
+
+        def route(links: List[Tuple[str, int]]) -> None:
+            batches = defaultdict(list)
+            for link in links:
+                batches[url_partition(link[0], num_workers)].append(link)
+            for worker_id, batch in batches.items():
+                self.transport.send(worker_id, ('urls', batch))
+                sent[worker_id] += 1
+                idle[worker_id] = False
+
+        try:
+            route([(url, 0) for url in self.seed_urls])
+            while not all(idle) and len(self.pages) < self.max_urls:
+                received = await self.transport.recv(timeout=1.0)
+                if received is None:
+                    if not self.transport.alive():
+                        raise RuntimeError("A crawl worker exited unexpectedly")
+                    continue
+                worker_id, (kind, payload) = received
+                if kind == 'pages':
+                    self.pages.extend(payload)
+                    if self.url_callback:
+                        for page in payload:
+                            self.url_callback(page)
+                elif kind == 'links':
+                    route(payload)
+                elif kind == 'idle':
+                    acked[worker_id] = payload
+                    idle[worker_id] = payload == sent[worker_id]
+                elif kind == 'error':
+                    raise RuntimeError(f"Crawl worker {worker_id} failed:\n{payload}")
+            await self._shutdown()
+        except BaseException:
+            for worker_id in range(num_workers):
+                self.transport.send(worker_id, ('stop', None))
+            raise
+        finally:
+            self.transport.close()
+
+        # Each worker stops at its share of the budget, but requests already
+        # in flight there may still overshoot it slightly
+        del self.pages[self.max_urls:]
+        self.stats['start_time'] = start_time
+        self.stats['end_time'] = time.time()
+        self.stats['workers'] = num_workers
+        logger.info(
+            f"Distributed crawl completed: {len(self.pages)} URLs with {num_workers} workers "
+            f"in {self.stats['end_time'] - start_time:.1f}s"
+        )
+        return self.pages
+
+    async def _shutdown(self) -> None:
+        """Stop every worker and merge their final stats."""
+        for worker_id in range(self.num_workers):
+            self.transport.send(worker_id, ('stop', None))
+
+        remaining = self.num_workers
+        while remaining:
+            received = await self.transport.recv(timeout=10.0)
+            if received is None:
+                logger.warning(f"{remaining} crawl workers did not report back")
+                return
+            worker_id, (kind, payload) = received
+            if kind == 'pages':
+                # Fetched after the budget was reached; kept like any overshoot
+                self.pages.extend(payload)
+            elif kind == 'done':
+                remaining -= 1
+                for key, value in payload.items():
+                    if isinstance(value, (int, float)) and key not in ('start_time', 'end_time'):
+                        self.stats[key] = self.stats.get(key, 0) + value
+            elif kind == 'error':
+                raise RuntimeError(f"Crawl worker {worker_id} failed:\n{payload}")
+
+    def run(self) -> List[PageInfo]:
+        """Blocking wrapper around crawl()."""
+        return asyncio.run(self.crawl())
+
+
+class _WorkerMain:
+    """Picklable worker_main bound to the crawl settings."""
+
+    def __init__(self, base_url: str, options: Dict[str, Any], num_workers: int):
+        self.base_url = base_url
+        self.options = options
+        self.num_workers = num_workers
+
+    def __call__(self, worker_id: int, channel: Channel) -> None:
+        _partition_worker(self.base_url, self.options, self.num_workers, worker_id, channel)
@@ -4,14 +4,499 @@ SOTA 2026 Edition - Fully sitemaps.org compliant.
 """
 
 import gzip
+import heapq
+import io
+import itertools
 import os
+import pickle
+import shutil
+import tempfile
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import List
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from urllib.parse import urlparse
 
 from .crawler import PageInfo
+from .pagestore import PageSequence
+
+NS_SITEMAP = "http://www.sitemaps.org/schemas/sitemap/0.9"
+NS_IMAGE = "http://www.google.com/schemas/sitemap-image/1.1"
+
+# Google limit on images per URL
+MAX_IMAGES_PER_URL = 1000
+
+
+def _escape_xml(text: str) -> str:
+    """Escape XML special characters."""
+    return (text
+            .replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+            .replace("'", "&apos;"))
+
+
+def _dom_text(text: str) -> str:
+    """Escape a raw text value as the former DOM serializer did (quotes, not apostrophes)."""
+    return (text
+            .replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace('"', "&quot;")
+            .replace(">", "&gt;"))
+
+
+def _xml_text(text: str) -> str:
+    """
+    Serialize a page value exactly as the former DOM-based exporter did.
+    
+    Page values were escaped with _escape_xml before being assigned to
+    the element, and escaped again by the serializer.
+    """
+    return _dom_text(_escape_xml(text))
+
+
+_URLSET_CLOSE = '\n</urlset>'
+
+
+def _utf8_len(text: str) -> int:
+    """Length of text in UTF-8 bytes."""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def render_url(page: PageInfo, include_images: bool = False) -> str:
+    """Render the <url> entry for a page, including its leading newline."""
+    parts = [f"\n  <url>\n    <loc>{_xml_text(page.url)}</loc>"]
+    
+    # Optional: lastmod
+    if page.lastmod:
+        parts.append(f"\n    <lastmod>{_xml_text(page.lastmod)}</lastmod>")
+    
+    # Optional: changefreq and priority
+    parts.append(f"\n    <changefreq>{_xml_text(page.changefreq)}</changefreq>")
+    parts.append(f"\n    <priority>{page.priority:.1f}</priority>")
+    
+    # Image entries
+    if include_images and page.images:
+        for img_url in page.images[:MAX_IMAGES_PER_URL]:
+            parts.append(
+                f"\n    <ns0:image>\n      <ns0:loc>{_xml_text(img_url)}</ns0:loc>"
+                f"\n    </ns0:image>"
+            )
+    
+    parts.append("\n  </url>")
+    return ''.join(parts)
+
+
+class SitemapWriter:
+    """
+    Incremental <urlset> writer.
+    
+    Streams one <url> entry at a time to an open text file handle, so
+    memory use does not grow with the number of URLs. Output is byte for
+    byte what the DOM-based exporter produced.
+    """
+    
+    def __init__(
+        self,
+        fileobj: TextIO,
+        include_images: bool = False,
+        has_images: Optional[bool] = None
+    ):
+        """
+        Args:
+            fileobj: Text file handle to write to
+            include_images: Include image sitemap entries
+            has_images: Whether any page carries images; decides whether the
+                image namespace is also declared under its generated ns0
+                prefix. Defaults to include_images.
+        """
+        self.fileobj = fileobj
+        self.include_images = include_images
+        self.has_images = include_images if has_images is None else has_images
+        self.url_count = 0
+        self.bytes_written = 0
+        self._closed = False
+        
+        attrs = ''
+        if include_images and self.has_images:
+            attrs += f' xmlns:ns0="{NS_IMAGE}"'
+        attrs += f' xmlns="{NS_SITEMAP}"'
+        if include_images:
+            attrs += f' xmlns:image="{NS_IMAGE}"'
+        
+        # The root tag is left open until we know whether it is empty
+        self._write(f'<?xml version="1.0" ?>\n<urlset{attrs}')
+    
+    def render(self, page: PageInfo) -> str:
+        """Render the <url> entry for a page, including its leading newline."""
+        return render_url(page, self.include_images)
+    
+    def write(self, page: PageInfo) -> None:
+        """Write a single <url> entry."""
+        self.write_rendered(self.render(page))
+    
+    def write_rendered(self, entry: str, size: Optional[int] = None) -> None:
+        """Write an entry produced by render(); size is its UTF-8 length if known."""
+        if self.url_count == 0:
+            self._write('>')
+        self.fileobj.write(entry)
+        self.bytes_written += _utf8_len(entry) if size is None else size
+        self.url_count += 1
+    
+    def size_with(self, size: int) -> int:
+        """Final file size in bytes if an entry of the given size were added."""
+        opening = 1 if self.url_count == 0 else 0
+        return self.bytes_written + opening + size + len(_URLSET_CLOSE)
+    
+    def close(self) -> None:
+        """Close the root element. Does not close the file handle."""
+        if self._closed:
+            return
+        self._write(_URLSET_CLOSE if self.url_count else '/>')
+        self._closed = True
+    
+    def _write(self, text: str) -> None:
+        self.fileobj.write(text)
+        self.bytes_written += _utf8_len(text)
+
+
+class ShardedSitemapWriter:
+    """
+    Streams pages across numbered sitemap files.
+    
+    Rolls over to a new file before either the URL limit or the
+    uncompressed byte limit would be exceeded. Sizes come from the
+    rendered entries themselves, so nothing is serialized twice.
+    """
+    
+    def __init__(
+        self,
+        path_for: Callable[[int], str],
+        gzip_compress: bool = False,
+        include_images: bool = False,
+        max_urls: int = 50000,
+        max_bytes: int = 50 * 1024 * 1024
+    ):
+        """
+        Args:
+            path_for: Returns the output path for the 1-based shard number
+            gzip_compress: Compress each shard with gzip
+            include_images: Include image sitemap entries
+            max_urls: Maximum URLs per shard
+            max_bytes: Maximum uncompressed bytes per shard
+        """
+        self.path_for = path_for
+        self.gzip_compress = gzip_compress
+        self.include_images = include_images
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.paths: List[str] = []
+        self._file: Optional[TextIO] = None
+        self._writer: Optional[SitemapWriter] = None
+    
+    def write(self, page: PageInfo) -> None:
+        """Write a page to the current shard, rolling over when it is full."""
+        entry = render_url(page, self.include_images)
+        size = _utf8_len(entry)
+        
+        writer = self._writer
+        if writer is not None and (
+            writer.url_count >= self.max_urls
+            or writer.size_with(size) > self.max_bytes
+        ):
+            # An oversized entry still goes into an empty shard on its own
+            if writer.url_count:
+                self._close_shard()
+        
+        if self._writer is None:
+            self._open_shard()
+        self._writer.write_rendered(entry, size)
+    
+    def close(self) -> List[str]:
+        """Finish the last shard and return every path written."""
+        self._close_shard()
+        return self.paths
+    
+    def _open_shard(self) -> None:
+        path = self.path_for(len(self.paths) + 1)
+        self._file = _open_output(path, self.gzip_compress)
+        self._writer = SitemapWriter(self._file, include_images=self.include_images)
+        self.paths.append(path)
+    
+    def _close_shard(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._file.close()
+        self._writer = None
+        self._file = None
+    
+    def __enter__(self) -> 'ShardedSitemapWriter':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _open_output(output_path: str, gzip_compress: bool) -> TextIO:
+    """Open an output file for text writing, optionally gzip compressed."""
+    if gzip_compress:
+        return gzip.open(output_path, 'wt', encoding='utf-8')
+    return open(output_path, 'w', encoding='utf-8')
+
+
+def write_sitemap(
+    pages: Iterable[PageInfo],
+    output_path: str,
+    include_images: bool = False,
+    gzip_compress: bool = False,
+    has_images: Optional[bool] = None
+) -> str:
+    """
+    Stream pages into an XML sitemap file.
+    
+    Pages are written in iteration order and never held in memory, so
+    any iterator (e.g. a generator over a database cursor) can be used.
+    
+    Args:
+        pages: Pages to write
+        output_path: Path to save the sitemap
+        include_images: Include image sitemap entries
+        gzip_compress: Compress with gzip
+        has_images: See SitemapWriter
+        
+    Returns:
+        Path to the saved file
+    """
+    if gzip_compress and not output_path.endswith('.gz'):
+        output_path = output_path + '.gz'
+    
+    with _open_output(output_path, gzip_compress) as f:
+        writer = SitemapWriter(f, include_images=include_images, has_images=has_images)
+        for page in pages:
+            writer.write(page)
+        writer.close()
+    
+    return output_path
+
+
+def write_sitemap_index(sitemaps: List[tuple], output_path: str, base_url: str) -> None:
+    """
+    Write a sitemap index file.
+    
+    Args:
+        sitemaps: (filename, lastmod) pairs; filenames are relative to base_url
+        output_path: Path to save the index
+        base_url: URL the sitemap files are served under
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f'<?xml version="1.0" ?>\n<sitemapindex xmlns="{NS_SITEMAP}"')
+        if not sitemaps:
+            f.write('/>')
+            return
+        f.write('>')
+        
+        for filename, lastmod in sitemaps:
+            # Index values were never pre-escaped, so only the serializer's escaping applies
+            f.write(f"\n  <sitemap>\n    <loc>{_dom_text(f'{base_url}/{filename}')}</loc>")
+            if lastmod:
+                f.write(f"\n    <lastmod>{_dom_text(lastmod)}</lastmod>")
+            f.write("\n  </sitemap>")
+        
+        f.write("\n</sitemapindex>")
+
+
+# Pages per pickled batch in a sorted run file
+_RUN_BATCH = 1000
+
+
+def _page_row(page: PageInfo) -> tuple:
+    """PageInfo fields as a plain tuple, URL first; cheaper to pickle and merge."""
+    return (page.url, page.depth, page.lastmod, page.priority,
+            page.changefreq, page.title, page.images)
+
+
+def _spool_run(rows: List[tuple], directory: str) -> str:
+    """Sort page rows by URL and pickle them in batches to a temporary run file."""
+    rows.sort(key=itemgetter(0))
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        for i in range(0, len(rows), _RUN_BATCH):
+            pickle.dump(rows[i:i + _RUN_BATCH], f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: str) -> Iterator[tuple]:
+    """Read back the page rows of a run file in order."""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+class SitemapSink:
+    """
+    Writes a sitemap set from a stream of pages, e.g. AsyncCrawler.iter_pages().
+    
+    Unsorted, pages go straight into the current shard, which is written
+    out as soon as it is full. Sorted, pages are collected into runs of
+    run_size, each sorted and spooled to a temporary file, and the runs
+    are merged into shards on close. Either way memory is bounded by the
+    shard or run size, not by the number of pages.
+    """
+    
+    def __init__(
+        self,
+        output_dir: str,
+        base_url: str,
+        base_filename: str = "sitemap",
+        urls_per_file: int = 50000,
+        bytes_per_file: Optional[int] = None,
+        gzip_compress: bool = True,
+        include_images: bool = False,
+        sort: bool = False,
+        run_size: int = 100000,
+        temp_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            output_dir: Directory to save sitemaps
+            base_url: URL the sitemap files are served under (for the index)
+            base_filename: Base name for sitemap files
+            urls_per_file: Maximum URLs per sitemap file
+            bytes_per_file: Maximum uncompressed bytes per sitemap file
+            gzip_compress: Compress individual sitemaps
+            include_images: Include image sitemap entries
+            sort: Write URLs in sorted order using an external merge sort
+            run_size: Pages held in memory per sorted run
+            temp_dir: Directory for sorted runs (defaults to the system one)
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip('/')
+        self.base_filename = base_filename
+        self.sort = sort
+        self.run_size = run_size
+        self.url_count = 0
+        
+        suffix = '.xml.gz' if gzip_compress else '.xml'
+        self._writer = ShardedSitemapWriter(
+            lambda shard_num: str(self.output_dir / f"{base_filename}_{shard_num}{suffix}"),
+            gzip_compress=gzip_compress,
+            include_images=include_images,
+            max_urls=urls_per_file,
+            max_bytes=bytes_per_file or SitemapExporter.MAX_FILE_SIZE
+        )
+        self._run: List[tuple] = []
+        self._run_paths: List[str] = []
+        self._run_dir = tempfile.mkdtemp(prefix='sitemap-runs-', dir=temp_dir) if sort else None
+    
+    def write(self, page: PageInfo) -> None:
+        """Add a page to the sitemap set."""
+        self.url_count += 1
+        if not self.sort:
+            self._writer.write(page)
+            return
+        self._run.append(_page_row(page))
+        if len(self._run) >= self.run_size:
+            self._run_paths.append(_spool_run(self._run, self._run_dir))
+            self._run = []
+    
+    def close(self) -> List[str]:
+        """
+        Finish the last shard and write the sitemap index.
+        
+        Returns:
+            List of generated file paths, index first
+        """
+        if self.sort:
+            try:
+                # The last run is merged straight from memory
+                self._run.sort(key=itemgetter(0))
+                runs = [_read_run(path) for path in self._run_paths] + [self._run]
+                for row in heapq.merge(*runs, key=itemgetter(0)):
+                    self._writer.write(PageInfo(*row))
+            finally:
+                self._run = []
+                shutil.rmtree(self._run_dir, ignore_errors=True)
+        generated_files = self._writer.close()
+        
+        lastmod = datetime.now().isoformat()
+        index_path = str(self.output_dir / f"{self.base_filename}_index.xml")
+        write_sitemap_index(
+            [(Path(path).name, lastmod) for path in generated_files],
+            index_path,
+            self.base_url
+        )
+        return [index_path] + generated_files
+    
+    def __enter__(self) -> 'SitemapSink':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _entry_sizes(pages: List[PageInfo]) -> array:
+    """
+    UTF-8 sizes of the rendered <url> entries of a chunk, for planning
+    shard boundaries. Module-level so process pools can pickle it.
+    """
+    return array('Q', (_utf8_len(render_url(page)) for page in pages))
+
+
+def _plan_shards(sizes: Iterable[int], max_urls: int, max_bytes: int) -> List[int]:
+    """
+    Number of pages in each shard, rolling over exactly where
+    ShardedSitemapWriter would for entries of the given sizes.
+    """
+    header = SitemapWriter(io.StringIO()).bytes_written
+    counts = []
+    count = total = 0
+    for size in sizes:
+        if count and (count >= max_urls or total + size + len(_URLSET_CLOSE) > max_bytes):
+            counts.append(count)
+            count = 0
+        if count == 0:
+            # Header plus the '>' that opens a non-empty <urlset>
+            total = header + 1
+        total += size
+        count += 1
+    if count:
+        counts.append(count)
+    return counts
+
+
+def _write_shard(job: Tuple[List[PageInfo], str, bool]) -> str:
+    """Write one planned shard. Module-level so process pools can pickle it."""
+    pages, path, gzip_compress = job
+    return write_sitemap(pages, path, gzip_compress=gzip_compress)
+
+
+def _run_parallel(func: Callable, jobs: Iterable, workers: int) -> List:
+    """
+    Run func over jobs in a process pool and return results in job order.
+    
+    At most two jobs per worker are in flight, so shards are pickled as
+    workers become free rather than all up front.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        for index, job in enumerate(jobs):
+            pending[executor.submit(func, job)] = index
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        for future in pending:
+            results[pending[future]] = future.result()
+    return [results[i] for i in range(len(results))]
 
 
 class SitemapExporter:
@@ -22,24 +507,19 @@ class SitemapExporter:
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB uncompressed
     
     # XML Namespaces
-    NS_SITEMAP = "http://www.sitemaps.org/schemas/sitemap/0.9"
-    NS_IMAGE = "http://www.google.com/schemas/sitemap-image/1.1"
+    NS_SITEMAP = NS_SITEMAP
+    NS_IMAGE = NS_IMAGE
     NS_VIDEO = "http://www.google.com/schemas/sitemap-video/1.1"
     NS_NEWS = "http://www.google.com/schemas/sitemap-news/0.9"
     
-    def __init__(self, pages: List[PageInfo], base_url: str):
-        self.pages = sorted(pages, key=lambda p: p.url)
+    def __init__(self, pages: Sequence[PageInfo], base_url: str):
+        # Columnar pages are sorted by row number and built lazily on access
+        if isinstance(pages, PageSequence):
+            self.pages = pages.sorted_by_url()
+        else:
+            self.pages = sorted(pages, key=lambda p: p.url)
         self.base_url = base_url.rstrip('/')
     
-    def _prettify_xml(self, elem: Element) -> str:
-        """Return pretty-printed XML string."""
-        rough_string = tostring(elem, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        pretty = reparsed.toprettyxml(indent="  ")
-        # Remove empty lines
-        lines = [line for line in pretty.split('\n') if line.strip()]
-        return '\n'.join(lines)
-    
     def export_xml(
         self,
         output_path: str,
@@ -57,58 +537,23 @@ class SitemapExporter:
         Returns:
             Path to the saved file
         """
-        urlset = Element('urlset')
-        urlset.set('xmlns', self.NS_SITEMAP)
-        
-        if include_images:
-            urlset.set('xmlns:image', self.NS_IMAGE)
-        
-        for page in self.pages:
-            url_elem = SubElement(urlset, 'url')
-            
-            # Required: loc
-            loc = SubElement(url_elem, 'loc')
-            loc.text = self._escape_xml(page.url)
-            
-            # Optional: lastmod
-            if page.lastmod:
-                lastmod = SubElement(url_elem, 'lastmod')
-                lastmod.text = page.lastmod
-            
-            # Optional: changefreq
-            changefreq = SubElement(url_elem, 'changefreq')
-            changefreq.text = page.changefreq
-            
-            # Optional: priority
-            priority = SubElement(url_elem, 'priority')
-            priority.text = f"{page.priority:.1f}"
-            
-            # Image entries
-            if include_images and page.images:
-                for img_url in page.images[:1000]:  # Google limit
-                    image_elem = SubElement(url_elem, '{%s}image' % self.NS_IMAGE)
-                    image_loc = SubElement(image_elem, '{%s}loc' % self.NS_IMAGE)
-                    image_loc.text = self._escape_xml(img_url)
-        
-        xml_content = self._prettify_xml(urlset)
-        
-        # Write file
-        if gzip_compress:
-            output_path = output_path + '.gz' if not output_path.endswith('.gz') else output_path
-            with gzip.open(output_path, 'wt', encoding='utf-8') as f:
-                f.write(xml_content)
-        else:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
-        
-        return output_path
+        has_images = include_images and any(page.images for page in self.pages)
+        return write_sitemap(
+            self.pages,
+            output_path,
+            include_images=include_images,
+            gzip_compress=gzip_compress,
+            has_images=has_images
+        )
     
     def export_sitemap_index(
         self,
         output_dir: str,
         base_filename: str = "sitemap",
         urls_per_file: int = 50000,
-        gzip_compress: bool = True
+        gzip_compress: bool = True,
+        workers: int = 1,
+        bytes_per_file: Optional[int] = None
     ) -> List[str]:
         """
         Export sitemap index with multiple sitemap files.
@@ -119,6 +564,10 @@ class SitemapExporter:
             base_filename: Base name for sitemap files
             urls_per_file: Maximum URLs per sitemap file
             gzip_compress: Compress individual sitemaps
+            workers: Number of processes serializing and compressing
+                shards in parallel (1 = sequential)
+            bytes_per_file: Maximum uncompressed bytes per sitemap file
+                (defaults to MAX_FILE_SIZE)
             
         Returns:
             List of generated file paths
@@ -126,58 +575,103 @@ class SitemapExporter:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        generated_files = []
-        sitemap_files = []
+        max_bytes = bytes_per_file or self.MAX_FILE_SIZE
+        suffix = '.xml.gz' if gzip_compress else '.xml'
         
-        # Split pages into chunks
-        for i in range(0, len(self.pages), urls_per_file):
-            chunk = self.pages[i:i + urls_per_file]
-            chunk_num = (i // urls_per_file) + 1
-            
-            # Create sitemap for this chunk
-            sitemap_filename = f"{base_filename}_{chunk_num}.xml"
-            if gzip_compress:
-                sitemap_filename += '.gz'
-            
-            sitemap_path = output_dir / sitemap_filename
-            
-            # Create temporary exporter for chunk
-            chunk_exporter = SitemapExporter(chunk, self.base_url)
-            chunk_exporter.export_xml(
-                str(sitemap_path),
-                include_images=False,
-                gzip_compress=gzip_compress
+        def final_path(shard_num: int) -> str:
+            return str(output_dir / f"{base_filename}_{shard_num}{suffix}")
+        
+        if workers > 1 and len(self.pages) > urls_per_file:
+            # Byte limits make shard boundaries depend on every entry before
+            # them, so they are planned from the entry sizes (measured in the
+            # pool) before any shard is written. The files are then the same
+            # as the sequential path writes, whatever the worker count.
+            chunks = (
+                self.pages[i:i + urls_per_file]
+                for i in range(0, len(self.pages), urls_per_file)
             )
+            sizes = _run_parallel(_entry_sizes, chunks, workers)
+            counts = _plan_shards(itertools.chain.from_iterable(sizes), urls_per_file, max_bytes)
             
-            generated_files.append(str(sitemap_path))
-            sitemap_files.append((sitemap_filename, datetime.now().isoformat()))
+            def jobs():
+                start = 0
+                for shard_num, count in enumerate(counts, 1):
+                    yield self.pages[start:start + count], final_path(shard_num), gzip_compress
+                    start += count
+            
+            generated_files = _run_parallel(_write_shard, jobs(), workers)
+        else:
+            # Pages are already sorted, so they are streamed as-is
+            with ShardedSitemapWriter(
+                final_path,
+                gzip_compress=gzip_compress,
+                max_urls=urls_per_file,
+                max_bytes=max_bytes
+            ) as writer:
+                for page in self.pages:
+                    writer.write(page)
+            generated_files = writer.paths
+        
+        # Create sitemap index once every shard is on disk
+        lastmod = datetime.now().isoformat()
+        sitemap_files = [(Path(path).name, lastmod) for path in generated_files]
         
-        # Create sitemap index
         index_path = output_dir / f"{base_filename}_index.xml"
         self._create_sitemap_index(sitemap_files, str(index_path))
         generated_files.insert(0, str(index_path))
         
         return generated_files
     
-    def _create_sitemap_index(self, sitemaps: List[tuple], output_path: str) -> None:
-        """Create sitemap index file."""
-        sitemapindex = Element('sitemapindex')
-        sitemapindex.set('xmlns', self.NS_SITEMAP)
+    def export_per_host(
+        self,
+        output_dir: str,
+        base_filename: str = "sitemap",
+        urls_per_file: int = 50000,
+        gzip_compress: bool = True,
+        workers: int = 1,
+        bytes_per_file: Optional[int] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Export a separate sitemap index set for every host in a multi-host crawl.
         
-        for filename, lastmod in sitemaps:
-            sitemap_elem = SubElement(sitemapindex, 'sitemap')
-            
-            loc = SubElement(sitemap_elem, 'loc')
-            loc.text = f"{self.base_url}/{filename}"
-            
-            if lastmod:
-                lastmod_elem = SubElement(sitemap_elem, 'lastmod')
-                lastmod_elem.text = lastmod
+        Each host's files go to a subdirectory named after the host, and its
+        index references them under that host's own root URL.
         
-        xml_content = self._prettify_xml(sitemapindex)
+        Args:
+            output_dir: Directory to create the per-host directories in
+            base_filename: Base name for sitemap files
+            urls_per_file: Maximum URLs per sitemap file
+            gzip_compress: Compress individual sitemaps
+            workers: See export_sitemap_index
+            bytes_per_file: See export_sitemap_index
+            
+        Returns:
+            Generated file paths by host
+        """
+        by_host: Dict[str, List[PageInfo]] = {}
+        roots: Dict[str, str] = {}
+        for page in self.pages:
+            parts = urlparse(page.url)
+            by_host.setdefault(parts.netloc, []).append(page)
+            roots.setdefault(parts.netloc, f"{parts.scheme}://{parts.netloc}")
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
+        generated = {}
+        for host, pages in by_host.items():
+            # Ports are not allowed in Windows directory names
+            host_dir = Path(output_dir) / host.replace(':', '_')
+            generated[host] = SitemapExporter(pages, roots[host]).export_sitemap_index(
+                str(host_dir),
+                base_filename=base_filename,
+                urls_per_file=urls_per_file,
+                gzip_compress=gzip_compress,
+                workers=workers,
+                bytes_per_file=bytes_per_file
+            )
+        return generated
+    
+    def _create_sitemap_index(self, sitemaps: List[tuple], output_path: str) -> None:
+        """Create sitemap index file."""
+        write_sitemap_index(sitemaps, output_path, self.base_url)
     
     def export_txt(self, output_path: str) -> str:
         """Export simple text file with one URL per line."""
@@ -248,12 +742,4 @@ class SitemapExporter:
             }
         }
     
-    @staticmethod
-    def _escape_xml(text: str) -> str:
-        """Escape XML special characters."""
-        return (text
-                .replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace('"', "&quot;")
-                .replace("'", "&apos;"))
+    _escape_xml = staticmethod(_escape_xml)
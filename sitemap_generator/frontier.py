@@ -0,0 +1,715 @@
+"""
+Crawl frontier and seen-URL stores.
+In-memory defaults plus SQLite-backed variants with bounded RAM for
+crawls too large to hold in memory.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import math
+import sqlite3
+from array import array
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+# (url, depth)
+FrontierItem = Tuple[str, int]
+
+# Seen-store dedup modes: full URL strings, 64-bit fingerprints, Bloom filter
+DEDUP_MODES = ('exact', 'fingerprint', 'bloom')
+
+# Frontier orders: first in first out, or best score first
+FRONTIER_ORDERS = ('fifo', 'priority')
+
+# Scores a frontier item from its URL, depth and number of inlinks seen
+FrontierScore = Callable[[str, int, int], float]
+
+
+def _open_scratch_db(path: str, table: str) -> sqlite3.Connection:
+    """
+    Open an SQLite database tuned for scratch data that need not survive a
+    crash. The table is dropped first: rows left by an earlier crawl in
+    the same directory must not be taken as this crawl's state.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    # Negative cache_size is in KiB; keeps the page cache at ~16 MB
+    conn.execute("PRAGMA cache_size = -16000")
+    return conn
+
+
+class SeenStore:
+    """Set of URLs already seen by the crawler."""
+
+    def add(self, url: str) -> None:
+        raise NotImplementedError
+
+    def __contains__(self, url: object) -> bool:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class MemorySeenStore(SeenStore):
+    """Seen store backed by a Python set."""
+
+    def __init__(self):
+        self._urls = set()
+
+    def add(self, url: str) -> None:
+        self._urls.add(url)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self):
+        return iter(self._urls)
+
+
+class SQLiteSeenStore(SeenStore):
+    """Seen store kept in an SQLite table; RAM is bounded by the page cache."""
+
+    def __init__(self, path: str):
+        self._conn = _open_scratch_db(path, 'seen')
+        self._conn.execute("CREATE TABLE seen (url TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._count = 0
+
+    def add(self, url: str) -> None:
+        cursor = self._conn.execute("INSERT OR IGNORE INTO seen (url) VALUES (?)", (url,))
+        self._count += cursor.rowcount
+
+    def __contains__(self, url: object) -> bool:
+        row = self._conn.execute("SELECT 1 FROM seen WHERE url = ?", (url,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+def url_fingerprint(url: str) -> int:
+    """64-bit fingerprint of a URL; never 0, which marks empty slots."""
+    digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class FingerprintSeenStore(SeenStore):
+    """
+    Seen store of 64-bit URL fingerprints in an open-addressing hash table.
+
+    Each URL costs 8 bytes at full load (16 on average) instead of a full
+    string in a set. Two distinct URLs collide with probability ~n/2**64.
+    """
+
+    def __init__(self, initial_capacity: int = 1 << 16):
+        capacity = 1 << max(4, (initial_capacity - 1).bit_length())
+        self._slots = array('Q', bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._count = 0
+
+    def _find(self, fingerprint: int) -> int:
+        """Index of the fingerprint's slot, or of the empty slot ending its probe."""
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            value = slots[index]
+            if value == 0 or value == fingerprint:
+                return index
+            index = (index + 1) & mask
+
+    def add(self, url: str) -> None:
+        fingerprint = url_fingerprint(url)
+        index = self._find(fingerprint)
+        if self._slots[index] == 0:
+            self._slots[index] = fingerprint
+            self._count += 1
+            # Keep the load factor at or below 1/2
+            if self._count * 2 > len(self._slots):
+                self._grow()
+
+    def __contains__(self, url: object) -> bool:
+        fingerprint = url_fingerprint(url)
+        return self._slots[self._find(fingerprint)] == fingerprint
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self) -> None:
+        old = self._slots
+        self._slots = array('Q', bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        for fingerprint in old:
+            if fingerprint:
+                self._slots[self._find(fingerprint)] = fingerprint
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter sized for capacity items at error_rate."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    # Bit positions use Kirsch-Mitzenmacher double hashing: h1 + i * h2
+
+    def add(self, h1: int, h2: int) -> None:
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, hashes: Tuple[int, int]) -> bool:
+        h1, h2 = hashes
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class BloomSeenStore(SeenStore):
+    """
+    Scalable Bloom filter seen store.
+
+    A new, larger filter with a tighter error rate is added whenever the
+    current one fills, so the overall false-positive rate stays below
+    error_rate however many URLs are added. A false positive means a URL
+    is wrongly treated as seen and skipped.
+    """
+
+    # Capacity multiplier and error tightening ratio for each new filter
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, error_rate: float = 0.001, initial_capacity: int = 1 << 16):
+        self.error_rate = error_rate
+        self._filters: List[_BloomFilter] = []
+        self._count = 0
+        self._add_filter(initial_capacity)
+
+    def _add_filter(self, capacity: int) -> None:
+        # Filter i gets error_rate * (1 - r) * r**i, which sums to error_rate
+        rate = self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** len(self._filters)
+        self._filters.append(_BloomFilter(capacity, rate))
+
+    @staticmethod
+    def _hashes(url: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def add(self, url: str) -> None:
+        hashes = self._hashes(url)
+        for bloom in self._filters:
+            if hashes in bloom:
+                return
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            self._add_filter(current.capacity * self.GROWTH)
+            current = self._filters[-1]
+        current.add(*hashes)
+        self._count += 1
+
+    def __contains__(self, url: object) -> bool:
+        hashes = self._hashes(url)
+        return any(hashes in f for f in self._filters)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(len(f.bits) for f in self._filters)
+
+
+def create_seen_store(dedup: str, error_rate: float = 0.001) -> SeenStore:
+    """Create an in-memory seen store for a dedup mode."""
+    if dedup == 'exact':
+        return MemorySeenStore()
+    if dedup == 'fingerprint':
+        return FingerprintSeenStore()
+    if dedup == 'bloom':
+        return BloomSeenStore(error_rate=error_rate)
+    raise ValueError(f"dedup must be one of {DEDUP_MODES}, got {dedup!r}")
+
+
+class Frontier:
+    """Queue of (url, depth) items waiting to be fetched, FIFO unless noted."""
+
+    def put(self, item: FrontierItem) -> None:
+        raise NotImplementedError
+
+    def pop(self) -> Optional[FrontierItem]:
+        """Remove and return the next item, or None when empty."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def release(self, item: FrontierItem) -> None:
+        """Mark a popped item as processed."""
+
+    def add_inlink(self, url: str) -> None:
+        """Note another link to url, which may be queued (used by priority frontiers)."""
+
+    def next_due(self) -> Optional[float]:
+        """
+        After pop() returned None with items queued: seconds until one of
+        them may be handed out (None = only a put() or release() will help).
+        """
+        return None
+
+    def close(self) -> None:
+        """Release any resources held by the frontier."""
+
+
+class MemoryFrontier(Frontier):
+    """Frontier backed by a deque."""
+
+    def __init__(self):
+        self._items: Deque[FrontierItem] = deque()
+
+    def put(self, item: FrontierItem) -> None:
+        self._items.append(item)
+
+    def pop(self) -> Optional[FrontierItem]:
+        return self._items.popleft() if self._items else None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteFrontier(Frontier):
+    """
+    Frontier spilled to an SQLite table.
+
+    Only a write buffer at the tail and a read buffer at the head are kept
+    in memory, each at most batch_size items.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self._conn = _open_scratch_db(path, 'frontier')
+        self._conn.execute(
+            "CREATE TABLE frontier "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, depth INTEGER)"
+        )
+        self._stored = 0
+        self._head: Deque[FrontierItem] = deque()
+        self._tail: List[FrontierItem] = []
+
+    def put(self, item: FrontierItem) -> None:
+        self._tail.append(item)
+        if len(self._tail) >= self.batch_size:
+            self._flush()
+
+    def pop(self) -> Optional[FrontierItem]:
+        if not self._head:
+            if self._stored:
+                self._refill()
+            elif self._tail:
+                # Nothing on disk: serve the tail directly, preserving order
+                self._head.extend(self._tail)
+                self._tail.clear()
+        return self._head.popleft() if self._head else None
+
+    def __len__(self) -> int:
+        return len(self._head) + self._stored + len(self._tail)
+
+    def _flush(self) -> None:
+        self._conn.executemany("INSERT INTO frontier (url, depth) VALUES (?, ?)", self._tail)
+        self._stored += len(self._tail)
+        self._tail.clear()
+
+    def _refill(self) -> None:
+        rows = self._conn.execute(
+            "SELECT id, url, depth FROM frontier ORDER BY id LIMIT ?", (self.batch_size,)
+        ).fetchall()
+        if rows:
+            self._conn.execute("DELETE FROM frontier WHERE id <= ?", (rows[-1][0],))
+            self._stored -= len(rows)
+            self._head.extend((url, depth) for _, url, depth in rows)
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+class PriorityFrontier(Frontier):
+    """
+    Frontier served best-first, backed by a binary heap.
+
+    score(url, depth, inlinks) ranks items, highest first; equal scores
+    keep insertion order. add_inlink() re-scores a queued URL, and if the
+    score rises a new heap entry is pushed and the old one marked stale,
+    to be dropped when it surfaces (lazy deletion). put, pop and
+    add_inlink are all O(log n); the heap is rebuilt once stale entries
+    outnumber live ones.
+    """
+
+    def __init__(self, score: FrontierScore):
+        self.score = score
+        # (-score, sequence, url, depth); the sequence breaks ties in order
+        self._heap: List[Tuple[float, int, str, int]] = []
+        # url -> (sequence of its live entry, depth, score, inlinks)
+        self._queued: Dict[str, Tuple[int, int, float, int]] = {}
+        self._stale: Set[int] = set()
+        self._sequence = itertools.count()
+
+    def put(self, item: FrontierItem) -> None:
+        url, depth = item
+        self._push(url, depth, self.score(url, depth, 1), 1)
+
+    def _push(self, url: str, depth: int, score: float, inlinks: int) -> None:
+        sequence = next(self._sequence)
+        self._queued[url] = (sequence, depth, score, inlinks)
+        heapq.heappush(self._heap, (-score, sequence, url, depth))
+
+    def add_inlink(self, url: str) -> None:
+        entry = self._queued.get(url)
+        if entry is None:
+            return
+        sequence, depth, score, inlinks = entry
+        new_score = self.score(url, depth, inlinks + 1)
+        if new_score <= score:
+            self._queued[url] = (sequence, depth, score, inlinks + 1)
+            return
+        self._stale.add(sequence)
+        self._push(url, depth, new_score, inlinks + 1)
+        if len(self._stale) > len(self._queued):
+            self._compact()
+
+    def best_score(self) -> Optional[float]:
+        """Score of the item pop() returns next, or None when empty."""
+        heap = self._heap
+        while heap and heap[0][1] in self._stale:
+            self._stale.discard(heapq.heappop(heap)[1])
+        return -heap[0][0] if heap else None
+
+    def pop(self) -> Optional[FrontierItem]:
+        if self.best_score() is None:
+            return None
+        _, sequence, url, depth = heapq.heappop(self._heap)
+        entry = self._queued.get(url)
+        if entry is not None and entry[0] == sequence:
+            del self._queued[url]
+        return url, depth
+
+    def __len__(self) -> int:
+        return len(self._heap) - len(self._stale)
+
+    def _compact(self) -> None:
+        stale = self._stale
+        self._heap = [entry for entry in self._heap if entry[1] not in stale]
+        heapq.heapify(self._heap)
+        stale.clear()
+
+    def split(self, keep: int) -> List[Tuple[float, str, int]]:
+        """Remove all but the best keep items; return them as (score, url, depth)."""
+        self._compact()
+        if len(self._heap) <= keep:
+            return []
+        self._heap.sort()
+        removed, self._heap = self._heap[keep:], self._heap[:keep]
+        for _, sequence, url, _ in removed:
+            entry = self._queued.get(url)
+            if entry is not None and entry[0] == sequence:
+                del self._queued[url]
+        # A sorted list is already a valid heap
+        return [(-neg_score, url, depth) for neg_score, _, url, depth in removed]
+
+    def push_scored(self, url: str, depth: int, score: float) -> None:
+        """Queue an item with a known score, e.g. one read back from disk."""
+        self._push(url, depth, score, 1)
+
+
+class SQLitePriorityFrontier(Frontier):
+    """
+    Priority frontier spilled to an SQLite table.
+
+    The best items wait in an in-memory PriorityFrontier. When it holds
+    more than 2 * batch_size, all but the best batch_size go to disk, and
+    the best batch on disk is read back whenever it could outrank the
+    best item in memory, so items still come out best-first. Inlinks are
+    only counted while an item is in memory.
+    """
+
+    def __init__(self, path: str, score: FrontierScore, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self._memory = PriorityFrontier(score)
+        self._conn = _open_scratch_db(path, 'frontier')
+        self._conn.execute(
+            "CREATE TABLE frontier "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, depth INTEGER, score REAL)"
+        )
+        self._conn.execute("CREATE INDEX frontier_score ON frontier (score DESC, id)")
+        self._stored = 0
+        self._best_stored: Optional[float] = None
+
+    def _max_stored_score(self) -> Optional[float]:
+        return self._conn.execute("SELECT MAX(score) FROM frontier").fetchone()[0]
+
+    def put(self, item: FrontierItem) -> None:
+        self._memory.put(item)
+        if len(self._memory) > 2 * self.batch_size:
+            self._spill()
+
+    def add_inlink(self, url: str) -> None:
+        self._memory.add_inlink(url)
+
+    def pop(self) -> Optional[FrontierItem]:
+        if self._stored:
+            best = self._memory.best_score()
+            if best is None or self._best_stored > best:
+                self._refill()
+        return self._memory.pop()
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._stored
+
+    def _spill(self) -> None:
+        spilled = self._memory.split(self.batch_size)
+        self._conn.executemany(
+            "INSERT INTO frontier (url, depth, score) VALUES (?, ?, ?)",
+            [(url, depth, score) for score, url, depth in spilled]
+        )
+        self._stored += len(spilled)
+        # Spilled items come best first
+        if spilled and (self._best_stored is None or spilled[0][0] > self._best_stored):
+            self._best_stored = spilled[0][0]
+
+    def _refill(self) -> None:
+        rows = self._conn.execute(
+            "SELECT id, url, depth, score FROM frontier ORDER BY score DESC, id LIMIT ?",
+            (self.batch_size,)
+        ).fetchall()
+        self._conn.executemany("DELETE FROM frontier WHERE id = ?", [(row[0],) for row in rows])
+        self._stored -= len(rows)
+        for _, url, depth, score in rows:
+            self._memory.push_scored(url, depth, score)
+        self._best_stored = self._max_stored_score() if self._stored else None
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+class HostFrontier(Frontier):
+    """
+    Frontier with one sub-queue per host, served round-robin.
+
+    Each pop takes the next item from the next host in rotation, so a
+    host with a huge backlog cannot starve the others. A host with
+    host_limit items checked out (popped but not yet released) is
+    skipped until one is released, which caps per-host concurrency.
+    Hosts that due() says may not be sent a request yet are skipped too,
+    so workers are not tied up waiting on a slow-paced host (such as one
+    with a robots.txt Crawl-delay) while other hosts have work.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Frontier],
+        host_limit: Optional[int] = None,
+        due: Optional[Callable[[str], float]] = None
+    ):
+        """
+        Args:
+            factory: Creates the sub-queue for a host
+            host_limit: Maximum items checked out per host (None = no limit)
+            due: Seconds until a host may be sent its next request
+                (None = always ready)
+        """
+        self.factory = factory
+        self.host_limit = host_limit
+        self.due = due
+        self._next_due: Optional[float] = None
+        self._queues: Dict[str, Frontier] = {}
+        self._active: Dict[str, int] = {}
+        self._rotation: Deque[str] = deque()
+        self._size = 0
+
+    @staticmethod
+    def _host(item: FrontierItem) -> str:
+        return urlsplit(item[0]).netloc
+
+    def put(self, item: FrontierItem) -> None:
+        host = self._host(item)
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = self.factory(host)
+            self._active[host] = 0
+        if not len(queue):
+            self._rotation.append(host)
+        queue.put(item)
+        self._size += 1
+
+    def pop(self) -> Optional[FrontierItem]:
+        self._next_due = None
+        # Only hosts with queued items are in the rotation
+        for _ in range(len(self._rotation)):
+            host = self._rotation.popleft()
+            if self.host_limit is not None and self._active[host] >= self.host_limit:
+                self._rotation.append(host)
+                continue
+            wait = self.due(host) if self.due is not None else 0.0
+            if wait > 0:
+                self._rotation.append(host)
+                if self._next_due is None or wait < self._next_due:
+                    self._next_due = wait
+                continue
+            queue = self._queues[host]
+            item = queue.pop()
+            if len(queue):
+                self._rotation.append(host)
+            self._active[host] += 1
+            self._size -= 1
+            return item
+        return None
+
+    def release(self, item: FrontierItem) -> None:
+        self._active[self._host(item)] -= 1
+
+    def add_inlink(self, url: str) -> None:
+        queue = self._queues.get(urlsplit(url).netloc)
+        if queue is not None:
+            queue.add_inlink(url)
+
+    def next_due(self) -> Optional[float]:
+        return self._next_due
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def hosts(self) -> List[str]:
+        """Hosts seen so far, in order of first appearance."""
+        return list(self._queues)
+
+    def close(self) -> None:
+        for queue in self._queues.values():
+            queue.close()
+
+
+class FrontierQueue:
+    """
+    asyncio adapter over a Frontier with asyncio.Queue-style
+    get()/task_done()/join() semantics for the worker pool.
+
+    Items can also be deferred: they wait on a timer rather than in a
+    worker and count as unfinished until processed, so join() does not
+    return while any are pending.
+    """
+
+    def __init__(self, frontier: Frontier):
+        self.frontier = frontier
+        self._unfinished = 0
+        self._not_empty = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self._deferred: Dict[int, asyncio.TimerHandle] = {}
+        self._next_deferred = 0
+
+    def put_nowait(self, item: FrontierItem) -> None:
+        self.frontier.put(item)
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+    def defer(self, item: FrontierItem, delay: float) -> None:
+        """Put an item on the frontier after delay seconds."""
+        self._unfinished += 1
+        self._finished.clear()
+        key = self._next_deferred
+        self._next_deferred += 1
+        self._deferred[key] = asyncio.get_running_loop().call_later(
+            delay, self._release, key, item
+        )
+
+    def hold(self) -> None:
+        """
+        Count outside work as unfinished until a matching task_done(), so
+        join() waits for a producer that is still adding items.
+        """
+        self._unfinished += 1
+        self._finished.clear()
+
+    def _release(self, key: int, item: FrontierItem) -> None:
+        del self._deferred[key]
+        self.frontier.put(item)
+        self._not_empty.set()
+
+    def cancel_deferred(self) -> None:
+        """Drop items still waiting on their timers."""
+        for handle in self._deferred.values():
+            handle.cancel()
+        self._deferred.clear()
+
+    @property
+    def deferred(self) -> int:
+        """Number of items waiting on their timers."""
+        return len(self._deferred)
+
+    @property
+    def unfinished(self) -> int:
+        """Items queued, deferred or being processed."""
+        return self._unfinished
+
+    async def get(self) -> FrontierItem:
+        while True:
+            item = self.frontier.pop()
+            if item is not None:
+                return item
+            self._not_empty.clear()
+            due = self.frontier.next_due()
+            if due is None:
+                await self._not_empty.wait()
+                continue
+            # Items are held back until their host is due
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), due)
+            except asyncio.TimeoutError:
+                pass
+
+    def task_done(self, item: Optional[FrontierItem] = None) -> None:
+        if item is not None:
+            self.frontier.release(item)
+            # A released item may unblock a host that was at its limit
+            if len(self.frontier):
+                self._not_empty.set()
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        await self._finished.wait()
+
+    def qsize(self) -> int:
+        return len(self.frontier)
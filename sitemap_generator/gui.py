@@ -42,7 +42,9 @@ class CrawlerWorker(QThread):
         concurrency: int = 10,
         crawl_delay: float = 0.1,
         respect_robots: bool = True,
-        include_images: bool = False
+        include_images: bool = False,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = False
     ):
         super().__init__()
         self.url = url
@@ -52,6 +54,8 @@ class CrawlerWorker(QThread):
         self.crawl_delay = crawl_delay
         self.respect_robots = respect_robots
         self.include_images = include_images
+        self.checkpoint_path = checkpoint_path
+        self.resume = resume
         self._is_running = True
     
     def stop(self):
@@ -70,7 +74,9 @@ class CrawlerWorker(QThread):
                 concurrency=self.concurrency,
                 crawl_delay=self.crawl_delay,
                 respect_robots_txt=self.respect_robots,
-                include_images=self.include_images
+                include_images=self.include_images,
+                checkpoint_path=self.checkpoint_path,
+                resume=self.resume
             )
             
             crawler.url_callback = self._on_url_found
@@ -216,7 +222,22 @@ class SitemapGeneratorGUI(QMainWindow):
         self.include_images_check = QCheckBox("Include images")
         self.include_images_check.setChecked(False)
         settings_layout.addWidget(self.include_images_check)
-        
+
+        # Checkpoint
+        checkpoint_layout = QHBoxLayout()
+        checkpoint_layout.addWidget(QLabel("Checkpoint:"))
+        self.checkpoint_input = QLineEdit()
+        self.checkpoint_input.setPlaceholderText("Optional .sqlite file")
+        checkpoint_layout.addWidget(self.checkpoint_input)
+        checkpoint_btn = QPushButton("Browse...")
+        checkpoint_btn.clicked.connect(self.choose_checkpoint)
+        checkpoint_layout.addWidget(checkpoint_btn)
+        settings_layout.addLayout(checkpoint_layout)
+
+        self.resume_check = QCheckBox("Resume from checkpoint")
+        self.resume_check.setChecked(False)
+        settings_layout.addWidget(self.resume_check)
+
         layout.addWidget(settings_group)
         
         # Export Options
@@ -388,9 +409,11 @@ class SitemapGeneratorGUI(QMainWindow):
             concurrency=self.concurrency_spin.value(),
             crawl_delay=self.delay_spin.value(),
             respect_robots=self.respect_robots_check.isChecked(),
-            include_images=self.include_images_check.isChecked()
+            include_images=self.include_images_check.isChecked(),
+            checkpoint_path=self.checkpoint_input.text().strip() or None,
+            resume=self.resume_check.isChecked()
         )
-        
+
         self.worker.url_found.connect(self.on_url_found)
         self.worker.progress_update.connect(self.on_progress)
         self.worker.finished_signal.connect(self.on_finished)
@@ -410,7 +433,16 @@ class SitemapGeneratorGUI(QMainWindow):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.status_label.setText("Stopped")
-    
+
+    def choose_checkpoint(self):
+        """Pick the checkpoint file for resumable crawls."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Checkpoint File", "crawl.sqlite", "SQLite files (*.sqlite)",
+            options=QFileDialog.Option.DontConfirmOverwrite
+        )
+        if path:
+            self.checkpoint_input.setText(path)
+
     def on_url_found(self, page: PageInfo):
         """Handle found URL."""
         self.pages.append(page)
@@ -0,0 +1,138 @@
+"""
+URL normalization for crawl deduplication.
+Rewrites equivalent spellings of a URL (case, default ports, tracking
+parameters, query order, index pages, trailing slashes) to one form.
+"""
+
+import re
+from typing import Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Query parameters that only track campaigns or clicks; '*' ends a prefix
+TRACKING_PARAMS = (
+    'utm_*', 'gclid', 'gclsrc', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid',
+    'yclid', 'twclid', 'ttclid', 'li_fat_id', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'srsltid', 'vero_id'
+)
+
+# Directory index documents served for the directory URL itself
+INDEX_PAGES = ('index.html', 'index.htm')
+
+# How a path's trailing slash is treated
+SLASH_POLICIES = ('keep', 'add', 'strip')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_PERCENT_ESCAPE = re.compile(r'%[0-9a-fA-F]{2}')
+_UNRESERVED = frozenset(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~'
+)
+
+
+def _normalize_escape(match: 're.Match[str]') -> str:
+    """Decode escapes of unreserved characters; uppercase the rest (RFC 3986)."""
+    char = chr(int(match.group()[1:], 16))
+    return char if char in _UNRESERVED else match.group().upper()
+
+
+class URLNormalizer:
+    """
+    Maps URLs that name the same page onto one spelling.
+
+    Always lowercases the scheme and host, drops default ports, empty
+    queries and fragments, and normalizes percent-escapes. Optionally
+    removes query parameters by name, sorts the rest, drops directory
+    index documents and adds or strips the trailing slash of paths.
+
+    Usage:
+        normalizer = URLNormalizer(trailing_slash='strip')
+        normalizer.normalize('HTTPS://Example.com:443/a/?utm_source=x&b=2&a=1')
+        # 'https://example.com/a?a=1&b=2'
+    """
+
+    def __init__(
+        self,
+        strip_params: Optional[Iterable[str]] = TRACKING_PARAMS,
+        sort_query: bool = True,
+        trailing_slash: str = 'keep',
+        index_pages: Optional[Iterable[str]] = INDEX_PAGES
+    ):
+        """
+        Args:
+            strip_params: Query parameter names to remove (case-insensitive);
+                a trailing '*' matches every name with that prefix
+            sort_query: Order query parameters by name, then value
+            trailing_slash: 'keep', 'add' (to paths whose last segment has
+                no extension) or 'strip' (from every path but '/')
+            index_pages: Last path segments to remove, e.g. 'index.html'
+        """
+        if trailing_slash not in SLASH_POLICIES:
+            raise ValueError(f"trailing_slash must be one of {SLASH_POLICIES}, got {trailing_slash!r}")
+
+        names = [name.lower() for name in strip_params or ()]
+        self.strip_names = frozenset(name for name in names if not name.endswith('*'))
+        self.strip_prefixes = tuple(name[:-1] for name in names if name.endswith('*'))
+        self.sort_query = sort_query
+        self.trailing_slash = trailing_slash
+        self.index_pages = frozenset(index_pages or ())
+
+    def _keep_param(self, pair: str) -> bool:
+        if not pair:
+            return False
+        name = pair.split('=', 1)[0].lower()
+        return name not in self.strip_names and not name.startswith(self.strip_prefixes)
+
+    def _normalize_path(self, path: str) -> str:
+        if not path:
+            return '/'
+        if '%' in path:
+            path = _PERCENT_ESCAPE.sub(_normalize_escape, path)
+
+        head, _, last = path.rpartition('/')
+        if last in self.index_pages:
+            path = head + '/'
+            last = ''
+
+        if self.trailing_slash == 'add' and last and '.' not in last:
+            path += '/'
+        elif self.trailing_slash == 'strip' and len(path) > 1 and path.endswith('/'):
+            path = path.rstrip('/') or '/'
+        return path
+
+    def _normalize_query(self, query: str) -> str:
+        if not query:
+            return ''
+        if '%' in query:
+            query = _PERCENT_ESCAPE.sub(_normalize_escape, query)
+        pairs = [pair for pair in query.split('&') if self._keep_param(pair)]
+        if self.sort_query:
+            pairs.sort()
+        return '&'.join(pairs)
+
+    def normalize(self, url: str) -> str:
+        """Return the normalized form of an absolute http(s) URL; others are returned as-is."""
+        try:
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            if scheme not in DEFAULT_PORTS:
+                return url
+            host = parts.hostname or ''
+            port = parts.port
+        except ValueError:
+            # Malformed netloc (e.g. a non-numeric port); leave it alone
+            return url
+
+        if ':' in host:
+            host = f"[{host}]"
+        if port is not None and port != DEFAULT_PORTS[scheme]:
+            host = f"{host}:{port}"
+        userinfo = parts.netloc.rpartition('@')[0]
+        netloc = f"{userinfo}@{host}" if userinfo else host
+
+        return urlunsplit((
+            scheme,
+            netloc,
+            self._normalize_path(parts.path),
+            self._normalize_query(parts.query),
+            ''
+        ))
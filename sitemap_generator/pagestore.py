@@ -0,0 +1,147 @@
+"""
+Columnar page store for very large crawls.
+Keeps crawled pages as parallel arrays instead of one object per page.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from .crawler import PageInfo
+
+# Standard sitemaps.org changefreq values, coded as one byte each
+CHANGEFREQS = ('always', 'hourly', 'daily', 'weekly', 'monthly', 'yearly', 'never')
+
+
+class ColumnarPageStore:
+    """
+    Mapping of URL to PageInfo stored column by column.
+
+    Depths, priorities and changefreq codes live in typed arrays, repeated
+    strings (lastmod values, image URLs) are shared, and images are stored
+    only for pages that have any. PageInfo objects are built on access.
+    Supports the dict operations the crawler uses on AsyncCrawler.pages.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._urls: List[str] = []
+        self._depths = array('H')
+        self._priorities = array('d')
+        self._changefreqs = array('B')
+        self._lastmods: List[Optional[str]] = []
+        self._titles: List[Optional[str]] = []
+        self._images: Dict[int, Tuple[str, ...]] = {}
+        self._changefreq_codes = {name: code for code, name in enumerate(CHANGEFREQS)}
+        self._changefreq_names = list(CHANGEFREQS)
+        self._strings: Dict[str, str] = {}
+
+    def _intern(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def _changefreq_code(self, changefreq: str) -> int:
+        code = self._changefreq_codes.get(changefreq)
+        if code is None:
+            code = self._changefreq_codes[changefreq] = len(self._changefreq_names)
+            self._changefreq_names.append(changefreq)
+        return code
+
+    def __setitem__(self, url: str, page: PageInfo) -> None:
+        images = tuple(self._intern(img) for img in page.images)
+        row = self._rows.get(url)
+        if row is None:
+            row = self._rows[url] = len(self._urls)
+            self._urls.append(url)
+            self._depths.append(min(page.depth, 0xFFFF))
+            self._priorities.append(page.priority)
+            self._changefreqs.append(self._changefreq_code(page.changefreq))
+            self._lastmods.append(self._intern(page.lastmod))
+            self._titles.append(page.title)
+        else:
+            self._depths[row] = min(page.depth, 0xFFFF)
+            self._priorities[row] = page.priority
+            self._changefreqs[row] = self._changefreq_code(page.changefreq)
+            self._lastmods[row] = self._intern(page.lastmod)
+            self._titles[row] = page.title
+            self._images.pop(row, None)
+        if images:
+            self._images[row] = images
+
+    def _page(self, row: int) -> PageInfo:
+        return PageInfo(
+            url=self._urls[row],
+            depth=self._depths[row],
+            lastmod=self._lastmods[row],
+            priority=self._priorities[row],
+            changefreq=self._changefreq_names[self._changefreqs[row]],
+            title=self._titles[row],
+            images=self._images.get(row, ())
+        )
+
+    def __getitem__(self, url: str) -> PageInfo:
+        return self._page(self._rows[url])
+
+    def get(self, url: str, default: Optional[PageInfo] = None) -> Optional[PageInfo]:
+        row = self._rows.get(url)
+        return default if row is None else self._page(row)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._rows
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._urls)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._urls)
+
+    def values(self) -> 'PageSequence':
+        """All pages in insertion order."""
+        return PageSequence(self, range(len(self._urls)))
+
+    def items(self) -> Iterator[Tuple[str, PageInfo]]:
+        for row, url in enumerate(self._urls):
+            yield url, self._page(row)
+
+    def update(self, pages: Dict[str, PageInfo]) -> None:
+        for url, page in pages.items():
+            self[url] = page
+
+    def sorted_view(self) -> 'PageSequence':
+        """All pages ordered by URL."""
+        return self.values().sorted_by_url()
+
+
+class PageSequence(Sequence):
+    """Read-only sequence of pages from a ColumnarPageStore, built on access."""
+
+    def __init__(self, store: ColumnarPageStore, rows: Sequence[int]):
+        self._store = store
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> PageInfo: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PageInfo]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PageInfo, List[PageInfo]]:
+        if isinstance(index, slice):
+            return [self._store._page(row) for row in self._rows[index]]
+        return self._store._page(self._rows[index])
+
+    def __iter__(self) -> Iterator[PageInfo]:
+        page = self._store._page
+        for row in self._rows:
+            yield page(row)
+
+    def sorted_by_url(self) -> 'PageSequence':
+        """Same pages ordered by URL; sorts row numbers, not PageInfo objects."""
+        order = array('L', sorted(self._rows, key=self._store._urls.__getitem__))
+        return PageSequence(self._store, order)
@@ -0,0 +1,272 @@
+"""
+HTML parsing for sitemap generation.
+Extracts title, links, images and lastmod from raw page bytes.
+
+Everything here is a plain module-level function operating on picklable
+inputs, so parsing can run inline on the event loop or in a process pool.
+"""
+
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Iterable, List, Optional, Set, Union
+from urllib.parse import urljoin, urlparse, urldefrag
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from .normalize import DEFAULT_PORTS
+
+# Maximum images kept per page
+MAX_IMAGES_PER_PAGE = 10
+
+# Available parsing engines: full BeautifulSoup tree, or streaming lxml events
+PARSER_ENGINES = ('bs4', 'lxml')
+
+
+@dataclass
+class ParseResult:
+    """Data extracted from a single HTML page."""
+    title: Optional[str] = None
+    links: Set[str] = field(default_factory=set)
+    images: List[str] = field(default_factory=list)
+    lastmod: Optional[str] = None
+    canonical: Optional[str] = None
+
+
+class HostAllowlist:
+    """
+    Set of hosts a crawl may visit.
+
+    Entries are netlocs ("shop.example.com") or wildcards covering every
+    subdomain ("*.example.com"). Picklable, so it can be passed to parse
+    workers in place of a single domain.
+    """
+
+    def __init__(self, hosts: Iterable[str]):
+        hosts = [host.lower() for host in hosts]
+        self.exact = frozenset(host for host in hosts if not host.startswith('*.'))
+        self.suffixes = tuple(host[1:] for host in hosts if host.startswith('*.'))
+
+    def __contains__(self, netloc: object) -> bool:
+        if not isinstance(netloc, str):
+            return False
+        netloc = netloc.lower()
+        return netloc in self.exact or netloc.endswith(self.suffixes)
+
+
+# A single netloc, or an allowlist of them
+Domain = Union[str, HostAllowlist]
+
+
+def _on_domain(scheme: str, netloc: str, domain: Domain) -> bool:
+    """
+    Whether a URL's netloc is the crawled domain or on its allowlist.
+    Case and the scheme's default port are ignored.
+    """
+    netloc = netloc.lower()
+    default_port = f":{DEFAULT_PORTS.get(scheme)}"
+    if netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    if isinstance(domain, str):
+        return netloc == domain.lower()
+    return netloc in domain
+
+
+def parse_lastmod(last_modified: Optional[str]) -> Optional[str]:
+    """Convert a Last-Modified header into a W3C datetime string."""
+    if not last_modified:
+        return None
+    try:
+        dt = parsedate_to_datetime(last_modified)
+        return dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+    except (TypeError, ValueError):
+        return None
+
+
+def resolve_link(href: str, base_url: str, domain: Domain) -> Optional[str]:
+    """Resolve an href to an absolute same-domain URL, or None to skip it."""
+    # Skip anchors and javascript
+    if href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+        return None
+
+    # Resolve relative URLs and remove fragment
+    absolute_url, _ = urldefrag(urljoin(base_url, href))
+
+    parsed = urlparse(absolute_url)
+
+    # Check scheme
+    if parsed.scheme not in ('http', 'https'):
+        return None
+
+    # Check same domain
+    if not _on_domain(parsed.scheme, parsed.netloc, domain):
+        return None
+
+    return parsed._replace(fragment="").geturl()
+
+
+def _is_canonical(rel: Union[str, List[str], None]) -> bool:
+    """Whether a rel attribute (string or bs4 token list) includes 'canonical'."""
+    if not rel:
+        return False
+    tokens = rel.split() if isinstance(rel, str) else rel
+    return any(token.lower() == 'canonical' for token in tokens)
+
+
+def extract_links(soup: BeautifulSoup, base_url: str, domain: Domain) -> Set[str]:
+    """Extract valid same-domain links from parsed HTML."""
+    links = set()
+
+    for link in soup.find_all('a', href=True):
+        resolved = resolve_link(link['href'], base_url, domain)
+        if resolved:
+            links.add(resolved)
+
+    return links
+
+
+class _StreamingTarget:
+    """
+    lxml parser target that collects title, links, images and the
+    canonical URL from parse events without building a document tree.
+    """
+
+    def __init__(self, url: str, domain: Domain, include_images: bool, follow_links: bool):
+        self.url = url
+        self.domain = domain
+        self.include_images = include_images
+        self.follow_links = follow_links
+        self.result = ParseResult()
+        self._title_parts: Optional[List[str]] = None
+        self._title_done = False
+
+    def start(self, tag: str, attrib: dict) -> None:
+        if tag == 'a':
+            href = attrib.get('href')
+            if href is not None and self.follow_links:
+                resolved = resolve_link(href, self.url, self.domain)
+                if resolved:
+                    self.result.links.add(resolved)
+        elif tag == 'img':
+            src = attrib.get('src')
+            if (src is not None and self.include_images
+                    and len(self.result.images) < MAX_IMAGES_PER_PAGE):
+                img_url = urljoin(self.url, src)
+                parts = urlparse(img_url)
+                if _on_domain(parts.scheme, parts.netloc, self.domain):
+                    self.result.images.append(img_url)
+        elif tag == 'title' and not self._title_done:
+            self._title_parts = []
+        elif tag == 'link' and self.result.canonical is None and _is_canonical(attrib.get('rel')):
+            href = attrib.get('href')
+            if href:
+                self.result.canonical = resolve_link(href.strip(), self.url, self.domain)
+
+    def end(self, tag: str) -> None:
+        if tag == 'title' and self._title_parts is not None:
+            self.result.title = ''.join(self._title_parts).strip()
+            self._title_parts = None
+            self._title_done = True
+
+    def data(self, data: str) -> None:
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    def close(self) -> ParseResult:
+        return self.result
+
+
+def _parse_streaming(
+    body: bytes,
+    url: str,
+    domain: Domain,
+    encoding: Optional[str],
+    include_images: bool,
+    follow_links: bool
+) -> ParseResult:
+    """Parse with lxml parser events; no tree is ever built."""
+    target = _StreamingTarget(url, domain, include_images, follow_links)
+    try:
+        parser = etree.HTMLParser(target=target, encoding=encoding)
+    except LookupError:
+        # A charset lxml does not know (e.g. 'utf8mb4'); let it detect one
+        parser = etree.HTMLParser(target=target)
+    parser.feed(body)
+    return parser.close()
+
+
+def _parse_soup(
+    body: bytes,
+    url: str,
+    domain: Domain,
+    encoding: Optional[str],
+    include_images: bool,
+    follow_links: bool
+) -> ParseResult:
+    """Parse with a full BeautifulSoup tree."""
+    soup = BeautifulSoup(body, 'lxml', from_encoding=encoding)
+    result = ParseResult()
+
+    # Extract title
+    title_tag = soup.find('title')
+    if title_tag:
+        result.title = title_tag.get_text(strip=True)
+
+    # Extract images if enabled
+    if include_images:
+        for img in soup.find_all('img', src=True):
+            img_url = urljoin(url, img['src'])
+            parts = urlparse(img_url)
+            if _on_domain(parts.scheme, parts.netloc, domain):
+                result.images.append(img_url)
+                if len(result.images) >= MAX_IMAGES_PER_PAGE:
+                    break
+
+    if follow_links:
+        result.links = extract_links(soup, url, domain)
+
+    for link in soup.find_all('link', href=True):
+        if _is_canonical(link.get('rel')):
+            result.canonical = resolve_link(link['href'].strip(), url, domain)
+            break
+
+    return result
+
+
+def parse_html(
+    body: bytes,
+    url: str,
+    domain: Domain,
+    encoding: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    include_images: bool = False,
+    follow_links: bool = True,
+    engine: str = 'bs4'
+) -> ParseResult:
+    """
+    Parse a page into a ParseResult.
+
+    Args:
+        body: Raw response body
+        url: URL the body was fetched from (base for relative links)
+        domain: Only links and images on this netloc (or allowlist) are kept
+        encoding: Charset from the Content-Type header, if any
+        last_modified: Last-Modified header value, if any
+        include_images: Extract same-domain image URLs
+        follow_links: Extract outgoing links
+        engine: 'bs4' for a full BeautifulSoup tree, 'lxml' for the
+            streaming event-based extractor
+
+    Returns:
+        Extracted page data
+    """
+    if engine == 'lxml':
+        parse = _parse_streaming
+    elif engine == 'bs4':
+        parse = _parse_soup
+    else:
+        raise ValueError(f"Unknown parser engine: {engine}")
+
+    result = parse(body, url, domain, encoding, include_images, follow_links)
+    result.lastmod = parse_lastmod(last_modified)
+    return result
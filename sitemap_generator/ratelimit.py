@@ -0,0 +1,270 @@
+"""
+Per-host adaptive rate limiting for the crawler.
+Token-bucket pacing with AIMD rate control, robots.txt Crawl-delay and
+Retry-After support.
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+# Responses that ask the client to slow down
+BACKOFF_STATUSES = (429, 503)
+
+# Consecutive server errors or timeouts treated as overload; fewer are
+# transient failures that retries already handle
+ERROR_RUN = 3
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Convert a Retry-After header (seconds or HTTP date) into a delay in seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class HostLimiter:
+    """
+    Token bucket for a single host with AIMD rate control.
+
+    The bucket holds up to burst tokens and refills at rate tokens per
+    second; each request takes one. It is kept as a theoretical arrival
+    time, so acquiring is O(1) and waiters are served in order without
+    polling. Healthy responses add additive_increase to the rate per
+    second, and overload (429, 503 with Retry-After, a run of server
+    errors or timeouts, or rising latency) multiplies it by
+    decrease_factor. After a cut on errors or latency, which may be
+    transient, the rate grows back multiplicatively to where it was, so a
+    blip costs seconds rather than minutes. The rate never exceeds
+    max_rate, and a robots.txt Crawl-delay caps it further.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_rate: float = float('inf'),
+        min_rate: float = 0.05,
+        burst: int = 1,
+        additive_increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        max_retry_after: float = 300.0,
+        recovery_factor: float = 1.05
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = min(rate, max_rate)
+        self.burst = burst
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.max_retry_after = max_retry_after
+        self.recovery_factor = recovery_factor
+        self.paused_until = 0.0
+        self._tat = 0.0
+        # Bumped on every cut; requests scheduled before a cut cannot cut again
+        self.generation = 0
+        self._last_acquire: Optional[float] = None
+        self._interval_avg: Optional[float] = None
+        self._latency_avg: Optional[float] = None
+        self._latency_base: Optional[float] = None
+        # Rate before the last cut, regained quickly; consecutive errors
+        self._recover_to = 0.0
+        self.error_run = 0
+
+    def set_crawl_delay(self, delay: float) -> None:
+        """Never send requests more often than once per delay seconds."""
+        if delay > 0:
+            self.max_rate = min(self.max_rate, 1.0 / delay)
+            self.rate = min(self.rate, self.max_rate)
+
+    def due(self, now: float) -> float:
+        """Seconds until a request could be sent without waiting."""
+        if self.rate == float('inf'):
+            return max(0.0, self.paused_until - now)
+        start = max(self._tat, now, self.paused_until)
+        # Up to burst - 1 further requests may go before the token is due
+        return max(0.0, start - (self.burst - 1) / self.rate - now, self.paused_until - now)
+
+    def reserve(self, now: float) -> Tuple[float, int]:
+        """Take a token; return how long to wait before using it and the generation."""
+        wait = self.due(now)
+        if self.rate != float('inf'):
+            self._tat = max(self._tat, now, self.paused_until) + 1.0 / self.rate
+
+        # Smoothed gap between requests, used when backing off an unlimited rate
+        sent_at = now + wait
+        if self._last_acquire is not None:
+            gap = max(sent_at - self._last_acquire, 1e-3)
+            if self._interval_avg is None:
+                self._interval_avg = gap
+            else:
+                self._interval_avg = 0.8 * self._interval_avg + 0.2 * gap
+        self._last_acquire = sent_at
+        return wait, self.generation
+
+    def on_success(self, latency: float, generation: int, now: float) -> None:
+        """Record a healthy response; speed up unless latency is climbing."""
+        self.error_run = 0
+        if self._latency_avg is None:
+            self._latency_avg = latency
+        else:
+            self._latency_avg = 0.8 * self._latency_avg + 0.2 * latency
+        if self._latency_base is None or self._latency_avg < self._latency_base:
+            self._latency_base = self._latency_avg
+        else:
+            # Drift towards the current latency, so a host that settles at a
+            # slower speed stops looking congested
+            self._latency_base += 0.01 * (self._latency_avg - self._latency_base)
+
+        # A server that slows to twice its usual latency is treated as congested
+        if (self._latency_avg > 2 * self._latency_base
+                and self._latency_avg - self._latency_base > 0.05):
+            self.decrease(generation, now, recover=True)
+        elif self.rate < self._recover_to:
+            self.rate = min(self._recover_to, self.max_rate, self.rate * self.recovery_factor)
+        elif self.rate < self.max_rate:
+            # additive_increase per second of traffic, not per response
+            self.rate = min(self.max_rate, self.rate + self.additive_increase / self.rate)
+
+    def on_error(self, generation: int, now: float) -> None:
+        """Record a server error or timeout; a run of them cuts the rate."""
+        self.error_run += 1
+        if self.error_run >= ERROR_RUN:
+            self.error_run = 0
+            self.decrease(generation, now, recover=True)
+
+    def decrease(self, generation: int, now: float, recover: bool = False) -> None:
+        """
+        Cut the rate in response to a request scheduled in generation.
+
+        Requests scheduled before the previous cut went out at the old
+        rate, so their responses do not cut it again. With recover, the
+        old rate is regained quickly once responses are healthy again.
+        """
+        if generation != self.generation:
+            return
+        self.generation += 1
+        rate = self.rate
+        if rate == float('inf'):
+            # Start from the rate actually achieved so far (1/s if unknown)
+            rate = 1.0 / self._interval_avg if self._interval_avg else 1.0
+        rate = min(rate, self.max_rate)
+        self._recover_to = rate if recover else 0.0
+        self.rate = max(self.min_rate, rate * self.decrease_factor)
+
+    def pause(self, seconds: float, now: float) -> None:
+        """Send nothing for the given number of seconds."""
+        self.paused_until = max(self.paused_until, now + min(seconds, self.max_retry_after))
+
+
+class RateLimiter:
+    """
+    Per-host HostLimiter registry used by AsyncCrawler.
+
+    A delay of 0 starts each host unthrottled; the limiter then only
+    slows down once a host signals overload. With adaptive=False the
+    rate stays fixed at 1 / delay (apart from Retry-After pauses).
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        adaptive: bool = True,
+        max_rate: Optional[float] = None,
+        burst: int = 1,
+        stats: Optional[Dict] = None
+    ):
+        self.delay = delay
+        self.adaptive = adaptive
+        self.max_rate = max_rate
+        self.burst = burst
+        self.hosts: Dict[str, HostLimiter] = {}
+        # Crawlers sharing hosts with others (e.g. distributed workers)
+        # multiply robots.txt delays so the combined rate stays within them
+        self.crawl_delay_scale = 1.0
+
+        # Counters are written into the caller's stats dict when given
+        self.stats = stats if stats is not None else {}
+        for key in ('rate_limited', 'rate_decreases'):
+            self.stats.setdefault(key, 0)
+
+    def host(self, host: str) -> HostLimiter:
+        limiter = self.hosts.get(host)
+        if limiter is None:
+            rate = 1.0 / self.delay if self.delay > 0 else float('inf')
+            max_rate = self.max_rate if self.max_rate else float('inf')
+            if not self.adaptive:
+                max_rate = min(rate, max_rate)
+            limiter = self.hosts[host] = HostLimiter(rate, max_rate=max_rate, burst=self.burst)
+        return limiter
+
+    def set_crawl_delay(self, host: str, delay: float) -> None:
+        """Apply a robots.txt Crawl-delay to a host."""
+        self.host(host).set_crawl_delay(delay * self.crawl_delay_scale)
+
+    def due(self, host: str) -> float:
+        """Seconds until a request to host could be sent without waiting."""
+        limiter = self.hosts.get(host)
+        if limiter is None:
+            return 0.0
+        return limiter.due(asyncio.get_running_loop().time())
+
+    async def acquire(self, host: str) -> int:
+        """
+        Wait until a request to host may be sent.
+
+        Returns:
+            Ticket to pass to record() with the outcome of the request
+        """
+        wait, generation = self.host(host).reserve(asyncio.get_running_loop().time())
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return generation
+
+    def record(
+        self,
+        host: str,
+        ticket: int,
+        status: Optional[int],
+        latency: float,
+        retry_after: Optional[str] = None
+    ) -> None:
+        """
+        Feed back the outcome of a request.
+
+        Args:
+            host: Host the request went to
+            ticket: Value returned by acquire() for the request
+            status: HTTP status, or None for a timeout or connection error
+            latency: Seconds from sending the request to the response headers
+            retry_after: Retry-After header value, if any
+        """
+        limiter = self.host(host)
+        now = asyncio.get_running_loop().time()
+
+        delay = parse_retry_after(retry_after)
+        if delay:
+            limiter.pause(delay, now)
+
+        if status in BACKOFF_STATUSES:
+            self.stats['rate_limited'] += 1
+        if not self.adaptive:
+            return
+
+        rate = limiter.rate
+        if status == 429 or (status == 503 and delay):
+            limiter.decrease(ticket, now)
+        elif status is None or status >= 500:
+            # A lone 503 or timeout is usually transient; only a run cuts
+            limiter.on_error(ticket, now)
+        else:
+            limiter.on_success(latency, ticket, now)
+        if limiter.rate < rate:
+            self.stats['rate_decreases'] += 1
@@ -0,0 +1,251 @@
+"""
+Compiled robots.txt matching for the crawler.
+RFC 9309 rules (longest match wins, '*' and '$' wildcards) compiled once
+per host, with a TTL cache of hosts and an LRU of decisions.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+# Characters left as-is when paths and rule patterns are normalized, so
+# both sides compare in the same percent-encoded form
+_SAFE = "/?=&;:@+,!~'()*$"
+
+
+def _normalize(path: str) -> str:
+    return quote(unquote(path), safe=_SAFE)
+
+
+def _product_token(user_agent: str) -> str:
+    """'FreeSitemapGenerator/3.0 (+url)' -> 'freesitemapgenerator'."""
+    return user_agent.split('/', 1)[0].split(None, 1)[0].lower() if user_agent.strip() else '*'
+
+
+# (pattern length, allowed, longest literal part, compiled regex)
+_WildcardRule = Tuple[int, bool, str, 're.Pattern[str]']
+
+
+def _precedence(rule: _WildcardRule) -> Tuple[int, bool]:
+    return -rule[0], not rule[1]
+
+
+class RobotsRules:
+    """
+    The robots.txt rules that apply to one user agent, compiled for matching.
+
+    Rules without wildcards go into a table keyed by prefix length, so a
+    lookup costs one dict probe per distinct rule length rather than one
+    comparison per rule. Rules with '*' or '$' are compiled to regexes and
+    indexed the same way by the literal text before their first '*'; rules
+    that start with a wildcard are screened by a substring test on their
+    longest literal part. Only the few candidates left run a regex, and
+    none that are shorter than the best match so far. As in RFC 9309 the
+    longest matching rule decides and Allow wins a tie. Recent decisions
+    are kept in a small LRU.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Tuple[str, bool]] = (),
+        crawl_delay: Optional[float] = None,
+        sitemaps: Optional[List[str]] = None,
+        disallow_all: bool = False,
+        cache_size: int = 4096
+    ):
+        """
+        Args:
+            rules: (pattern, allowed) pairs from the matching group
+            crawl_delay: Seconds between requests asked for, if any
+            sitemaps: URLs of Sitemap: lines
+            disallow_all: Refuse every URL (robots.txt access denied)
+            cache_size: Decisions kept in the LRU
+        """
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        self.disallow_all = disallow_all
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, bool]' = OrderedDict()
+
+        # Plain prefixes: length -> {prefix: allowed}
+        self._prefixes: Dict[int, Dict[str, bool]] = {}
+        # Wildcard rules as (length, allowed, needle, regex), by literal head
+        # (length -> {head: rules}) or, for a head of just '/', in one list
+        self._wildcard_heads: Dict[int, Dict[str, List[_WildcardRule]]] = {}
+        self._floating: List[_WildcardRule] = []
+        for pattern, allowed in rules:
+            if not pattern:
+                continue
+            pattern = _normalize(pattern)
+            if '*' not in pattern and not pattern.endswith('$'):
+                table = self._prefixes.setdefault(len(pattern), {})
+                # Allow wins a tie between identical rules
+                table[pattern] = table.get(pattern, False) or allowed
+                continue
+
+            rule = self._compile_wildcard(pattern, allowed)
+            head = pattern.rstrip('$').split('*', 1)[0]
+            if len(head) > 1:
+                self._wildcard_heads.setdefault(len(head), {}).setdefault(head, []).append(rule)
+            else:
+                self._floating.append(rule)
+        self._lengths = sorted(self._prefixes, reverse=True)
+        self._head_lengths = sorted(self._wildcard_heads, reverse=True)
+
+        # Longest first, Allow before Disallow at equal length
+        self._floating.sort(key=_precedence)
+        for heads in self._wildcard_heads.values():
+            for candidates in heads.values():
+                candidates.sort(key=_precedence)
+
+    @staticmethod
+    def _compile_wildcard(pattern: str, allowed: bool) -> '_WildcardRule':
+        anchored = pattern.endswith('$')
+        body = pattern[:-1] if anchored else pattern
+        parts = body.split('*')
+        regex = '.*?'.join(re.escape(part) for part in parts) + (r'\Z' if anchored else '')
+        # Every match contains the longest literal part, a cheap first test
+        return len(pattern), allowed, max(parts, key=len), re.compile(regex)
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], user_agent: str, **options) -> 'RobotsRules':
+        """
+        Compile a robots.txt for user_agent.
+
+        Rules come from every group naming the agent's product token
+        (case-insensitively), or from the '*' groups when none does.
+        Crawl-delay may be fractional, and Request-rate ("n/s") is folded
+        into it. Sitemap: lines are collected regardless of group.
+        """
+        token = _product_token(user_agent)
+        groups: Dict[str, List[Tuple[str, bool]]] = {}
+        delays: Dict[str, float] = {}
+        sitemaps: List[str] = []
+        agents: List[str] = []
+        in_rules = False
+
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            key, sep, value = line.partition(':')
+            if not sep:
+                continue
+            key = key.strip().lower()
+            value = value.strip()
+
+            if key == 'user-agent':
+                # Consecutive user-agent lines share the group that follows
+                if in_rules:
+                    agents = []
+                    in_rules = False
+                agents.append(_product_token(value))
+                continue
+            if key == 'sitemap':
+                if value and value not in sitemaps:
+                    sitemaps.append(value)
+                continue
+
+            in_rules = True
+            if key in ('allow', 'disallow'):
+                for agent in agents:
+                    groups.setdefault(agent, []).append((value, key == 'allow'))
+            elif key in ('crawl-delay', 'request-rate'):
+                delay = cls._parse_delay(key, value)
+                if delay is not None:
+                    for agent in agents:
+                        delays[agent] = max(delays.get(agent, 0.0), delay)
+
+        agent = token if token in groups or token in delays else '*'
+        return cls(groups.get(agent, ()), delays.get(agent), sitemaps, **options)
+
+    @staticmethod
+    def _parse_delay(key: str, value: str) -> Optional[float]:
+        try:
+            if key == 'crawl-delay':
+                delay = float(value)
+            else:
+                requests, _, seconds = value.partition('/')
+                delay = float(seconds.rstrip('sS') or 1) / float(requests)
+        except (ValueError, ZeroDivisionError):
+            return None
+        return delay if delay > 0 else None
+
+    def can_fetch(self, url: str) -> bool:
+        """Whether the rules allow fetching url (absolute, or a path)."""
+        if self.disallow_all:
+            return False
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        if path == '/robots.txt':
+            return True
+
+        allowed = self._cache.get(path)
+        if allowed is not None:
+            self._cache.move_to_end(path)
+            return allowed
+
+        allowed = self._match(_normalize(path))
+        self._cache[path] = allowed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return allowed
+
+    def _match(self, path: str) -> bool:
+        best_length, allowed = -1, True
+        for length in self._lengths:
+            if length > len(path):
+                continue
+            rule = self._prefixes[length].get(path[:length])
+            if rule is not None:
+                best_length, allowed = length, rule
+                break
+
+        candidate_lists = [self._floating] if self._floating else []
+        for length in self._head_lengths:
+            if length <= len(path):
+                candidates = self._wildcard_heads[length].get(path[:length])
+                if candidates:
+                    candidate_lists.append(candidates)
+
+        for candidates in candidate_lists:
+            # Sorted longest first, so the first match is the best of the list
+            for length, rule, needle, regex in candidates:
+                if length < best_length:
+                    break
+                if needle in path and regex.match(path):
+                    if length > best_length or rule:
+                        best_length, allowed = length, rule
+                    break
+        return allowed
+
+
+class RobotsCache:
+    """
+    Compiled robots.txt rules per host, each kept for ttl seconds.
+
+    RFC 9309 lets crawlers cache robots.txt for up to 24 hours, so long
+    crawls refetch it rather than follow stale rules forever.
+    """
+
+    def __init__(self, ttl: float = 24 * 3600):
+        self.ttl = ttl
+        self._hosts: Dict[str, Tuple[Optional[RobotsRules], float]] = {}
+
+    def get(self, host: str) -> Optional[RobotsRules]:
+        """Rules for host, or None when there are none (not loaded, expired or failed)."""
+        entry = self._hosts.get(host)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+    def fresh(self, host: str) -> bool:
+        """Whether host has an entry (possibly None) that has not expired."""
+        entry = self._hosts.get(host)
+        return entry is not None and entry[1] >= time.monotonic()
+
+    def put(self, host: str, rules: Optional[RobotsRules], ttl: Optional[float] = None) -> None:
+        """Store rules for host; None records that robots.txt could not be read."""
+        self._hosts[host] = (rules, time.monotonic() + (self.ttl if ttl is None else ttl))
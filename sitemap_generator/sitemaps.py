@@ -0,0 +1,106 @@
+"""
+Reading existing sitemaps to seed a crawl.
+Incremental parsing of sitemap and sitemap index files, plain or gzipped.
+"""
+
+import zlib
+from typing import List, Tuple
+
+from lxml import etree
+
+# Sitemaps are at most 50 MB uncompressed (sitemaps.org); stop reading beyond
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+# Nested sitemap files followed per crawl, counting the top-level ones
+MAX_SITEMAP_FILES = 1000
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_name(tag: object) -> str:
+    """Tag name without its namespace ('' for comments and PIs)."""
+    if not isinstance(tag, str):
+        return ''
+    return tag.rpartition('}')[2]
+
+
+class SitemapStreamParser:
+    """
+    Incremental parser for one sitemap or sitemap index file.
+
+    feed() takes the response body chunk by chunk, gzipped or not, and
+    returns the <loc> entries completed so far as ('url', loc) for pages
+    or ('sitemap', loc) for files listed by an index. Finished entries are
+    cleared from the tree, so memory stays flat however large the file.
+    Namespaces are ignored, as many sitemaps in the wild get them wrong.
+    """
+
+    def __init__(self, max_bytes: int = MAX_SITEMAP_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+        self._inflater = None
+        self._started = False
+        # Leading bytes held back until there are enough to detect gzip
+        self._head = b''
+        self._parser = etree.XMLPullParser(
+            events=('end',),
+            resolve_entities=False,
+            no_network=True,
+            recover=True
+        )
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, str]]:
+        if self.truncated or not chunk:
+            return []
+        if not self._started:
+            chunk = self._head + chunk
+            if len(chunk) < len(_GZIP_MAGIC):
+                self._head = chunk
+                return []
+            self._started = True
+            if chunk.startswith(_GZIP_MAGIC):
+                self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflater is not None:
+            chunk = self._inflater.decompress(chunk, self.max_bytes - self.bytes_read + 1)
+
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_bytes:
+            chunk = chunk[:len(chunk) - (self.bytes_read - self.max_bytes)]
+            self.truncated = True
+
+        self._parser.feed(chunk)
+        return self._entries()
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Finish parsing and return any remaining entries."""
+        if not self._started and self._head:
+            self._started = True
+            self._parser.feed(self._head)
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            # Truncated or malformed; keep what was read
+            pass
+        entries = self._entries()
+        # Past the size limit, an entry only closed here was cut short
+        return [] if self.truncated else entries
+
+    def _entries(self) -> List[Tuple[str, str]]:
+        entries = []
+        for _, element in self._parser.read_events():
+            name = _local_name(element.tag)
+            if name == 'loc':
+                parent = element.getparent()
+                kind = _local_name(parent.tag) if parent is not None else ''
+                loc = (element.text or '').strip()
+                if loc and kind in ('url', 'sitemap'):
+                    entries.append(('url' if kind == 'url' else 'sitemap', loc))
+            elif name in ('url', 'sitemap'):
+                # Drop finished entries and everything before them
+                element.clear()
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+        return entries
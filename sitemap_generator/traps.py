@@ -0,0 +1,169 @@
+"""
+Crawl trap detection for the crawler.
+Cheap per-URL heuristics for URL spaces that never end: repeated path
+segments, query strings multiplying on one path, and link chains that
+keep descending through the same URL pattern.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Reasons reported for pruned URLs
+REPEATED_SEGMENT = 'repeated path segment'
+QUERY_EXPLOSION = 'too many query variants'
+PATTERN_TOO_DEEP = 'pattern too deep'
+
+_DIGITS = re.compile(r'\d+')
+
+
+def url_template(url: str) -> str:
+    """
+    Pattern shared by URLs that differ only in numbers and query values.
+
+    'https://example.com/cal/2024/05?month=5&view=list'
+    -> 'example.com/cal/*/*?month&view'
+    """
+    parts = urlsplit(url)
+    template = parts.netloc.lower() + _DIGITS.sub('*', parts.path or '/')
+    if parts.query:
+        names = sorted({pair.split('=', 1)[0] for pair in parts.query.split('&') if pair})
+        template += '?' + '&'.join(names)
+    return template
+
+
+@dataclass
+class PrunedPattern:
+    """A URL pattern the trap detector stopped following."""
+    pattern: str
+    reason: str
+    count: int
+    example: str
+
+
+class TrapDetector:
+    """
+    Decides, once per newly discovered URL, whether it leads into a trap.
+
+    - Path repetition: a path ending in the same run of two or more
+      segments twice, or with a segment occurring more than
+      max_segment_repeats times, as when relative links resolve against
+      the wrong base (/docs/a/b/a/b/, /docs/more/more/more/).
+    - Query explosion: more than max_query_variants distinct value
+      combinations of two or more parameters on one url_template()
+      (faceted navigation, sort and filter permutations). Queries with a
+      single parameter are never counted, so a catalogue such as
+      /product.php?id=N is followed in full; endless single-parameter
+      chains such as ?month=N are left to the pattern depth check.
+    - Pattern depth: more than max_pattern_depth link hops below the
+      shallowest URL of the same url_template(), as with "next page" or
+      "next month" links that never end.
+
+    Each check is a few dict operations, and state grows with the number
+    of distinct paths and templates rather than URLs. A limit of None
+    turns its heuristic off.
+
+    Usage:
+        traps = TrapDetector()
+        if traps.check(url, depth) is None:
+            queue.put_nowait((url, depth))
+        for entry in traps.report():
+            print(entry.pattern, entry.reason, entry.count)
+    """
+
+    def __init__(
+        self,
+        max_segment_repeats: Optional[int] = 2,
+        max_query_variants: Optional[int] = 1000,
+        max_pattern_depth: Optional[int] = 20
+    ):
+        """
+        Args:
+            max_segment_repeats: Times one path segment may occur in a path
+            max_query_variants: Distinct multi-parameter queries followed
+                per url_template()
+            max_pattern_depth: Link hops followed below the shallowest URL
+                of a template
+        """
+        for name, limit in (
+            ('max_segment_repeats', max_segment_repeats),
+            ('max_query_variants', max_query_variants),
+            ('max_pattern_depth', max_pattern_depth)
+        ):
+            if limit is not None and limit < 1:
+                raise ValueError(f"{name} must be at least 1 or None, got {limit!r}")
+
+        self.max_segment_repeats = max_segment_repeats
+        self.max_query_variants = max_query_variants
+        self.max_pattern_depth = max_pattern_depth
+        # template -> multi-parameter queries followed
+        self._query_variants: Dict[str, int] = {}
+        # template -> shallowest depth seen
+        self._pattern_depth: Dict[str, int] = {}
+        self._pruned: Dict[Tuple[str, str], PrunedPattern] = {}
+
+    def check(self, url: str, depth: int) -> Optional[str]:
+        """
+        Return why url looks like a trap, or None if it should be followed.
+
+        Call once per URL, when it is first discovered: followed URLs
+        count towards the limits.
+        """
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        path = parts.path or '/'
+
+        trap = self._repeated_segment(host, path)
+        template = None
+        if trap is None and self.max_pattern_depth is not None:
+            template = url_template(url)
+            shallowest = self._pattern_depth.get(template)
+            if shallowest is None or depth < shallowest:
+                self._pattern_depth[template] = depth
+            elif depth - shallowest > self.max_pattern_depth:
+                trap = PATTERN_TOO_DEEP, template
+        if trap is None and '&' in parts.query and self.max_query_variants is not None:
+            template = template or url_template(url)
+            # One name means one parameter repeated (?id=1&id=2), not a combination
+            if '&' in template:
+                variants = self._query_variants.get(template, 0)
+                if variants >= self.max_query_variants:
+                    trap = QUERY_EXPLOSION, template
+                else:
+                    self._query_variants[template] = variants + 1
+
+        if trap is None:
+            return None
+        reason, pattern = trap
+        entry = self._pruned.get(trap)
+        if entry is None:
+            self._pruned[trap] = PrunedPattern(pattern, reason, 1, url)
+        else:
+            entry.count += 1
+        return reason
+
+    def _repeated_segment(self, host: str, path: str) -> Optional[Tuple[str, str]]:
+        # Too few segments for either kind of repetition
+        if self.max_segment_repeats is None or path.count('/') <= min(3, self.max_segment_repeats):
+            return None
+        segments = [segment for segment in path.split('/') if segment]
+
+        # Relative-link loops grow at the end of the path; a single segment
+        # repeated once (/2024/02/02) is common in real URLs, so runs of two
+        # or more count immediately and single segments only past the limit
+        for length in range(2, len(segments) // 2 + 1):
+            if segments[-length:] == segments[-2 * length:-length]:
+                run = _DIGITS.sub('*', '/'.join(segments[-length:]))
+                return REPEATED_SEGMENT, f"{host}/.../{run}/{run}/..."
+
+        counts: Dict[str, int] = {}
+        for segment in segments:
+            count = counts[segment] = counts.get(segment, 0) + 1
+            if count > self.max_segment_repeats:
+                return REPEATED_SEGMENT, f"{host}/.../{_DIGITS.sub('*', segment)}/..."
+        return None
+
+    def report(self) -> List[PrunedPattern]:
+        """Patterns pruned so far, most URLs first."""
+        return sorted(self._pruned.values(), key=lambda entry: -entry.count)
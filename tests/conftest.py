@@ -0,0 +1,55 @@
+"""Shared fixtures: the package and the benchmark test site on sys.path."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.testsite import TestSite  # noqa: E402
+from sitemap_generator.crawler import AsyncCrawler  # noqa: E402
+
+# Not a test class, despite the name
+TestSite.__test__ = False
+
+
+def _run_crawls(site: TestSite, option_sets):
+    async def main():
+        base_url = await site.start()
+        try:
+            results = []
+            for options in option_sets:
+                options = {'crawl_delay': 0, 'respect_robots_txt': False, **options}
+                crawler = AsyncCrawler(base_url, **options)
+                pages = await crawler.crawl()
+                results.append((crawler, pages))
+            return results
+        finally:
+            await site.stop()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def crawl():
+    """
+    Crawl a benchmarks TestSite and return the crawler and its pages.
+
+    Usage:
+        crawler, pages = crawl(TestSite(num_pages=20), max_depth=3)
+    """
+    return lambda site, **options: _run_crawls(site, [options])[0]
+
+
+@pytest.fixture
+def crawl_twice():
+    """
+    Crawl the same TestSite twice, e.g. to recrawl or resume, and return
+    both (crawler, pages) results.
+
+    Usage:
+        first, second = crawl_twice(site, {'max_urls': 10}, {'resume': True})
+    """
+    return lambda site, first, second: _run_crawls(site, [first, second])
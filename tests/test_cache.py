@@ -0,0 +1,40 @@
+"""Tests for incremental recrawls with conditional requests."""
+
+from operator import attrgetter
+
+from benchmarks.testsite import TestSite
+from sitemap_generator.cache import CacheEntry, ValidatorStore
+
+url = attrgetter('url')
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / 'validators.sqlite')
+    store = ValidatorStore(path)
+    entry = CacheEntry(
+        etag='"v1"', last_modified='Wed, 21 Oct 2015 07:28:00 GMT', content_hash='abc',
+        title='Home', links=['https://example.com/a'], images=[], canonical=None
+    )
+    store.put('https://example.com/', entry)
+    store.close()
+
+    store = ValidatorStore(path)
+    assert len(store) == 1
+    assert store.get('https://example.com/') == entry
+    assert store.get('https://example.com/missing') is None
+    assert entry.conditional_headers() == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+    }
+    store.close()
+
+
+def test_recrawl_reuses_unchanged_pages(tmp_path, crawl_twice):
+    site = TestSite(num_pages=50)
+    options = {'max_depth': 10, 'validator_store': str(tmp_path / 'validators.sqlite')}
+    (first, first_pages), (second, second_pages) = crawl_twice(site, options, options)
+
+    assert first.stats['urls_not_modified'] == 0
+    # Every page answered 304; links and titles came from the store
+    assert second.stats['urls_not_modified'] == len(second_pages) == len(first_pages) == 51
+    assert site.not_modified == 51
+    assert sorted(first_pages, key=url) == sorted(second_pages, key=url)
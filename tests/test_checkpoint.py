@@ -0,0 +1,18 @@
+"""Tests for resuming a crawl from its checkpoint."""
+
+from benchmarks.testsite import TestSite
+
+
+def test_resume_finishes_without_refetching(crawl_twice, tmp_path):
+    site = TestSite(num_pages=60)
+    path = str(tmp_path / 'crawl.sqlite')
+    (first, first_pages), (second, second_pages) = crawl_twice(
+        site,
+        {'max_urls': 10, 'checkpoint_path': path},
+        {'checkpoint_path': path, 'resume': True}
+    )
+    urls = {page.url for page in second_pages}
+    assert len(first_pages) < 61
+    assert len(second_pages) == len(urls) == 61
+    assert {page.url for page in first_pages} <= urls
+    assert first.stats['requests_sent'] + second.stats['requests_sent'] == site.requests == 61
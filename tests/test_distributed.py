@@ -0,0 +1,64 @@
+"""Tests for the distributed crawl coordinator and its partition workers."""
+
+import asyncio
+
+from benchmarks.testsite import TestSite
+from sitemap_generator.distributed import Channel, CrawlCoordinator, PartitionCrawler
+
+
+class LocalChannel(Channel):
+    """Channel to a PartitionCrawler running in the test's event loop."""
+
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+
+    async def recv(self):
+        return await self.inbox.get()
+
+
+def test_workers_share_the_budget():
+    async def main():
+        site = TestSite(num_pages=2000)
+        url = await site.start()
+        try:
+            coordinator = CrawlCoordinator(
+                url, num_workers=2, max_urls=100, max_depth=50, concurrency=5,
+                crawl_delay=0, respect_robots_txt=False
+            )
+            pages = await coordinator.crawl()
+            return site, pages
+        finally:
+            await site.stop()
+
+    site, pages = asyncio.run(main())
+    assert len(pages) == len({page.url for page in pages}) == 100
+    # Only requests already in flight when a worker used up its share overshoot
+    assert site.requests <= 100 + 2 * 5
+
+
+def test_stop_interrupts_a_busy_worker():
+    async def main():
+        site = TestSite(num_pages=200, latency=0.1)
+        url = await site.start()
+        try:
+            channel = LocalChannel()
+            crawler = PartitionCrawler(
+                0, 1, channel, url, concurrency=2, crawl_delay=0, respect_robots_txt=False
+            )
+            crawl = asyncio.create_task(crawler.crawl())
+            channel.inbox.put_nowait(('urls', [(f'{url}page/{n}', 1) for n in range(200)]))
+            await asyncio.sleep(0.3)
+            channel.inbox.put_nowait(('stop', None))
+            await asyncio.wait_for(crawl, 2.0)
+            return site, channel.sent
+        finally:
+            await site.stop()
+
+    site, sent = asyncio.run(main())
+    assert site.requests < 20
+    assert not any(kind == 'idle' for kind, _ in sent)
+    assert sum(len(payload) for kind, payload in sent if kind == 'pages') > 0
@@ -0,0 +1,191 @@
+"""Tests for the streaming sitemap writers and the exporter."""
+
+import gzip
+import os
+import random
+from xml.dom import minidom
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+import pytest
+
+from sitemap_generator.crawler import PageInfo
+from sitemap_generator.exporter import (
+    NS_IMAGE, NS_SITEMAP, ShardedSitemapWriter, SitemapExporter, SitemapSink, _entry_sizes,
+    _plan_shards, write_sitemap, write_sitemap_index
+)
+
+PAGES = [
+    PageInfo(url='https://example.com/'),
+    PageInfo(
+        url="https://example.com/a?x=1&y='2'\"<>", lastmod='2024-01-01', priority=0.8,
+        changefreq='daily', images=('https://example.com/i.png?a=1&b=2',)
+    ),
+    PageInfo(url='https://example.com/café/日本', priority=0.33),
+    PageInfo(url='https://example.com/b', images=('https://example.com/1.png', '/2.png')),
+]
+
+
+def escape(text):
+    return (text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;').replace("'", '&apos;'))
+
+
+def prettify(elem):
+    pretty = minidom.parseString(tostring(elem, encoding='unicode')).toprettyxml(indent='  ')
+    return '\n'.join(line for line in pretty.split('\n') if line.strip())
+
+
+def dom_sitemap(pages, include_images):
+    """The DOM-based export_xml the streaming writer replaced, as reference."""
+    urlset = Element('urlset')
+    urlset.set('xmlns', NS_SITEMAP)
+    if include_images:
+        urlset.set('xmlns:image', NS_IMAGE)
+    for page in pages:
+        url = SubElement(urlset, 'url')
+        SubElement(url, 'loc').text = escape(page.url)
+        if page.lastmod:
+            SubElement(url, 'lastmod').text = page.lastmod
+        SubElement(url, 'changefreq').text = page.changefreq
+        SubElement(url, 'priority').text = f'{page.priority:.1f}'
+        if include_images:
+            for image_url in page.images[:1000]:
+                image = SubElement(url, f'{{{NS_IMAGE}}}image')
+                SubElement(image, f'{{{NS_IMAGE}}}loc').text = escape(image_url)
+    return prettify(urlset)
+
+
+def dom_index(sitemaps, base_url):
+    index = Element('sitemapindex')
+    index.set('xmlns', NS_SITEMAP)
+    for filename, lastmod in sitemaps:
+        sitemap = SubElement(index, 'sitemap')
+        SubElement(sitemap, 'loc').text = f'{base_url}/{filename}'
+        if lastmod:
+            SubElement(sitemap, 'lastmod').text = lastmod
+    return prettify(index)
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('pages', [PAGES, PAGES[:1], PAGES[2:3], []])
+@pytest.mark.parametrize('include_images', [False, True])
+def test_sitemap_matches_dom_exporter(tmp_path, pages, include_images):
+    path = str(tmp_path / 'sitemap.xml')
+    SitemapExporter(pages, 'https://example.com').export_xml(path, include_images=include_images)
+    expected = dom_sitemap(sorted(pages, key=lambda page: page.url), include_images)
+    assert read(path) == expected
+
+
+def test_index_matches_dom_exporter(tmp_path):
+    base_url = "https://example.com/a&b'c\"d<e"
+    for sitemaps in ([('sitemap_1.xml', '2024-01-01'), ('s&2.xml', None)], []):
+        path = str(tmp_path / 'index.xml')
+        write_sitemap_index(sitemaps, path, base_url)
+        assert read(path) == dom_index(sitemaps, base_url)
+
+
+def test_gzip_output(tmp_path):
+    path = write_sitemap(PAGES, str(tmp_path / 'sitemap.xml.gz'), gzip_compress=True)
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert f.read() == dom_sitemap(PAGES, False)
+    assert os.path.getsize(path) < len(dom_sitemap(PAGES, False))
+
+
+def many_pages(count):
+    # Varying lengths, so byte limits fall at irregular points
+    return [PageInfo(url=f'https://example.com/{"x" * (i % 37)}/{i}') for i in range(count)]
+
+
+def shard_bytes(paths):
+    contents = []
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            contents.append((os.path.basename(path), f.read()))
+    return contents
+
+
+@pytest.mark.parametrize('bytes_per_file', [None, 20000])
+@pytest.mark.parametrize('gzip_compress', [False, True])
+def test_parallel_export_matches_sequential(tmp_path, bytes_per_file, gzip_compress):
+    exporter = SitemapExporter(many_pages(2500), 'https://example.com')
+    results = []
+    for workers in (1, 3):
+        paths = exporter.export_sitemap_index(
+            str(tmp_path / str(workers)), urls_per_file=400, gzip_compress=gzip_compress,
+            workers=workers, bytes_per_file=bytes_per_file
+        )
+        # The index differs only in its lastmod timestamps
+        results.append(shard_bytes(paths[1:]))
+    assert results[0] == results[1]
+    assert len(results[0]) >= 7
+
+
+@pytest.mark.parametrize('max_urls, max_bytes', [(50000, 5000), (100, 5000), (30, 100000)])
+def test_shards_roll_over_before_limits(tmp_path, max_urls, max_bytes):
+    pages = many_pages(1000)
+    with ShardedSitemapWriter(
+        lambda shard_num: str(tmp_path / f'sitemap_{shard_num}.xml'),
+        max_urls=max_urls, max_bytes=max_bytes
+    ) as writer:
+        for page in pages:
+            writer.write(page)
+
+    written = []
+    for path in writer.paths:
+        content = read(path)
+        size = len(content.encode('utf-8'))
+        urls = content.count('<url>')
+        assert size <= max_bytes and urls <= max_urls
+        # Each shard is a complete sitemap of the pages in order
+        assert content == dom_sitemap(pages[len(written):len(written) + urls], False)
+        written += pages[len(written):len(written) + urls]
+        # ...and is only closed when the next entry would not fit
+        if len(written) < len(pages):
+            shard_and_next = pages[len(written) - urls:len(written) + 1]
+            next_path = write_sitemap(shard_and_next, str(tmp_path / 'next.xml'))
+            assert urls == max_urls or os.path.getsize(next_path) > max_bytes
+    assert written == pages
+
+    sizes = _entry_sizes(pages)
+    assert _plan_shards(sizes, max_urls, max_bytes) == [
+        read(path).count('<url>') for path in writer.paths
+    ]
+
+
+def test_oversized_entry_gets_its_own_shard(tmp_path):
+    pages = [PageInfo(url='https://example.com/' + 'x' * 500), *many_pages(3)]
+    with ShardedSitemapWriter(lambda n: str(tmp_path / f'{n}.xml'), max_bytes=600) as writer:
+        for page in pages:
+            writer.write(page)
+    assert [read(path).count('<url>') for path in writer.paths] == [1, 3]
+
+
+@pytest.mark.parametrize('run_size', [1, 97, 5000])
+def test_sorted_sink_matches_exporter(tmp_path, run_size):
+    pages = many_pages(1000)
+    pages[5] = PAGES[1]
+    shuffled = random.Random(2).sample(pages, len(pages))
+    runs = tmp_path / 'runs'
+    runs.mkdir()
+    sink = SitemapSink(
+        str(tmp_path / 'sink'), 'https://example.com', urls_per_file=300, gzip_compress=False,
+        sort=True, run_size=run_size, temp_dir=str(runs)
+    )
+    for page in shuffled:
+        sink.write(page)
+    # Full runs are spooled to disk as they fill up
+    spooled = [name for run_dir in runs.iterdir() for name in os.listdir(run_dir)]
+    assert len(spooled) == len(pages) // run_size
+    paths = sink.close()
+    assert list(runs.iterdir()) == []
+
+    expected = SitemapExporter(pages, 'https://example.com').export_sitemap_index(
+        str(tmp_path / 'exporter'), urls_per_file=300, gzip_compress=False
+    )
+    assert shard_bytes(paths[1:]) == shard_bytes(expected[1:])
+    assert sink.url_count == len(pages)
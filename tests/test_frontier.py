@@ -0,0 +1,144 @@
+"""Tests for crawl frontiers and seen stores."""
+
+import asyncio
+import random
+
+import pytest
+
+from sitemap_generator.frontier import (
+    FrontierQueue, HostFrontier, MemoryFrontier, PriorityFrontier, SQLiteFrontier,
+    SQLitePriorityFrontier, SQLiteSeenStore
+)
+
+
+def drain(frontier):
+    items = []
+    while True:
+        item = frontier.pop()
+        if item is None:
+            return items
+        items.append(item)
+
+
+def score(url, depth, inlinks):
+    return -depth + 0.1 * inlinks.bit_length()
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 1000])
+def test_sqlite_frontier_is_fifo(tmp_path, batch_size):
+    frontier = SQLiteFrontier(str(tmp_path / 'frontier.sqlite'), batch_size=batch_size)
+    items = [(f'http://example.com/{i}', i % 4) for i in range(50)]
+    for item in items[:20]:
+        frontier.put(item)
+    popped = [frontier.pop() for _ in range(5)]
+    for item in items[20:]:
+        frontier.put(item)
+    assert len(frontier) == 45
+    assert popped + drain(frontier) == items
+    assert len(frontier) == 0
+    frontier.close()
+
+
+def test_sqlite_stores_start_empty(tmp_path):
+    path = str(tmp_path / 'seen.sqlite')
+    seen = SQLiteSeenStore(path)
+    seen.update(['a', 'b', 'a'])
+    assert len(seen) == 2 and 'a' in seen and 'c' not in seen
+    seen.close()
+    assert len(SQLiteSeenStore(path)) == 0
+
+    path = str(tmp_path / 'frontier.sqlite')
+    frontier = SQLiteFrontier(path, batch_size=1)
+    for i in range(5):
+        frontier.put((str(i), 0))
+    frontier.close()
+    assert len(SQLiteFrontier(path)) == 0
+
+
+@pytest.mark.parametrize('kind', ['memory', 'sqlite'])
+def test_priority_frontier_pops_best_first(tmp_path, kind):
+    rnd = random.Random(1)
+    for trial in range(20):
+        if kind == 'memory':
+            frontier = PriorityFrontier(score)
+        else:
+            path = str(tmp_path / f'frontier-{trial}.sqlite')
+            frontier = SQLitePriorityFrontier(path, score, batch_size=rnd.choice([1, 3, 10]))
+        # url -> [depth, inlinks]; inlinks are only tracked by the in-memory frontier
+        queued = {}
+        for step in range(600):
+            op = rnd.random()
+            if op < 0.45:
+                url = f'{trial}-{step}'
+                depth = rnd.randint(0, 5)
+                frontier.put((url, depth))
+                queued[url] = [depth, 1]
+            elif op < 0.7 and queued:
+                url = rnd.choice(list(queued))
+                frontier.add_inlink(url)
+                if kind == 'memory':
+                    queued[url][1] += 1
+            else:
+                item = frontier.pop()
+                if not queued:
+                    assert item is None
+                    continue
+                best = max(score(url, depth, inlinks) for url, (depth, inlinks) in queued.items())
+                url, depth = item
+                if kind == 'memory':
+                    assert score(url, *queued[url]) == best
+                else:
+                    assert score(url, depth, 1) >= max(
+                        score(other, d, 1) for other, (d, _) in queued.items()
+                    )
+                del queued[url]
+            assert len(frontier) == len(queued)
+        assert sorted(url for url, _ in drain(frontier)) == sorted(queued)
+        assert len(frontier) == 0
+        frontier.close()
+
+
+def test_host_frontier_round_robin_and_release():
+    frontier = HostFrontier(lambda host: MemoryFrontier(), host_limit=2)
+    for i in range(3):
+        frontier.put((f'http://a.com/{i}', 0))
+    frontier.put(('http://b.com/0', 0))
+    assert frontier.hosts == ['a.com', 'b.com']
+    assert len(frontier) == 4
+
+    first = [frontier.pop() for _ in range(3)]
+    assert first == [('http://a.com/0', 0), ('http://b.com/0', 0), ('http://a.com/1', 0)]
+    # a.com has two items checked out; nothing else is queued
+    assert frontier.pop() is None
+    frontier.release(first[0])
+    assert frontier.pop() == ('http://a.com/2', 0)
+    assert len(frontier) == 0 and frontier.pop() is None
+
+
+def test_host_frontier_skips_hosts_not_due():
+    due = {'slow.com': 0.5, 'fast.com': 0.0}
+    frontier = HostFrontier(lambda host: MemoryFrontier(), due=due.__getitem__)
+    for i in range(2):
+        frontier.put((f'http://slow.com/{i}', 0))
+        frontier.put((f'http://fast.com/{i}', 0))
+    assert drain(frontier) == [('http://fast.com/0', 0), ('http://fast.com/1', 0)]
+    assert frontier.next_due() == 0.5
+    due['slow.com'] = 0.0
+    assert drain(frontier) == [('http://slow.com/0', 0), ('http://slow.com/1', 0)]
+
+
+def test_queue_waits_for_due_host():
+    async def run():
+        ready_at = asyncio.get_running_loop().time() + 0.05
+        queue = FrontierQueue(HostFrontier(
+            lambda host: MemoryFrontier(),
+            due=lambda host: ready_at - asyncio.get_running_loop().time()
+        ))
+        queue.put_nowait(('http://slow.com/', 0))
+        item = await asyncio.wait_for(queue.get(), 1.0)
+        assert asyncio.get_running_loop().time() >= ready_at
+        queue.task_done(item)
+        await asyncio.wait_for(queue.join(), 1.0)
+        return item
+
+    assert asyncio.run(run()) == ('http://slow.com/', 0)
@@ -0,0 +1,47 @@
+"""Tests for URL normalization."""
+
+import pytest
+
+from sitemap_generator.normalize import URLNormalizer
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Example.COM:443/a/?utm_source=x&b=2&a=1', 'https://example.com/a/?a=1&b=2'),
+    ('http://example.com:8080', 'http://example.com:8080/'),
+    ('http://example.com/?', 'http://example.com/'),
+    ('http://example.com/page#section', 'http://example.com/page'),
+    ('http://example.com/%7euser/%2f', 'http://example.com/~user/%2F'),
+    ('http://example.com/docs/index.html', 'http://example.com/docs/'),
+    ('http://example.com/?gclid=1&UTM_Medium=2', 'http://example.com/'),
+    ('http://user@Example.com/', 'http://user@example.com/'),
+    ('http://[::1]:80/', 'http://[::1]/'),
+    ('mailto:someone@example.com', 'mailto:someone@example.com'),
+    ('http://example.com:port/', 'http://example.com:port/'),
+])
+def test_normalize(url, expected):
+    assert URLNormalizer().normalize(url) == expected
+
+
+def test_options():
+    url = 'http://example.com/a/b?z=1&ref=x&a=2'
+    assert URLNormalizer(sort_query=False).normalize(url) == url
+    assert URLNormalizer(strip_params=['ref']).normalize(url) == 'http://example.com/a/b?a=2&z=1'
+
+    add = URLNormalizer(trailing_slash='add')
+    assert add.normalize('http://example.com/a') == 'http://example.com/a/'
+    assert add.normalize('http://example.com/a.html') == 'http://example.com/a.html'
+    strip = URLNormalizer(trailing_slash='strip')
+    assert strip.normalize('http://example.com/a/') == 'http://example.com/a'
+    assert strip.normalize('http://example.com/') == 'http://example.com/'
+
+
+def test_idempotent():
+    normalizer = URLNormalizer(trailing_slash='strip')
+    for url in ('HTTP://A.com/x/index.htm?b=%41&a', 'https://a.com:443//x//?utm_id=1'):
+        once = normalizer.normalize(url)
+        assert normalizer.normalize(once) == once
+
+
+def test_bad_trailing_slash():
+    with pytest.raises(ValueError):
+        URLNormalizer(trailing_slash='sometimes')
@@ -0,0 +1,99 @@
+"""Tests for HTML parsing: the streaming lxml engine against BeautifulSoup."""
+
+from urllib.parse import urlsplit
+
+import pytest
+
+from benchmarks.testsite import TestSite
+from sitemap_generator.parser import HostAllowlist, parse_html, resolve_link
+
+PAGES = [
+    b"""<html><head><title> Home &amp; Garden </title>
+    <link rel="Canonical stylesheet" href=" /home ">
+    </head><body>
+    <a href="/a">A</a> <a href="b?x=1#frag">B</a> <a href="#top">Top</a>
+    <a href="https://other.com/x">Other</a> <a href="mailto:x@example.com">Mail</a>
+    <a href="javascript:void(0)">JS</a> <a>No href</a>
+    <img src="/logo.png"><img src="https://cdn.com/x.png">
+    </body></html>""",
+    # Unclosed tags, a title in the body and upper-case markup
+    b"<HTML><BODY><P><A HREF='/x'>x<P><A HREF=/y>y<TITLE>Late</TITLE><IMG SRC=i.gif>",
+    b"",
+]
+
+# Not UTF-8; only decodable with the charset from the Content-Type header
+LATIN_1_PAGE = (
+    '<html><head><title>Caf\xe9</title></head><body><a href="/caf\xe9">x</a></body></html>'
+).encode('iso-8859-1')
+
+
+@pytest.mark.parametrize('body, encoding', [
+    *((body, encoding) for body in PAGES for encoding in (None, 'utf-8')),
+    (LATIN_1_PAGE, 'iso-8859-1'),
+])
+def test_engines_agree(body, encoding):
+    results = [
+        parse_html(
+            body, 'https://example.com/dir/page', 'example.com', encoding=encoding,
+            last_modified='Wed, 21 Oct 2015 07:28:00 GMT', include_images=True, engine=engine
+        )
+        for engine in ('bs4', 'lxml')
+    ]
+    assert results[0] == results[1]
+    if body == LATIN_1_PAGE:
+        assert results[1].title == 'Caf\xe9'
+
+
+def test_extracted_data():
+    result = parse_html(
+        PAGES[0], 'https://example.com/dir/page', 'example.com', include_images=True, engine='lxml'
+    )
+    assert result.title == 'Home & Garden'
+    assert result.links == {'https://example.com/a', 'https://example.com/dir/b?x=1'}
+    assert result.images == ['https://example.com/logo.png']
+    assert result.canonical == 'https://example.com/home'
+
+    allowlist = HostAllowlist(['example.com', '*.other.com', 'other.com'])
+    result = parse_html(PAGES[0], 'https://example.com/', allowlist, engine='lxml')
+    assert 'https://other.com/x' in result.links
+
+
+@pytest.mark.parametrize('href, expected', [
+    ('https://example.com:443/x', 'https://example.com:443/x'),
+    ('HTTP://Example.com:80/', 'http://Example.com:80/'),
+    ('//EXAMPLE.COM/y#z', 'https://EXAMPLE.COM/y'),
+    ('http://example.com:443/', None),
+    ('https://example.com:8443/', None),
+    ('https://example.com.evil.net/', None),
+])
+def test_resolve_link_ignores_case_and_default_ports(href, expected):
+    assert resolve_link(href, 'https://example.com/', 'example.com') == expected
+    allowlist = HostAllowlist(['Example.com'])
+    assert resolve_link(href, 'https://example.com/', allowlist) == expected
+
+
+def test_unknown_charset_falls_back_to_detection():
+    for engine in ('bs4', 'lxml'):
+        result = parse_html(
+            PAGES[0], 'https://example.com/', 'example.com', encoding='utf8mb4', engine=engine
+        )
+        assert result.title == 'Home & Garden'
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        parse_html(b'', 'https://example.com/', 'example.com', engine='regex')
+
+
+def summary(pages):
+    """Path and title of every page; each crawl is served from its own port."""
+    return {(urlsplit(page.url).path, page.title) for page in pages}
+
+
+@pytest.mark.parametrize('options', [{'parse_workers': 2}, {'parser': 'lxml'}])
+def test_crawl_matches_inline_bs4(crawl, options):
+    _, expected = crawl(TestSite(num_pages=60), max_depth=10)
+    _, pages = crawl(TestSite(num_pages=60), max_depth=10, **options)
+    # The homepage and /page/0 are both page 0
+    assert len(pages) == 61
+    assert summary(pages) == summary(expected)
@@ -0,0 +1,54 @@
+"""Tests for the per-host adaptive rate limiter."""
+
+import asyncio
+
+from sitemap_generator.ratelimit import HostLimiter, RateLimiter, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT', now=1445412470.0) == 10.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_pacing():
+    limiter = HostLimiter(rate=2.0)
+    assert limiter.due(0.0) == 0.0
+    assert limiter.reserve(0.0)[0] == 0.0
+    assert limiter.due(0.0) == 0.5
+    assert limiter.reserve(0.0)[0] == 0.5
+    limiter.set_crawl_delay(1.0)
+    assert limiter.rate == 1.0
+
+
+def record_all(statuses, retry_after=None):
+    async def run():
+        limiter = RateLimiter(delay=0.1)
+        for status in statuses:
+            ticket = await limiter.acquire('example.com')
+            limiter.record('example.com', ticket, status, 0.01, retry_after)
+        return limiter
+
+    return asyncio.run(run())
+
+
+def test_transient_errors_do_not_cut_the_rate():
+    limiter = record_all([200, 503, 200, 500, 200, None, 200])
+    assert limiter.stats['rate_decreases'] == 0
+    assert limiter.hosts['example.com'].rate > 10.0
+
+
+def test_overload_cuts_the_rate():
+    assert record_all([429]).stats['rate_decreases'] == 1
+    assert record_all([503], retry_after='1').stats['rate_decreases'] == 1
+    assert record_all([503, 502, None]).stats['rate_decreases'] == 1
+
+
+def test_rate_recovers_after_an_error_cut():
+    limiter = HostLimiter(rate=10.0)
+    limiter.decrease(limiter.generation, 0.0, recover=True)
+    assert limiter.rate == 5.0
+    for _ in range(15):
+        limiter.on_success(0.01, limiter.generation, 0.0)
+    assert limiter.rate == 10.0
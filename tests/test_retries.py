@@ -0,0 +1,62 @@
+"""Tests for retrying failed fetches and dead-lettering URLs."""
+
+import asyncio
+
+from aiohttp import web
+
+from benchmarks.testsite import TestSite
+from sitemap_generator.crawler import AsyncCrawler
+
+
+def test_transient_errors_are_retried(crawl):
+    site = TestSite(num_pages=60, error_rate=0.3)
+    crawler, pages = crawl(site, max_retries=8, retry_backoff=0.01)
+    assert len(pages) == 61
+    assert crawler.dead_letters == []
+    assert crawler.stats['retries'] == site.errors > 0
+
+
+def test_failures_are_dead_lettered(crawl):
+    site = TestSite(num_pages=60, error_rate=0.3)
+    crawler, pages = crawl(site, max_retries=0)
+    assert crawler.stats['retries'] == 0
+    assert len(crawler.dead_letters) == site.errors > 0
+    for failed in crawler.dead_letters:
+        assert (failed.reason, failed.attempts) == ('HTTP 503', 1)
+    assert not {page.url for page in pages} & {failed.url for failed in crawler.dead_letters}
+
+
+def test_body_timeout_is_recorded_once():
+    async def stall(request):
+        resp = web.StreamResponse(headers={'Content-Type': 'text/html'})
+        await resp.prepare(request)
+        await resp.write(b'<html><head><title>slow')
+        await asyncio.sleep(2)
+        return resp
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/', stall)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            crawler = AsyncCrawler(
+                f'http://127.0.0.1:{port}/', timeout=0.2, max_retries=0,
+                crawl_delay=0, respect_robots_txt=False
+            )
+            outcomes = []
+            record = crawler.rate_limiter.record
+            crawler.rate_limiter.record = lambda host, ticket, status, *args: (
+                outcomes.append(status), record(host, ticket, status, *args)
+            )
+            await crawler.crawl()
+            return crawler, outcomes
+        finally:
+            await runner.cleanup()
+
+    crawler, outcomes = asyncio.run(main())
+    assert outcomes == [200]
+    assert [failed.reason for failed in crawler.dead_letters] == ['Timeout']
@@ -0,0 +1,97 @@
+"""Tests for compiled robots.txt matching."""
+
+import random
+import re
+
+from sitemap_generator.robots import RobotsCache, RobotsRules
+
+USER_AGENT = 'FreeSitemapGenerator/3.0 (+https://github.com/jtgsystems/free-sitemap-generator)'
+
+ROBOTS_TXT = """\
+# Comment
+User-agent: *
+Disallow: /private/
+Allow: /private/public
+Disallow: /*.pdf$
+Disallow: /search?q=
+Allow: /p
+Disallow: /
+Crawl-delay: 0.5
+
+User-agent: FreeSitemapGenerator
+user-agent: other
+Disallow: /tmp
+Allow: /tmp/ok$
+Disallow: /*/print
+Allow: /a%3cb
+Request-rate: 2/1s
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+def reference_can_fetch(rules, path):
+    """Brute force RFC 9309: longest matching pattern wins, Allow wins a tie."""
+    best_length, allowed = -1, True
+    for pattern, allow in rules:
+        anchored = pattern.endswith('$')
+        body = pattern[:-1] if anchored else pattern
+        regex = '.*'.join(re.escape(part) for part in body.split('*')) + (r'\Z' if anchored else '')
+        if re.match(regex, path):
+            if len(pattern) > best_length or (len(pattern) == best_length and allow):
+                best_length, allowed = len(pattern), allow
+    return allowed
+
+
+def test_named_group():
+    rules = RobotsRules.parse(ROBOTS_TXT.splitlines(), USER_AGENT)
+    assert rules.crawl_delay == 0.5
+    assert rules.sitemaps == ['https://example.com/sitemap.xml']
+    for path, allowed in (
+        ('/tmp', False), ('/tmp/ok', True), ('/tmp/ok2', False), ('/x/print', False),
+        ('/print', True), ('/a<b', True), ('/robots.txt', True), ('/', True)
+    ):
+        assert rules.can_fetch('http://example.com' + path) is allowed, path
+
+
+def test_wildcard_group():
+    rules = RobotsRules.parse(ROBOTS_TXT.splitlines(), 'Mozilla/5.0')
+    assert rules.crawl_delay == 0.5
+    for path, allowed in (
+        ('/private/x', False), ('/private/public/1', True), ('/doc.pdf', False),
+        ('/doc.pdf?x', False), ('/doc.pdfx', False), ('/p', True), ('/pq.pdf', False),
+        ('/search?q=1', False), ('/z', False), ('/robots.txt', True)
+    ):
+        assert rules.can_fetch('http://example.com' + path) is allowed, path
+
+
+def test_disallow_all():
+    rules = RobotsRules(disallow_all=True)
+    assert not rules.can_fetch('http://example.com/')
+
+
+def test_matches_brute_force_reference():
+    rnd = random.Random(3)
+    segments = ['a', 'b', 'ab', 'x.pdf', 'q?x=1', 'c/d']
+
+    def pattern():
+        text = '/' + ''.join(rnd.choice(segments + ['*', '/']) for _ in range(rnd.randrange(4)))
+        return text + '$' if rnd.random() < 0.3 else text
+
+    for _ in range(300):
+        rules = [(pattern(), rnd.random() < 0.4) for _ in range(rnd.randrange(1, 30))]
+        compiled = RobotsRules(rules, cache_size=0)
+        for _ in range(200):
+            path = '/' + ''.join(rnd.choice(segments + ['/']) for _ in range(rnd.randrange(6)))
+            if path == '/robots.txt':
+                continue
+            expected = reference_can_fetch(rules, path)
+            assert compiled.can_fetch('http://example.com' + path) == expected, (rules, path)
+
+
+def test_cache_expiry():
+    cache = RobotsCache(ttl=60)
+    cache.put('example.com', RobotsRules(), ttl=-1)
+    assert not cache.fresh('example.com')
+    cache.put('example.com', RobotsRules())
+    assert cache.fresh('example.com')
+    assert cache.get('example.com') is not None
@@ -0,0 +1,98 @@
+"""Tests for reading existing sitemaps and seeding a crawl from them."""
+
+import asyncio
+import gzip
+from collections import deque
+
+import pytest
+
+from benchmarks.testsite import TestSite
+from sitemap_generator.crawler import AsyncCrawler
+from sitemap_generator.frontier import FrontierQueue, MemoryFrontier
+from sitemap_generator.sitemaps import SitemapStreamParser
+
+URLSET = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    ' xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+    + ''.join(
+        f'<url><loc> https://example.com/{n}?a=1&amp;b=2 </loc><lastmod>2024-01-01</lastmod>'
+        f'<image:image><image:loc>https://example.com/{n}.png</image:loc></image:image></url>'
+        for n in range(300)
+    )
+    + '</urlset>'
+).encode('utf-8')
+
+INDEX = (
+    '<sitemapindex><!-- no namespace -->'
+    '<sitemap><loc>https://example.com/a.xml.gz</loc></sitemap>'
+    '<sitemap><loc>https://example.com/b.xml</loc><lastmod>2024-01-01</lastmod></sitemap>'
+    '</sitemapindex>'
+).encode('utf-8')
+
+
+def parse(body, chunk_size, **options):
+    parser = SitemapStreamParser(**options)
+    entries = []
+    for start in range(0, len(body), chunk_size):
+        entries += parser.feed(body[start:start + chunk_size])
+    return parser, entries + parser.close()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 20])
+@pytest.mark.parametrize('compress', [False, True])
+def test_urlset(chunk_size, compress):
+    body = gzip.compress(URLSET) if compress else URLSET
+    parser, entries = parse(body, chunk_size)
+    assert entries == [('url', f'https://example.com/{n}?a=1&b=2') for n in range(300)]
+    assert parser.bytes_read == len(URLSET) and not parser.truncated
+
+
+@pytest.mark.parametrize('chunk_size', [3, 1 << 20])
+def test_sitemap_index(chunk_size):
+    _, entries = parse(gzip.compress(INDEX), chunk_size)
+    assert entries == [
+        ('sitemap', 'https://example.com/a.xml.gz'), ('sitemap', 'https://example.com/b.xml')
+    ]
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_oversized_sitemap_is_truncated(compress):
+    body = gzip.compress(URLSET) if compress else URLSET
+    parser, entries = parse(body, 1000, max_bytes=len(URLSET) // 2)
+    assert parser.truncated
+    assert 100 < len(entries) < 200
+    assert entries == [('url', f'https://example.com/{n}?a=1&b=2') for n in range(len(entries))]
+
+
+def test_only_queued_urls_count_as_seeded():
+    crawler = AsyncCrawler('http://example.com/')
+    crawler._queue = FrontierQueue(MemoryFrontier())
+    crawler.discovered_urls.update(crawler.seed_urls)
+    pending = deque()
+    crawler._seed_entries([
+        ('url', 'http://example.com/a'),
+        ('url', 'http://example.com/a'),
+        ('url', 'http://example.com/'),
+        ('url', 'http://example.com/x/x/x/x/x/x/x'),
+        ('url', 'http://other.com/b'),
+        ('sitemap', 'http://example.com/more.xml'),
+    ], 'http://example.com/sitemap.xml', pending)
+    assert crawler.stats['urls_from_sitemaps'] == crawler._queue.qsize() == 1
+    assert crawler.stats['urls_trapped'] == 1
+    assert list(pending) == ['http://example.com/more.xml']
+
+
+def test_crawl_seeds_from_gzipped_sitemap_index(crawl):
+    # A chain of pages: following links alone reaches only max_depth of them
+    site = TestSite(num_pages=1200, links_per_page=1, robots_txt='User-agent: *\n', sitemap=True)
+    crawler, pages = crawl(
+        site, max_depth=3, sitemap_seed=True, respect_robots_txt=True,
+        # Latency-driven backoff would react to the test site sharing the CPU
+        adaptive_rate=False
+    )
+    assert len(pages) == len({page.url for page in pages}) == 1201
+    # The index and its two gzipped sitemaps
+    assert crawler.stats['sitemaps_fetched'] == 3
+    assert crawler.stats['urls_from_sitemaps'] <= crawler.stats['urls_enqueued']
+    assert crawler.stats['urls_from_sitemaps'] >= 1200 - 3
@@ -0,0 +1,58 @@
+"""Tests for crawl trap detection."""
+
+import pytest
+
+from sitemap_generator.traps import (
+    PATTERN_TOO_DEEP, QUERY_EXPLOSION, REPEATED_SEGMENT, TrapDetector, url_template
+)
+
+
+def test_url_template():
+    assert url_template('https://Example.com/cal/2024/05?month=5&view=list') == (
+        'example.com/cal/*/*?month&view'
+    )
+    assert url_template('https://example.com') == 'example.com/'
+
+
+@pytest.mark.parametrize('path, trapped', [
+    ('/docs/a/b/a/b/', True),
+    ('/docs/more/more/more/', True),
+    ('/2024/02/02', False),
+    ('/a/b/c/a/d/', False),
+    ('/shop/shoes/red/', False),
+])
+def test_repeated_segments(path, trapped):
+    reason = TrapDetector().check('https://example.com' + path, 1)
+    assert reason == (REPEATED_SEGMENT if trapped else None)
+
+
+def test_single_parameter_catalogue_is_not_pruned():
+    traps = TrapDetector(max_query_variants=10)
+    for i in range(100):
+        assert traps.check(f'https://example.com/product.php?id={i}', 1) is None
+
+
+def test_query_explosion():
+    traps = TrapDetector(max_query_variants=10)
+    urls = [f'https://example.com/shop?color={i}&size={i % 3}' for i in range(15)]
+    reasons = [traps.check(url, 1) for url in urls]
+    assert reasons == [None] * 10 + [QUERY_EXPLOSION] * 5
+    # Other parameter sets on the same path are counted separately
+    assert traps.check('https://example.com/shop?color=1&sort=price', 1) is None
+    [entry] = traps.report()
+    assert (entry.pattern, entry.count) == ('example.com/shop?color&size', 5)
+
+
+def test_pattern_depth():
+    traps = TrapDetector(max_pattern_depth=3)
+    reasons = [traps.check(f'https://example.com/calendar?month={i}', i) for i in range(6)]
+    assert reasons == [None] * 4 + [PATTERN_TOO_DEEP] * 2
+    # A shallower URL of the same pattern resets the window
+    assert traps.check('https://example.com/calendar?month=99', 0) is None
+
+
+def test_limits_can_be_disabled():
+    traps = TrapDetector(max_segment_repeats=None, max_query_variants=None, max_pattern_depth=None)
+    assert traps.check('https://example.com/a/b/a/b/a/b/', 50) is None
+    with pytest.raises(ValueError):
+        TrapDetector(max_query_variants=0)